@@ -1,19 +1,35 @@
-import os
-import logging
+import argparse
 from colorama import init, Fore, Style
-from src.models.inventory.types.Material import Material
-from src.Game import Game
-from src.ui.GameMenu import GameMenu
+from src.utils.Logger import Logger, bridge_std_logging
+from src.utils.StartupProfiler import StartupProfiler, DEFAULT_REPORT_PATH
+from src.utils.Clock import parse_duration
 
-def main():
+def main(hot_reload=False, profile_report=None, world_state=False):
+    # Игра и меню импортируются здесь, а не при загрузке модуля,
+    # чтобы --compile-content и --check-import-budget не загружали все модели
+    from src.Game import Game
+    from src.ui.GameMenu import GameMenu
+    
+    # Профилирование запуска: отчет сохраняется в конце загрузки игры
+    if profile_report:
+        StartupProfiler().enable(profile_report)
+    
     # Инициализация colorama
     init()
     
-    # Создание и инициализация игры
+    # Перезагрузка измененных файлов ресурсов без перезапуска игры
+    if hot_reload:
+        Game.enable_hot_reload()
+    
+    # Количества ресурсов и монстров всех локаций в общих массивах
+    if world_state:
+        Game.enable_world_state()
+    
+    # Создание игры, ресурсы загружаются в фоне, пока отображается главное меню
     game = Game()
     # Явно указываем, что это новая игра
     game.is_new_game = True
-    game.preload()
+    game.start_preload()
     
     # Создание игрового меню
     menu = GameMenu(game)
@@ -21,18 +37,99 @@ def main():
     # Запускаем главное меню
     menu.main_menu()
 
+def compile_content():
+    """Собирает пакет контента из директории resources"""
+    from src.loaders.ContentBundle import ContentBundle
+    
+    bundle = ContentBundle()
+    count = bundle.compile()
+    print(f"Упаковано {count} файлов в {bundle.bundle_path}")
+
+def simulate(duration, step, world_state=False):
+    """Продвигает мир новой игры на duration без интерфейса и выводит отчет
+    
+    Args:
+        duration: Длительность симуляции в секундах
+        step: Длительность одного шага в секундах
+        world_state: Хранить количества ресурсов и монстров в WorldState
+    """
+    from src.Game import Game
+    from src.Simulation import Simulation
+    
+    if world_state:
+        Game.enable_world_state()
+    
+    with Simulation() as simulation:
+        report = simulation.run(duration, step)
+    print(Simulation.format_report(report))
+
+def benchmark_entities(count):
+    """Выводит объем памяти на экземпляр игровых сущностей"""
+    from src.utils.EntityBenchmark import EntityBenchmark
+    
+    benchmark = EntityBenchmark(count)
+    print(benchmark.format_report(benchmark.run()))
+
+def check_import_budget():
+    """Проверяет время импорта модулей главного меню
+    
+    Returns:
+        int: Код завершения - 0, если бюджет соблюден, иначе 1
+    """
+    from src.utils.ImportBudget import ImportBudget
+    
+    results = ImportBudget().check()
+    print(ImportBudget.format_report(results))
+    return 0 if all(result["ok"] for result in results) else 1
+
 if __name__ == "__main__":
-    # Настраиваем логирование, если нужно
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    logging.basicConfig(
-        filename=os.path.join(log_dir, "logs.log"),
-        level=logging.DEBUG,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    parser = argparse.ArgumentParser(description="Текстовая RPG")
+    parser.add_argument("--compile-content", action="store_true",
+                        help="собрать пакет контента из resources и выйти")
+    parser.add_argument("--hot-reload", action="store_true",
+                        help="перезагружать измененные файлы resources во время игры")
+    parser.add_argument("--world-state", action="store_true",
+                        help="хранить количество ресурсов и монстров всех локаций в массивах NumPy "
+                             "(без NumPy - в списках Python, без ускорения)")
+    parser.add_argument("--simulate", type=parse_duration, metavar="DURATION",
+                        help="продвинуть мир новой игры на DURATION без интерфейса (например, 12h или 3d) и выйти")
+    parser.add_argument("--simulate-step", type=parse_duration, default="1h", metavar="DURATION",
+                        help="длительность шага симуляции (по умолчанию 1h)")
+    parser.add_argument("--profile-startup", nargs="?", const=DEFAULT_REPORT_PATH, metavar="PATH",
+                        help=f"сохранить отчет о времени запуска по фазам загрузки (по умолчанию {DEFAULT_REPORT_PATH})")
+    parser.add_argument("--check-import-budget", action="store_true",
+                        help="проверить время импорта модулей главного меню и выйти")
+    parser.add_argument("--benchmark-entities", nargs="?", type=int, const=10000, metavar="COUNT",
+                        help="замерить память на экземпляр локаций, монстров, NPC, квестов и предметов и выйти")
+    parser.add_argument("--log-max-mb", type=float, default=5, metavar="MB",
+                        help="размер файла лога для ротации, 0 - без ротации по размеру (по умолчанию 5)")
+    parser.add_argument("--log-rotate-hours", type=float, default=None, metavar="HOURS",
+                        help="ротировать файл лога каждые HOURS часов")
+    parser.add_argument("--log-compress", action="store_true",
+                        help="сжимать старые файлы лога в .gz")
+    parser.add_argument("--log-json", action="store_true",
+                        help="писать лог в формате JSON Lines (одна запись JSON на строку)")
+    args = parser.parse_args()
+    
+    # Единый файл логов logs/logs.log с ротацией, сообщения модуля logging идут туда же
+    Logger().configure(
+        max_bytes=int(args.log_max_mb * 1024 * 1024),
+        rotate_interval=args.log_rotate_hours * 3600 if args.log_rotate_hours else None,
+        compress=args.log_compress,
+        structured=args.log_json,
     )
+    bridge_std_logging()
     
-    # Запускаем игру
-    main()
+    if args.check_import_budget:
+        raise SystemExit(check_import_budget())
+    elif args.benchmark_entities:
+        benchmark_entities(args.benchmark_entities)
+    elif args.compile_content:
+        compile_content()
+    elif args.simulate:
+        simulate(args.simulate, args.simulate_step, world_state=args.world_state)
+    else:
+        # Запускаем игру
+        main(hot_reload=args.hot_reload, profile_report=args.profile_startup,
+             world_state=args.world_state)
 
@@ -1,13 +1,16 @@
-from src.models.quests.QuestStage import QuestStage
-from src.models.quests.Quest import Quest
-from src.models.quests.QuestObjective import QuestObjective
-from src.models.quests.objectives.CollectObjective import CollectObjective
-from src.models.quests.objectives.TalkObjective import TalkObjective
-from src.models.quests.objectives.GotoObjective import GotoObjective
 from src.PreLoader import PreLoader
 from src.models.Player import Player
 from src.utils.Logger import Logger
-import time
+from src.loaders.QuestsLoader import QuestsLoader
+from src.loaders.ContentIndex import ContentIndex
+from src.models.navigation.WorldGraph import WorldGraph
+from src.models.navigation.RouteTable import RouteTable
+from src.models.navigation.PathFinder import PathFinder
+from src.models.navigation.RegionRouter import RegionRouter
+from src.utils.ResourceWatcher import ResourceWatcher
+from src.utils.StartupProfiler import StartupProfiler, profiled
+from src.utils.Clock import Clock
+from functools import partial
 from src.models.npc.NPCManager import NPCManager
 from src.models.monsters.MonsterManager import MonsterManager
 import os
@@ -15,21 +18,49 @@ import json
 import pickle
 import signal
 import atexit
+import threading
 from datetime import datetime
-import logging
 
 
 class Game:
-    def __init__(self):
+    # Отслеживание изменений ресурсов общее для процесса и не попадает в сохранения
+    resource_watcher = None
+    # Фоновая загрузка ресурсов (см. start_preload), не попадает в сохранения
+    _preload_thread = None
+    _preload_error = None
+    # Индекс ссылок между контентом строится при каждой загрузке и не сохраняется
+    content_index = None
+    # Хранилище количеств ресурсов и монстров в массивах (см. enable_world_state), не сохраняется
+    use_world_state = False
+    world_state = None
+    # Граф связей локаций на целочисленных дескрипторах, поиск маршрутов по стоимости
+    # переходов и таблица маршрутов - строятся при каждой загрузке
+    world_graph = None
+    path_finder = None
+    route_table = None
+    # Иерархический поиск по регионам для больших миров (см. build_world_graph), не сохраняется
+    region_router = None
+    # С какого числа локаций пути ищутся через граф порталов регионов
+    region_routing_min_locations = 5000
+    # Цель и версия графа, для которых построен tracked_path (см. update_tracked_path), не сохраняется
+    _tracked_route_key = None
+    # Автосохранение при выходе (отключается для симуляции), не попадает в сохранения
+    autosave_on_exit = True
+
+    @profiled("Game.__init__")
+    def __init__(self, autosave_on_exit=True):
+        """
+        autosave_on_exit - сохранять игру при выходе из процесса и по сигналам завершения
+        """
+        self.autosave_on_exit = autosave_on_exit
         self.preloader = PreLoader()
-        self.player = Player()
+        # Навыки загружаются вместе с остальными данными в preload()
+        self.player = Player(load_skills=False)
         self.ATLAS = None  # Будет установлен после загрузки
-        self.last_update_time = time.time()  # Для отслеживания времени для обновления локаций
+        self.last_update_time = Clock().now()  # Для отслеживания времени для обновления локаций
         self.logger = Logger()  # Добавляем логгер
         self.npc_manager = NPCManager()
-        self.npc_manager.load_npcs("resources/npcs")
         self.monster_manager = MonsterManager()
-        self.monster_manager.load_monsters("resources/monsters")
         
         # Флаг для определения, новая это игра или загруженная
         self.is_new_game = True
@@ -55,27 +86,114 @@ class Game:
         self.tracked_target_type = None  # "resource" или "npc"
         self.tracked_path = []  # Список локаций для посещения
         
+        # Регистрируем шаги загрузки данных
+        self._register_load_tasks()
+        
         # Регистрируем обработчики для корректного сохранения при выходе
         self._register_exit_handlers()
 
+    def _register_load_tasks(self, loaded=False):
+        """Регистрирует шаги загрузки в планировщике PreLoader
+        
+        NPC, монстры и навыки загружаются только при первой загрузке,
+        синхронизация NPC и квесты - при каждом вызове preload().
+        
+        Args:
+            loaded: True для игры из сохранения, в которой NPC, монстры и навыки уже загружены
+        """
+        self.preloader.register_task(
+            "NPCS", partial(self.npc_manager.load_npcs, "resources/npcs"), once=True, done=loaded)
+        self.preloader.register_task(
+            "MONSTERS", partial(self.monster_manager.load_monsters, "resources/monsters"), once=True, done=loaded)
+        self.preloader.register_task(
+            "SKILLS", partial(self.player.skill_system.load_skills, "resources/skills"), once=True, done=loaded)
+        
+        # Синхронизация NPC с их локациями - выполняется для всех игр
+        self.preloader.register_task(
+            "NPC_SYNC", self.sync_npcs_with_locations, depends_on=("LOCATIONS", "NPCS"))
+        
+        # Квесты используют данные предметов и регистрируются у NPC - выполняется для всех игр
+        self.preloader.register_task(
+            "QUESTS", partial(self.load_quests, "resources/quests"), depends_on=("ITEMS", "NPCS"))
+        
+        # Восстановление ресурсов и монстров, для которых в сохранении нет момента начала
+        self.preloader.register_task(
+            "RESPAWN", self.start_respawns, depends_on=("LOCATIONS",))
+        
+        # Перенос количеств в WorldState - только если хранилище включено
+        self.preloader.register_task(
+            "WORLD_STATE", self.build_world_state, depends_on=("LOCATIONS", "RESPAWN"))
+        
+        # Граф локаций для поиска путей - строится при каждой загрузке
+        self.preloader.register_task(
+            "WORLD_GRAPH", self.build_world_graph, depends_on=("LOCATIONS", "MONSTERS"))
+        
+        # Индекс живых монстров по локациям - строится при каждой загрузке
+        self.preloader.register_task(
+            "MONSTER_INDEX", self.index_monsters, depends_on=("LOCATIONS", "MONSTERS", "WORLD_STATE"))
+        
+        # Проверка ссылок и обратные индексы - после загрузки всего контента
+        self.preloader.register_task(
+            "CONTENT_INDEX", self.build_content_index,
+            depends_on=("LOCATIONS", "ITEMS", "MONSTERS", "NPC_SYNC", "QUESTS"))
+
     def preload(self):
-        """Загружает все ресурсы игры"""
-        self.preloader.load()
-        self.ATLAS = self.preloader.get_atlas()
+        """Загружает все ресурсы игры
         
-        # Для новой игры выполняем инициализацию
-        if self.is_new_game:
-            self.initialize_new_game()
-        else:
-            self.logger.info("Загружена существующая игра, пропускаем инициализацию новой игры")
+        Если включен StartupProfiler, в конце загрузки сохраняется отчет по фазам запуска.
+        """
+        profiler = StartupProfiler()
+        with profiler.phase("Game.preload"):
+            self.ATLAS = self.preloader.get_atlas()
+            self.preloader.load()
+            self.logger.info(f"Загружено квестов: {len(getattr(self, 'all_quests', {}))}")
+            
+            # Для новой игры выполняем инициализацию
+            if self.is_new_game:
+                self.initialize_new_game()
+            else:
+                self.logger.info("Загружена существующая игра, пропускаем инициализацию новой игры")
         
-        # Синхронизируем NPC с их локациями - выполняется для всех игр
-        self.sync_npcs_with_locations()
+        # Следующая загрузка (например, сохранения) попадет в новый отчет
+        if profiler.report() is not None:
+            profiler.reset()
+
+    def start_preload(self):
+        """Запускает preload() в фоновом потоке
         
-        # Загружаем квесты из файлов - выполняется для всех игр
-        self.logger.info("Загрузка квестов...")
-        self.load_quests("resources/quests")
-        self.logger.info(f"Загружено квестов: {len(self.all_quests)}")
+        Главное меню отрисовывается сразу, а ресурсы загружаются параллельно.
+        Перед использованием данных игры нужно вызвать wait_preload().
+        """
+        if self._preload_thread is not None:
+            return
+        self._preload_error = None
+        self._preload_thread = threading.Thread(target=self._preload_worker, name="GamePreload", daemon=True)
+        self._preload_thread.start()
+    
+    def _preload_worker(self):
+        try:
+            self.preload()
+        except Exception as e:
+            self.logger.error(f"Ошибка при фоновой загрузке ресурсов: {str(e)}")
+            self._preload_error = e
+    
+    def is_preloading(self):
+        """Проверяет, выполняется ли фоновая загрузка ресурсов"""
+        return self._preload_thread is not None and self._preload_thread.is_alive()
+    
+    def wait_preload(self):
+        """Дожидается завершения фоновой загрузки ресурсов, если она была запущена
+        
+        Ошибка загрузки пробрасывается в вызывающий поток, как при обычном preload().
+        """
+        thread = self._preload_thread
+        if thread is None:
+            return
+        thread.join()
+        self._preload_thread = None
+        error, self._preload_error = self._preload_error, None
+        if error is not None:
+            raise error
 
     def initialize_new_game(self):
         """Инициализирует новую игру: устанавливает начальную локацию и выдает стартовые предметы"""
@@ -107,15 +225,13 @@ class Game:
         self.logger.info("Выдаем предметы по умолчанию игроку...")
         default_items_count = 0
         
-        # Проходим по всем предметам и проверяем свойство default
-        for item_id, item_data in self.ATLAS["ITEMS"].items_atlas.items():
-            if item_data.get("default", False) == True:
-                # Если у предмета default: true, создаем и добавляем его игроку
-                item = self.create_inventory_item(item_id, 1)
-                if item:
-                    self.player.add_item(item)
-                    self.logger.info(f"Выдан предмет по умолчанию: {item.name}")
-                    default_items_count += 1
+        # Предметы со свойством default: true отмечаются загрузчиком при чтении каталога
+        for item_id in self.ATLAS["ITEMS"].get_default_items():
+            item = self.create_inventory_item(item_id, 1)
+            if item:
+                self.player.add_item(item)
+                self.logger.info(f"Выдан предмет по умолчанию: {item.name}")
+                default_items_count += 1
                     
         if default_items_count > 0:
             self.logger.info(f"Выдано {default_items_count} предметов по умолчанию")
@@ -164,6 +280,98 @@ class Game:
             if npc_id not in synced_npcs and not npc.location_id:
                 self.logger.warning(f"NPC {npc.name} ({npc_id}) не привязан ни к одной локации")
 
+    def start_respawns(self):
+        """Начинает восстановление неполных ресурсов и монстров на всех локациях
+        
+        Записи, восстановление которых уже идет, не меняются. Для сохранений
+        старых версий восстановление отсчитывается от последнего обновления игры,
+        поэтому учитывается время, прошедшее с момента сохранения.
+        """
+        for location in self.ATLAS["LOCATIONS"].values():
+            location.start_respawns(since=self.last_update_time)
+
+    @classmethod
+    def enable_world_state(cls):
+        """Включает хранение количеств ресурсов и монстров всех локаций в WorldState
+        
+        Действует и для игр, загруженных из сохранения.
+        """
+        cls.use_world_state = True
+
+    def build_world_state(self):
+        """Переносит количества ресурсов и монстров локаций в WorldState, если хранилище включено
+        
+        Returns:
+            WorldState: Хранилище или None
+        """
+        if not self.use_world_state:
+            return None
+        from src.models.WorldState import WorldState
+        
+        self.world_state = WorldState().build(self.ATLAS["LOCATIONS"])
+        return self.world_state
+
+    def advance_world(self, now=None):
+        """Досчитывает восстановление ресурсов и монстров на всех локациях к моменту now
+        
+        С WorldState выполняется одной векторной операцией, без него - по локациям.
+        """
+        if self.world_state is not None:
+            self.world_state.advance(now)
+        elif self.ATLAS and "LOCATIONS" in self.ATLAS:
+            for location in self.ATLAS["LOCATIONS"].values():
+                location.catch_up(now)
+        self.monster_manager.refresh_alive(now)
+
+    def build_world_graph(self):
+        """Строит граф связей локаций для поиска путей
+        
+        Returns:
+            WorldGraph: Построенный граф
+        """
+        graph = self.world_graph or WorldGraph()
+        # Опасность локаций оценивается по уровням монстров
+        self.world_graph = graph.build(self.ATLAS["LOCATIONS"], self.monster_manager.monsters)
+        # Стоимости и таблица маршрутов пересчитываются сами, если граф изменился
+        if self.route_table is None:
+            self.path_finder = PathFinder(self.world_graph)
+            self.route_table = RouteTable(self.world_graph, self.path_finder)
+        
+        # В большом мире таблица маршрутов к каждой новой цели - поиск по всему миру,
+        # поэтому при нескольких регионах пути ищутся через граф порталов
+        self.region_router = None
+        if len(self.ATLAS["LOCATIONS"]) >= self.region_routing_min_locations:
+            router = RegionRouter(self.world_graph, self.path_finder)
+            if router.regions_count() > 1:
+                self.region_router = router
+        return self.world_graph
+
+    def _get_world_graph(self):
+        """Возвращает граф локаций, строит его, если загрузка еще не выполнялась"""
+        if self.world_graph is None and self.ATLAS and "LOCATIONS" in self.ATLAS:
+            self.build_world_graph()
+        return self.world_graph
+
+    def index_monsters(self):
+        """Строит индекс живых монстров по локациям в MonsterManager"""
+        self.monster_manager.bind_locations(self.ATLAS["LOCATIONS"])
+
+    def build_content_index(self):
+        """Проверяет ссылки между загруженным контентом и строит обратные индексы
+        
+        Returns:
+            ContentIndex: Построенный индекс
+        """
+        index = ContentIndex().build(
+            self.ATLAS["LOCATIONS"],
+            self.ATLAS["ITEMS"],
+            self.npc_manager.npcs,
+            self.monster_manager.monsters,
+            getattr(self, 'all_quests', {}),
+        )
+        self.content_index = index
+        return index
+
     def get_item(self, item_id):
         """Возвращает данные предмета по его ID"""
         if not item_id:
@@ -204,18 +412,80 @@ class Game:
         location_id = self.player.current_location
         return self.get_location(location_id)
 
-    def update(self):
-        """Обновляет состояние игры"""
-        current_time = time.time()
-        time_passed = current_time - self.last_update_time
+    @classmethod
+    def enable_hot_reload(cls, directory="resources", interval=1.0):
+        """Включает перезагрузку измененных файлов ресурсов без перезапуска игры
         
-        # Обновляем все локации если прошло хотя бы 1 секунда
-        if time_passed >= 1.0 and "LOCATIONS" in self.ATLAS:
-            for location in self.ATLAS["LOCATIONS"].values():
-                location.update(time_passed)
-                self.logger.debug(f"Обновление локации {location.name}: прошло {time_passed:.1f} секунд")
+        Файлы проверяются в фоновом потоке, изменения применяются в основном
+        потоке при вызове update(). Действует и для игр, загруженных из сохранения.
+        """
+        if cls.resource_watcher is None:
+            cls.resource_watcher = ResourceWatcher(directory, interval)
+            cls.resource_watcher.start()
+        return cls.resource_watcher
+
+    def apply_resource_changes(self, file_paths=None):
+        """Перечитывает измененные файлы ресурсов и обновляет загруженные данные на месте
+        
+        Перечитываются только указанные файлы, состояние игрока (инвентарь,
+        прогресс квестов, количество ресурсов на локациях) сохраняется.
         
-        self.last_update_time = current_time
+        Args:
+            file_paths: Пути измененных файлов, по умолчанию - накопленные resource_watcher
+            
+        Returns:
+            int: Количество перезагруженных файлов
+        """
+        if file_paths is None:
+            if self.resource_watcher is None:
+                return 0
+            file_paths = self.resource_watcher.pop_changes()
+        if not file_paths or not self.ATLAS:
+            return 0
+            
+        handlers = (
+            ("resources/items", self.ATLAS["ITEMS"].reload_file),
+            ("resources/places", self.ATLAS["LOCATIONS"].reload_file),
+            ("resources/npcs", self.npc_manager.reload_file),
+            ("resources/monsters", self.monster_manager.reload_file),
+            ("resources/quests", self.reload_quests_file),
+        )
+        
+        reloaded = 0
+        sync_npcs = False
+        for file_path in file_paths:
+            normalized = os.path.normpath(file_path).replace(os.sep, "/")
+            for prefix, reload_file in handlers:
+                if normalized.startswith(prefix + "/"):
+                    try:
+                        reload_file(file_path)
+                        reloaded += 1
+                        # Привязка NPC к локациям могла измениться
+                        sync_npcs = sync_npcs or prefix in ("resources/places", "resources/npcs")
+                    except Exception as e:
+                        self.logger.exception(f"Ошибка при перезагрузке файла {file_path}: {str(e)}")
+                    break
+            else:
+                self.logger.info(f"Файл {file_path} изменен, но не перезагружается без перезапуска игры")
+                
+        if sync_npcs:
+            self.sync_npcs_with_locations()
+        if reloaded:
+            self.build_content_index()
+            # Локации могли добавиться или изменить набор ресурсов и монстров
+            if self.world_state is not None:
+                self.build_world_state()
+            self.index_monsters()
+            self.build_world_graph()
+        return reloaded
+
+    def update(self):
+        """Обновляет состояние игры"""
+        if self.resource_watcher is not None:
+            self.apply_resource_changes()
+            
+        # Ресурсы и монстры локаций досчитываются при обращении к ним
+        self.last_update_time = Clock().now()
 
     def get_npc(self, npc_id):
         """Возвращает NPC по ID"""
@@ -358,143 +628,46 @@ class Game:
         return ready_quests
 
     def load_quests(self, quests_dir):
-        """Загружает квесты из директории и всех её подпапок"""
-        self.all_quests = {}  # {quest_id: quest_object}
+        """Загружает квесты из директории и всех её подпапок
         
-        if not os.path.exists(quests_dir):
-            self.logger.error(f"Директория квестов не найдена: {quests_dir}")
-            return
+        Если файлы квестов не менялись, граф квестов берется из кэша
+        и только привязывается к текущим данным игры.
+        """
+        loader = QuestsLoader(quests_dir)
+        self.all_quests = loader.load()  # {quest_id: quest_object}
+        loader.bind(self.ATLAS, self.npc_manager)
+        return self.all_quests
+
+    def reload_quests_file(self, file_path):
+        """Перечитывает один файл квестов без полной перезагрузки
         
-        # Счетчики для логирования
-        total_files_processed = 0
-        total_quests_loaded = 0
+        Квесты, которые игрок еще не начинал, заменяются новыми объектами.
+        У начатых и выполненных квестов обновляется только описание и награды,
+        стадии и прогресс игрока сохраняются.
         
-        # Рекурсивно проходим по всем файлам в директории и её подпапках
-        for root, dirs, files in os.walk(quests_dir):
-            for file in files:
-                # Проверяем, что это JSON файл
-                if not file.endswith('.json'):
-                    continue
-                
-                file_path = os.path.join(root, file)
-                self.logger.info(f"Обрабатываем файл квестов: {file_path}")
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as file:
-                        quest_data = json.load(file)
-                        
-                        # Обрабатываем квесты из файла
-                        if 'quests' in quest_data:
-                            quests_in_file = 0
-                            for quest_info in quest_data['quests']:
-                                # Загружаем основную информацию о квесте
-                                quest_id = quest_info.get('id', '')
-                                name = quest_info.get('name', 'Безымянный квест')
-                                description = quest_info.get('description', '')
-                                giver_id = quest_info.get('giver_id', '')
-                                taker_id = quest_info.get('taker_id', giver_id)
-                                completion_text = quest_info.get('completion_text', '')
-                                
-                                # Создаем объект квеста
-                                quest = Quest(quest_id, name, description, giver_id)
-                                quest.taker_id = taker_id
-                                
-                                # Добавляем текст завершения квеста, если он есть
-                                if completion_text:
-                                    quest.completion_text = completion_text
-                                
-                                # Загружаем требования
-                                if 'requirements' in quest_info:
-                                    reqs = quest_info['requirements']
-                                    quest.requirements["level"] = reqs.get('level', 1)
-                                    quest.requirements["skills"] = reqs.get('skills', {})
-                                    quest.requirements["items"] = reqs.get('items', {})
-                                    quest.requirements["quests"] = reqs.get('quests', [])
-                                
-                                # Загружаем награды
-                                if 'rewards' in quest_info:
-                                    rewards = quest_info['rewards']
-                                    quest.rewards["experience"] = rewards.get('experience', 0)
-                                    quest.rewards["money"] = rewards.get('money', 0)
-                                    quest.rewards["items"] = rewards.get('items', {})
-                                    quest.rewards["skills"] = rewards.get('skills', {})
-                                
-                                # Загружаем стадии и цели квеста
-                                if 'stages' in quest_info:
-                                    for stage_info in quest_info['stages']:
-                                        stage_name = stage_info.get('name', 'Безымянная стадия')
-                                        stage_desc = stage_info.get('description', '')
-                                        
-                                        # Создаем стадию квеста
-                                        stage = QuestStage(stage_name, stage_desc)
-                                        
-                                        # Добавляем цели для стадии
-                                        if 'objectives' in stage_info:
-                                            for obj_data in stage_info['objectives']:
-                                                obj_type = obj_data.get('type', '')
-                                                
-                                                if obj_type == "gather" or obj_type == "collect":
-                                                    # Задача на сбор предметов
-                                                    item_id = obj_data.get("item_id", "")
-                                                    count = obj_data.get("count", 1)
-                                                    description = obj_data.get("description", f"Собрать {count} {item_id}")
-                                                    
-                                                    # Получаем название предмета для более информативного отображения
-                                                    if item_id in self.ATLAS["ITEMS"]:
-                                                        item_name = self.ATLAS["ITEMS"][item_id].get("name", item_id)
-                                                        description = f"Собрать {count} {item_name}"
-                                                    
-                                                    objective = CollectObjective(item_id, count, description)
-                                                    stage.objectives.append(objective)
-                                                    
-                                                elif obj_type == "talk":
-                                                    # Задача на разговор с NPC
-                                                    npc_id = obj_data.get("npc_id", "")
-                                                    description = obj_data.get("description", f"Поговорить с {npc_id}")
-                                                    
-                                                    objective = TalkObjective(npc_id, description)
-                                                    stage.objectives.append(objective)
-                                                    
-                                                elif obj_type == "goto":
-                                                    # Задача на посещение локации
-                                                    location_id = obj_data.get("location_id", "")
-                                                    description = obj_data.get("description", f"Посетить {location_id}")
-                                                    
-                                                    objective = GotoObjective(location_id, description)
-                                                    stage.objectives.append(objective)
-                                                
-                                                # Здесь можно добавить другие типы задач
-                                        
-                                        quest.add_stage(stage)
-                                
-                                # Добавляем квест в словарь всех квестов
-                                self.all_quests[quest_id] = quest
-                                
-                                # Добавляем квест в список доступных квестов у NPC, если указан
-                                if giver_id:
-                                    npc = self.npc_manager.get_npc(giver_id)
-                                    if npc and hasattr(npc, 'add_available_quest'):
-                                        npc.add_available_quest(quest_id)
-                                
-                                self.logger.info(f"Загружен квест: {quest_id}")
-                                quests_in_file += 1
-                                
-                            total_quests_loaded += quests_in_file
-                            self.logger.info(f"Загружено {quests_in_file} квестов из файла {file_path}")
-                    
-                    total_files_processed += 1
-                except Exception as e:
-                    self.logger.error(f"Ошибка при загрузке квестов из {file_path}: {e}")
+        Returns:
+            int: Количество перезагруженных квестов
+        """
+        if not hasattr(self, 'all_quests'):
+            self.all_quests = {}
+            
+        loader = QuestsLoader()
+        reloaded = loader.load_file(file_path)
         
-        # Суммарная статистика
-        self.logger.info(f"Всего обработано файлов квестов: {total_files_processed}")
-        self.logger.info(f"Всего загружено квестов: {total_quests_loaded}")
+        new_quests = {}
+        for quest_id, quest in reloaded.items():
+            current = self.active_quests.get(quest_id) or self.completed_quests.get(quest_id)
+            if current is not None:
+                current.update_definition(quest)
+                self.all_quests[quest_id] = current
+            else:
+                new_quests[quest_id] = quest
+                
+        loader.bind(self.ATLAS, self.npc_manager, new_quests)
+        self.all_quests.update(new_quests)
         
-        # Выводим список всех загруженных квестов для отладки
-        for quest_id in self.all_quests:
-            self.logger.debug(f"- Квест: {quest_id}")
-            
-        return self.all_quests
+        self.logger.info(f"Перезагружено {len(reloaded)} квестов из файла {file_path}")
+        return len(reloaded)
 
     def update_quest_progress(self, quest_id=None):
         """
@@ -597,19 +770,17 @@ class Game:
         if self.glossary["npcs"][npc_id]["location"]:
             return False
         
-        # Ищем локацию NPC в списке локаций
-        found_location = None
-        for location_id, location in self.ATLAS["LOCATIONS"].items():
-            if npc_id in location.npcs:
-                found_location = location_id
-                # Обновляем локацию NPC в глоссарии
-                self.glossary["npcs"][npc_id]["location"] = found_location
-                # Также обновляем локацию в объекте NPC
-                npc = self.get_npc(npc_id)
-                if npc:
-                    npc.location_id = found_location
-                self.logger.info(f"Обновлена локация для NPC {npc_id} в глоссарии: {found_location}")
-                return True
+        # Ищем локацию NPC по индексу локаций
+        found_location = self.find_npc_location(npc_id)
+        if found_location:
+            # Обновляем локацию NPC в глоссарии
+            self.glossary["npcs"][npc_id]["location"] = found_location
+            # Также обновляем локацию в объекте NPC
+            npc = self.get_npc(npc_id)
+            if npc:
+                npc.location_id = found_location
+            self.logger.info(f"Обновлена локация для NPC {npc_id} в глоссарии: {found_location}")
+            return True
             
         # Если локация не найдена
         self.logger.warning(f"Не удалось найти локацию для NPC {npc_id}")
@@ -649,7 +820,7 @@ class Game:
         # Добавляем локацию, если она указана и не была добавлена ранее
         if location_id and location_id not in self.glossary["monsters"][monster_id]["locations"]:
             self.glossary["monsters"][monster_id]["locations"].append(location_id)
-            self.logger.debug(f"Локация {location_id} добавлена для монстра {monster_id} в глоссарии")
+            self.logger.debug("Локация {} добавлена для монстра {} в глоссарии", location_id, monster_id)
             
         return True
         
@@ -690,31 +861,28 @@ class Game:
                 
             self.tracked_target = target_id
             self.tracked_target_type = "resource"
-            # Берем первую доступную локацию для ресурса
-            target_location = self.glossary["resources"][target_id]["locations"][0]
-            self.tracked_location = target_location
-            
-            # Вычисляем маршрут от текущей локации до целевой
-            current_location = self.player.current_location
-            self.tracked_path = self.calculate_path(current_location, target_location)
+            # Берем ближайшую известную локацию, где ресурс сейчас есть, иначе - ближайшую известную
+            known_locations = self.glossary["resources"][target_id]["locations"]
+            stocked_locations = [location_id for location_id in known_locations
+                                 if self._location_has(location_id, "resources", target_id)]
+            self.tracked_location, self.tracked_path = self._nearest_tracked_location(
+                stocked_locations, known_locations)
+            self._tracked_route_key = self._get_tracked_route_key()
             
             return True
             
         elif target_type == "npc" and target_id in self.glossary["npcs"]:
             # Если у NPC нет локации, нельзя отслеживать
             if not self.glossary["npcs"][target_id]["location"]:
-                # Попробуем найти локацию NPC в списке локаций
-                found_location = None
-                for location_id, location in self.ATLAS["LOCATIONS"].items():
-                    if target_id in location.npcs:
-                        found_location = location_id
-                        # Обновляем локацию NPC в глоссарии и в объекте NPC
-                        self.glossary["npcs"][target_id]["location"] = found_location
-                        npc = self.get_npc(target_id)
-                        if npc:
-                            npc.location_id = found_location
-                        self.logger.info(f"Найдена локация для NPC {target_id}: {found_location}")
-                        break
+                # Попробуем найти локацию NPC по индексу локаций
+                found_location = self.find_npc_location(target_id)
+                if found_location:
+                    # Обновляем локацию NPC в глоссарии и в объекте NPC
+                    self.glossary["npcs"][target_id]["location"] = found_location
+                    npc = self.get_npc(target_id)
+                    if npc:
+                        npc.location_id = found_location
+                    self.logger.info(f"Найдена локация для NPC {target_id}: {found_location}")
                 
                 # Если после поиска локация не найдена, отменяем отслеживание
                 if not found_location:
@@ -729,6 +897,7 @@ class Game:
             # Вычисляем маршрут от текущей локации до целевой
             current_location = self.player.current_location
             self.tracked_path = self.calculate_path(current_location, target_location)
+            self._tracked_route_key = self._get_tracked_route_key()
             
             return True
             
@@ -739,18 +908,62 @@ class Game:
                 
             self.tracked_target = target_id
             self.tracked_target_type = "monster"
-            # Берем первую доступную локацию для монстра
-            target_location = self.glossary["monsters"][target_id]["locations"][0]
-            self.tracked_location = target_location
-            
-            # Вычисляем маршрут от текущей локации до целевой
-            current_location = self.player.current_location
-            self.tracked_path = self.calculate_path(current_location, target_location)
+            # Берем ближайшую известную локацию, где монстры сейчас есть, иначе - ближайшую известную
+            known_locations = self.glossary["monsters"][target_id]["locations"]
+            alive_locations = self.monster_manager.get_alive_locations(target_id)
+            self.tracked_location, self.tracked_path = self._nearest_tracked_location(
+                [location_id for location_id in known_locations if location_id in alive_locations],
+                known_locations)
+            self._tracked_route_key = self._get_tracked_route_key()
             
             return True
             
         return False
     
+    def _location_has(self, location_id, kind, entry_id):
+        """Проверяет, есть ли сейчас на локации ресурс или монстр (kind - "resources" или "monsters")"""
+        location = self.get_location(location_id)
+        return location is not None and getattr(location, kind).get(entry_id, 0) > 0
+    
+    def _nearest_tracked_location(self, candidates, known_locations):
+        """Выбирает локацию отслеживаемой цели, ближайшую к игроку
+        
+        Args:
+            candidates: ID локаций, где цель есть сейчас
+            known_locations: ID всех известных локаций цели (если candidates недостижимы)
+            
+        Returns:
+            tuple: (ID локации, путь к ней)
+        """
+        for locations in (candidates, known_locations):
+            location_id, path = self.find_nearest_location(locations)
+            if location_id is not None:
+                return location_id, path
+        # Ни одна локация недостижима - берем первую известную
+        return known_locations[0], self.calculate_path(self.player.current_location, known_locations[0])
+    
+    def find_nearest_location(self, location_ids, start_location=None):
+        """Находит ближайшую по стоимости маршрута локацию из списка
+        
+        Поиск идет от start_location и останавливается на первой локации из списка,
+        поэтому весь мир просматривается, только если цели далеко.
+        
+        Args:
+            location_ids: ID целевых локаций
+            start_location: ID начальной локации (по умолчанию - локация игрока)
+            
+        Returns:
+            tuple: (ID ближайшей локации, путь к ней) или (None, []), если цели недостижимы
+        """
+        start_location = start_location or self.player.current_location
+        if not location_ids or not start_location:
+            return None, []
+        if start_location in location_ids:
+            return start_location, []
+        if self._get_world_graph() is None:
+            return None, []
+        return self.path_finder.find_nearest(start_location, location_ids)
+    
     def untrack_target(self):
         """Отменяет отслеживание цели"""
         self.tracked_target = None
@@ -759,9 +972,11 @@ class Game:
         self.tracked_path = []
     
     def calculate_path(self, start_location, target_location):
-        """Вычисляет кратчайший путь между локациями
+        """Вычисляет путь минимальной стоимости между локациями
         
-        Использует простой алгоритм поиска в ширину для нахождения пути
+        Стоимость перехода складывается из времени, выносливости и опасности
+        локации (TravelCost). Путь строится по таблице маршрутов RouteTable за O(длины пути),
+        в большом мире из нескольких регионов - через граф порталов RegionRouter
         
         Args:
             start_location (str): ID начальной локации
@@ -773,29 +988,11 @@ class Game:
         if start_location == target_location:
             return []
             
-        # BFS для поиска кратчайшего пути
-        queue = [(start_location, [])]
-        visited = set([start_location])
-        
-        while queue:
-            (node, path) = queue.pop(0)
-            
-            # Получаем все соседние локации
-            location = self.get_location(node)
-            if not location:
-                continue
-                
-            for neighbor in location.connected_locations:
-                if neighbor == target_location:
-                    # Нашли целевую локацию, возвращаем путь
-                    return path + [neighbor]
-                    
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
-                    
-        # Путь не найден
-        return []
+        if self._get_world_graph() is None:
+            return []
+        if self.region_router is not None:
+            return self.region_router.find_path(start_location, target_location)
+        return self.route_table.find_path(start_location, target_location)
     
     def get_tracked_target_info(self):
         """Возвращает информацию о отслеживаемой цели
@@ -830,10 +1027,19 @@ class Game:
             
         return result
     
+    def _get_tracked_route_key(self):
+        """Возвращает (цель, версия графа), для которых строится путь к отслеживаемой цели"""
+        graph = self._get_world_graph()
+        return self.tracked_location, graph.version if graph is not None else None
+    
     def update_tracked_path(self):
         """Обновляет путь к отслеживаемой цели после перемещения игрока
         
-        Должна вызываться после каждого перемещения игрока
+        Должна вызываться после каждого перемещения игрока. Путь ищется заново,
+        только если изменились цель или граф локаций. Иначе шаг по пути
+        убирает его первую локацию, переход вперед по пути - пройденную часть,
+        а сход с пути исправляется по таблице маршрутов к цели или коротким
+        обходом до ближайшей локации оставшегося пути.
         """
         if not self.tracked_target:
             return
@@ -844,9 +1050,52 @@ class Game:
         if current_location == self.tracked_location:
             self.tracked_path = []
             return
-            
-        # Пересчитываем путь от текущей локации
+        
+        route_key = self._get_tracked_route_key()
+        path = self.tracked_path
+        if route_key == self._tracked_route_key and path:
+            if path[0] == current_location:
+                # Игрок сделал следующий шаг маршрута
+                del path[0]
+                return
+            if current_location in path:
+                # Игрок срезал путь - оставляем часть после текущей локации
+                del path[:path.index(current_location) + 1]
+                return
+            repaired = self._repair_tracked_path(current_location)
+            if repaired is not None:
+                self.tracked_path = repaired
+                return
+            
+        # Цель или граф изменились - пересчитываем путь от текущей локации
         self.tracked_path = self.calculate_path(current_location, self.tracked_location)
+        self._tracked_route_key = route_key
+    
+    def _repair_tracked_path(self, current_location):
+        """Исправляет путь к отслеживаемой цели после схода с него
+        
+        Если таблица маршрутов к цели уже построена, путь берется из нее за O(длины пути).
+        Иначе ищется ближайшая локация оставшегося пути, и к ней добавляется обход.
+        
+        Returns:
+            list: Новый путь или None, если исправить путь не удалось
+        """
+        graph = self.world_graph
+        if graph is None:
+            return None
+        start = graph.handle_of(current_location)
+        target = graph.handle_of(self.tracked_location)
+        if start is None or target is None:
+            return None
+        
+        if self.region_router is None and self.route_table.has_route_table(target):
+            return graph.to_ids(self.route_table.route_handles(start, target))
+        
+        path_handles = [graph.handle_of(location_id) for location_id in self.tracked_path]
+        joined, detour, _ = self.path_finder.find_nearest_handles(start, set(path_handles))
+        if joined is None:
+            return None
+        return graph.to_ids(detour) + self.tracked_path[path_handles.index(joined) + 1:]
             
     def get_tracked_quest_target_location(self):
         """Определяет целевую локацию для отслеживаемого квеста
@@ -886,12 +1135,14 @@ class Game:
                 # Задача собрать ресурсы
                 elif objective.type == "collect":
                     item_id = objective.item_id
-                    # Ищем локацию, где есть такой ресурс
-                    for location in self.ATLAS["LOCATIONS"].values():
-                        if item_id in location.resources and location.resources[item_id] > 0:
-                            item_data = self.get_item(item_id)
-                            item_name = item_data.get("name", item_id) if item_data else item_id
-                            return location.id, item_name, "resource"
+                    # Ищем ближайшую к игроку локацию, где такой ресурс сейчас есть
+                    stocked_locations = [location.id for location in self.get_resource_locations(item_id)
+                                         if location.resources.get(item_id, 0) > 0]
+                    if stocked_locations:
+                        location_id = self.find_nearest_location(stocked_locations)[0] or stocked_locations[0]
+                        item_data = self.get_item(item_id)
+                        item_name = item_data.get("name", item_id) if item_data else item_id
+                        return location_id, item_name, "resource"
                             
         # Если текущая стадия завершена, но квест не готов к сдаче,
         # возможно мы должны перейти к следующему этапу
@@ -940,18 +1191,45 @@ class Game:
         # Ищем путь от текущей локации до цели
         return self.calculate_path(self.player.current_location, target_location)
             
+    def _get_content_index(self):
+        """Возвращает индекс контента, строит его, если загрузка еще не выполнялась"""
+        if self.content_index is None and self.ATLAS:
+            self.build_content_index()
+        return self.content_index
+
+    def find_npc_location(self, npc_id):
+        """Возвращает ID локации, в списке NPC которой указан NPC, или None"""
+        index = self._get_content_index()
+        return index.get_npc_location(npc_id) if index else None
+
+    def get_resource_locations(self, resource_id):
+        """Возвращает локации, где добывается ресурс"""
+        index = self._get_content_index()
+        if not index:
+            return []
+        return [self.ATLAS["LOCATIONS"][location_id] for location_id in index.get_resource_locations(resource_id)
+                if location_id in self.ATLAS["LOCATIONS"]]
+
+    def get_monster_locations(self, monster_id):
+        """Возвращает локации, где встречается монстр"""
+        index = self._get_content_index()
+        if not index:
+            return []
+        return [self.ATLAS["LOCATIONS"][location_id] for location_id in index.get_monster_locations(monster_id)
+                if location_id in self.ATLAS["LOCATIONS"]]
+
     def get_monster(self, monster_id):
         """Возвращает шаблон монстра по ID"""
         return self.monster_manager.get_monster(monster_id)
+
+    def reduce_monster_count(self, location_id, monster_id, count=1):
+        """Уменьшает количество монстров на локации (например, после победы в бою)"""
+        return self.monster_manager.reduce_monster_count(location_id, monster_id, count)
     
     def get_monsters_at_location(self, location_id):
         """Возвращает список монстров в указанной локации"""
-        location = self.get_location(location_id)
-        if not location:
-            return {}
-        
         monsters = {}
-        for monster_id, count in location.monsters.items():
+        for monster_id, count in self.monster_manager.get_monsters_at_location(location_id).items():
             if count > 0:
                 monster = self.get_monster(monster_id)
                 if monster:
@@ -1015,6 +1293,9 @@ class Game:
             
     def _register_exit_handlers(self):
         """Регистрирует обработчики событий для сохранения при выходе"""
+        if not self.autosave_on_exit:
+            return
+        
         # При нормальном завершении
         atexit.register(self.auto_save_game)
         
@@ -1107,6 +1388,8 @@ class Game:
     def auto_save_game(self):
         """Автоматически сохраняет игру при выходе"""
         try:
+            # Не сохраняем мир, который еще загружается в фоне
+            self.wait_preload()
             if hasattr(self, 'player') and self.player:
                 # Создаем автосохранение с меткой времени
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1167,7 +1450,7 @@ class Game:
                         meta_data["save_path"] = save_path
                         saves_list.append(meta_data)
                 except Exception as e:
-                    logger = logging.getLogger(__name__)
+                    logger = Logger()
                     logger.warning(f"Ошибка при загрузке метаданных сохранения {save_folder}: {str(e)}")
         
         # Сортируем сохранения по времени (от новых к старым)
@@ -1190,7 +1473,7 @@ class Game:
             
             # Проверяем существование файла
             if not os.path.exists(world_file):
-                logger = logging.getLogger(__name__)
+                logger = Logger()
                 logger.error(f"Файл сохранения не найден: {world_file}")
                 return None
             
@@ -1198,7 +1481,7 @@ class Game:
             with open(world_file, 'rb') as f:
                 game = pickle.load(f)
                 
-            logger = logging.getLogger(__name__)
+            logger = Logger()
             logger.info(f"Игра успешно загружена из {save_path}")
             # Перерегистрируем обработчики событий для нового объекта
             game._register_exit_handlers()
@@ -1207,7 +1490,7 @@ class Game:
             return game
             
         except Exception as e:
-            logger = logging.getLogger(__name__)
+            logger = Logger()
             logger.error(f"Ошибка при загрузке игры: {str(e)}")
             return None
             
@@ -1224,6 +1507,16 @@ class Game:
         # А также объекты, которые не нужно сохранять
         if 'logger' in state:
             del state['logger']
+        state.pop('_preload_thread', None)
+        state.pop('_preload_error', None)
+        state.pop('content_index', None)
+        state.pop('world_state', None)
+        state.pop('world_graph', None)
+        state.pop('path_finder', None)
+        state.pop('region_router', None)
+        state.pop('_tracked_route_key', None)
+        state.pop('route_table', None)
+        state.pop('autosave_on_exit', None)
             
         return state
     
@@ -1236,8 +1529,12 @@ class Game:
         # Восстанавливаем состояние объекта
         self.__dict__.update(state)
         
-        # Создаем новый логгер
-        self.logger = logging.getLogger(__name__)
+        # В сохранениях старых версий шаги загрузки не зарегистрированы (или зарегистрированы не все),
+        # регистрируем их заново: NPC, монстры и навыки уже есть в сохранении
+        self._register_load_tasks(loaded=True)
+        
+        # Создаем новый логгер (тот же, что и у новой игры)
+        self.logger = Logger()
         
         # Устанавливаем флаг загруженной игры
         self.is_new_game = False
@@ -1,33 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from src.loaders.ItemsLoader import ItemsLoader
 from src.loaders.LocationsLoader import LocationsLoader
 from src.loaders.Loader import Loader
 from src.utils.Logger import Logger
+from src.utils.StartupProfiler import StartupProfiler, profiled
 
 class PreLoader:
-    def __init__(self):
+    def __init__(self, max_workers=None):
         self.logger = Logger()
         self.loaders = []
+        self.tasks = {}  # {name: {"func": callable, "depends_on": (...), "once": bool, "done": bool}}
+        self.max_workers = max_workers  # None - размер пула по умолчанию (по числу ядер)
         self.ATLAS = {
             "ITEMS": ItemsLoader(),
             "LOCATIONS": LocationsLoader()
         }
-        
+
         # Автоматически регистрируем все загрузчики из ATLAS
         for key, loader in self.ATLAS.items():
-            self.register_loader(loader)
+            self.register_loader(loader, key)
 
-    def register_loader(self, loader: Loader):
+    def register_loader(self, loader: Loader, name=None, depends_on=()):
+        """Регистрирует загрузчик как шаг загрузки"""
         self.loaders.append(loader)
+        self.register_task(name or loader.__class__.__name__, loader.load, depends_on)
+
+    def register_task(self, name, func, depends_on=(), once=False, done=False):
+        """Регистрирует шаг загрузки
+
+        Args:
+            name: Уникальное имя шага
+            func: Вызываемый объект без аргументов
+            depends_on: Имена шагов, которые должны завершиться до запуска этого шага
+            once: Выполнять шаг только при первой загрузке (не повторять для загруженной игры)
+            done: Отметить шаг как уже выполненный
+        """
+        self.tasks[name] = {
+            "func": func,
+            "depends_on": tuple(depends_on),
+            "once": once,
+            "done": done
+        }
 
+    @profiled("PreLoader.load")
     def load(self):
-        """Запуск загрузки всех данных"""
+        """Запуск загрузки всех данных
+
+        Независимые шаги выполняются параллельно в пуле потоков, шаг запускается
+        только после завершения всех шагов, от которых он зависит.
+        """
         self.logger.info("PreLoader: начало загрузки данных...")
-        
-        # Загружаем все данные через загрузчики
-        for loader in self.loaders:
-            loader.load()
-        
+
+        pending = {name: task for name, task in self.tasks.items()
+                   if not (task["once"] and task["done"])}
+        # Пропускаемые шаги считаются завершенными для зависящих от них
+        finished = set(self.tasks) - set(pending)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while pending or running:
+                # Запускаем все шаги, зависимости которых уже выполнены
+                for name in list(pending):
+                    if all(dep in finished for dep in pending[name]["depends_on"]):
+                        running[pool.submit(self._run_task, name)] = name
+                        del pending[name]
+
+                if not running:
+                    self.logger.error("PreLoader: не удалось разрешить зависимости шагов: {}", ", ".join(pending))
+                    break
+
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.exception(f"PreLoader: ошибка на шаге {name}: {str(e)}")
+                    self.tasks[name]["done"] = True
+                    finished.add(name)
+
         self.logger.info("PreLoader: все данные успешно загружены")
 
+    def _run_task(self, name):
+        """Выполняет шаг загрузки как отдельную фазу StartupProfiler"""
+        with StartupProfiler().phase(name, parent="PreLoader.load"):
+            result = self.tasks[name]["func"]()
+            # Загрузчики возвращают коллекцию загруженных объектов
+            if hasattr(result, "__len__"):
+                StartupProfiler().record_objects(len(result))
+        return result
+
     def get_atlas(self):
         return self.ATLAS
+
+    def __setstate__(self, state):
+        """Восстанавливает состояние из pickle с поддержкой сохранений старых версий"""
+        self.__dict__.update(state)
+
+        if "tasks" not in state:
+            # В старых сохранениях шагов загрузки нет, регистрируем загрузчики заново
+            self.tasks = {}
+            self.max_workers = None
+            for key, loader in self.ATLAS.items():
+                self.register_task(key, loader.load)
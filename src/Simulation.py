@@ -0,0 +1,123 @@
+import math
+import time
+from src.Game import Game
+from src.utils.Clock import Clock, ManualClock
+from src.utils.Logger import Logger
+
+
+class Simulation:
+    """
+    Симуляция игрового мира без интерфейса
+
+    Время игры берется из ManualClock, который подставляется в Clock на время
+    симуляции, поэтому мир можно продвинуть на часы и дни крупными шагами
+    за доли секунды. На каждом шаге выполняется обновление игры, восстановление
+    ресурсов и монстров на всех локациях и обновление прогресса активных квестов.
+    Игра симуляции не сохраняется при выходе.
+    """
+
+    def __init__(self, game=None, start_time=None):
+        """
+        game - игра для симуляции, по умолчанию - новая игра
+        start_time - начальное время симуляции, по умолчанию - текущее время
+        """
+        self.logger = Logger()
+        self.clock = ManualClock(start_time)
+        # Загрузка идет по симулированным часам: от них отсчитывается восстановление ресурсов
+        self._previous_source = Clock().use(self.clock)
+
+        try:
+            if game is None:
+                game = Game(autosave_on_exit=False)
+                game.is_new_game = True
+            self.game = game
+            if self.game.ATLAS is None:
+                self.game.preload()
+            else:
+                self.game.wait_preload()
+        except Exception:
+            # __exit__ не вызывается для неудачно созданного объекта - часы возвращаются здесь
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Возвращает источник времени, который использовался до симуляции"""
+        if self._previous_source is not None:
+            Clock().use(self._previous_source)
+            self._previous_source = None
+
+    def world_totals(self):
+        """Возвращает суммарное количество ресурсов и монстров на всех локациях
+
+        Returns:
+            dict: {"resources", "max_resources", "monsters", "max_monsters"}
+        """
+        totals = {"resources": 0, "max_resources": 0, "monsters": 0, "max_monsters": 0}
+        for location in self.game.ATLAS["LOCATIONS"].values():
+            totals["resources"] += sum(location.resources.values())
+            totals["monsters"] += sum(location.monsters.values())
+            totals["max_resources"] += sum(info["max_count"] for info in location.available_resources.values())
+            totals["max_monsters"] += sum(info["max_count"] for info in location.available_monsters.values())
+        return totals
+
+    def step(self, seconds):
+        """Продвигает мир на seconds секунд одним шагом"""
+        now = self.clock.advance(seconds)
+        self.game.update()
+        self.game.advance_world(now)
+        self.game.update_quest_progress()
+
+    def run(self, duration, step=3600, on_step=None):
+        """Продвигает мир на duration секунд шагами по step секунд
+
+        Args:
+            duration: Длительность симуляции в секундах
+            step: Длительность одного шага в секундах
+            on_step: Функция, вызываемая после каждого шага с аргументами (simulation, simulated_seconds)
+
+        Returns:
+            dict: Отчет {"steps", "simulated_seconds", "wall_seconds", "throughput", "totals"}
+        """
+        if duration <= 0 or step <= 0:
+            raise ValueError("Длительность симуляции и шага должны быть больше нуля")
+
+        steps = math.ceil(duration / step)
+        simulated = 0.0
+        started = time.perf_counter()
+        for _ in range(steps):
+            seconds = min(step, duration - simulated)
+            self.step(seconds)
+            simulated += seconds
+            if on_step is not None:
+                on_step(self, simulated)
+        wall = time.perf_counter() - started
+
+        report = {
+            "steps": steps,
+            "simulated_seconds": simulated,
+            "wall_seconds": wall,
+            # Симулированных секунд за секунду реального времени
+            "throughput": simulated / wall if wall > 0 else float("inf"),
+            "totals": self.world_totals(),
+        }
+        self.logger.info("Simulation: {} с за {:.3f} с, шагов: {}, {:.0f} с/с",
+                         simulated, wall, steps, report["throughput"])
+        return report
+
+    @staticmethod
+    def format_report(report):
+        """Возвращает отчет о симуляции в виде текста"""
+        totals = report["totals"]
+        return "\n".join([
+            f"Симулировано: {report['simulated_seconds'] / 3600:.2f} ч за {report['wall_seconds']:.3f} с "
+            f"({report['steps']} шагов)",
+            f"Скорость: {report['throughput']:.0f} симулированных секунд в секунду",
+            f"Ресурсы: {totals['resources']} из {totals['max_resources']}",
+            f"Монстры: {totals['monsters']} из {totals['max_monsters']}",
+        ])
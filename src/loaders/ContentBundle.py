@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import pickle
+import struct
+import threading
+from src.utils.JsonStream import JsonStream
+from src.utils.Logger import Logger
+from src.utils.StartupProfiler import StartupProfiler
+
+BUNDLE_MAGIC = b"TRPGCB"
+BUNDLE_VERSION = 1
+RESOURCES_DIR = "resources"
+DEFAULT_BUNDLE_PATH = os.path.join(RESOURCES_DIR, ".cache", "content.bundle")
+# Директории, которые не попадают в пакет контента
+EXCLUDED_DIRS = {"saves", ".cache"}
+# Файлы больше этого размера (в байтах) не упаковываются и читаются потоково
+STREAMING_THRESHOLD = 8 * 1024 * 1024
+
+
+def _normalize_path(path):
+    """Приводит путь к единому виду для использования в качестве ключа пакета"""
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+class ContentBundle:
+    """
+    Скомпилированный пакет контента из директории resources
+
+    Все JSON файлы (кроме сохранений) упаковываются в один бинарный файл,
+    который читается одним последовательным чтением. Для каждого файла в пакете
+    хранятся mtime, размер и хеш содержимого: если файл на диске изменился,
+    данные читаются с диска, а не из пакета.
+    Реализован как Singleton, чтобы все загрузчики работали с одним пакетом.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(ContentBundle, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, bundle_path=DEFAULT_BUNDLE_PATH, resources_dir=RESOURCES_DIR):
+        if self._initialized:
+            return
+
+        self.bundle_path = bundle_path
+        self.resources_dir = resources_dir
+        self.logger = Logger()
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._opened = False
+        self._files = {}  # {путь: (mtime_ns, size, digest, данные в pickle)}
+        self._dirs = {}   # {путь директории: (mtime_ns, [файлы], [поддиректории])}
+        self._initialized = True
+
+    def __reduce__(self):
+        # При сериализации игры пакет не сохраняется, используется текущий экземпляр
+        return (ContentBundle, ())
+
+    def compile(self):
+        """Собирает все JSON файлы из resources в один пакет
+
+        Returns:
+            int: Количество упакованных файлов
+        """
+        files = {}
+        dirs = {}
+
+        for root, subdirs, filenames in os.walk(self.resources_dir):
+            # Исключаем сохранения и кэш из обхода
+            subdirs[:] = sorted(d for d in subdirs if d not in EXCLUDED_DIRS)
+            json_files = sorted(f for f in filenames if f.endswith(".json"))
+            dirs[_normalize_path(root)] = (os.stat(root).st_mtime_ns, json_files, list(subdirs))
+
+            for filename in json_files:
+                file_path = os.path.join(root, filename)
+                if os.path.getsize(file_path) >= STREAMING_THRESHOLD:
+                    # Большие файлы читаются потоково, целиком в пакет их не кладем
+                    continue
+                with open(file_path, "rb") as f:
+                    raw = f.read()
+                try:
+                    data = json.loads(raw.decode("utf-8"))
+                except ValueError as e:
+                    # Некорректный файл не упаковываем, загрузчик сообщит об ошибке сам
+                    self.logger.error("ContentBundle: пропущен некорректный файл {}: {}", file_path, str(e))
+                    continue
+                stat = os.stat(file_path)
+                files[_normalize_path(file_path)] = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    hashlib.sha1(raw).hexdigest(),
+                    pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL),
+                )
+
+        payload = pickle.dumps({"files": files, "dirs": dirs}, protocol=pickle.HIGHEST_PROTOCOL)
+
+        bundle_dir = os.path.dirname(self.bundle_path)
+        if bundle_dir:
+            os.makedirs(bundle_dir, exist_ok=True)
+
+        # Пишем во временный файл и подменяем, чтобы не оставить битый пакет
+        tmp_path = self.bundle_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(BUNDLE_MAGIC)
+            f.write(struct.pack("<I", BUNDLE_VERSION))
+            f.write(hashlib.sha1(payload).digest())
+            f.write(payload)
+        os.replace(tmp_path, self.bundle_path)
+
+        with self._lock:
+            self._files = files
+            self._dirs = dirs
+            self._opened = True
+
+        self.logger.info("ContentBundle: упаковано {} файлов в {}", len(files), self.bundle_path)
+        return len(files)
+
+    def _open(self):
+        """Однократно читает пакет с диска, если он существует и подходит по версии"""
+        if self._opened:
+            return
+        with self._lock:
+            if self._opened:
+                return
+            self._opened = True
+
+            if not self.enabled or not os.path.exists(self.bundle_path):
+                return
+
+            try:
+                with open(self.bundle_path, "rb") as f:
+                    data = f.read()
+                StartupProfiler().record_file(len(data))
+
+                header_size = len(BUNDLE_MAGIC) + 4 + 20
+                if data[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+                    self.logger.warning("ContentBundle: файл {} не является пакетом контента", self.bundle_path)
+                    return
+
+                version = struct.unpack("<I", data[len(BUNDLE_MAGIC):len(BUNDLE_MAGIC) + 4])[0]
+                if version != BUNDLE_VERSION:
+                    self.logger.warning("ContentBundle: версия пакета {} не поддерживается (ожидается {}), пакет игнорируется",
+                                        version, BUNDLE_VERSION)
+                    return
+
+                payload = data[header_size:]
+                if hashlib.sha1(payload).digest() != data[header_size - 20:header_size]:
+                    self.logger.warning("ContentBundle: пакет {} поврежден, пакет игнорируется", self.bundle_path)
+                    return
+
+                content = pickle.loads(payload)
+                self._files = content["files"]
+                self._dirs = content["dirs"]
+                self.logger.info("ContentBundle: загружен пакет {} ({} файлов)", self.bundle_path, len(self._files))
+            except Exception as e:
+                self.logger.error("ContentBundle: ошибка при чтении пакета {}: {}", self.bundle_path, str(e))
+                self._files = {}
+                self._dirs = {}
+
+    def invalidate(self):
+        """Сбрасывает прочитанный пакет, следующее обращение перечитает его с диска"""
+        with self._lock:
+            self._opened = False
+            self._files = {}
+            self._dirs = {}
+
+    def _walk_bundled(self, directory):
+        """Возвращает список JSON файлов директории по данным пакета или None, если пакет устарел"""
+        files = []
+        stack = [_normalize_path(directory)]
+        while stack:
+            dir_path = stack.pop()
+            entry = self._dirs.get(dir_path)
+            if entry is None:
+                return None
+            mtime_ns, json_files, subdirs = entry
+            try:
+                # Изменение mtime директории означает добавление или удаление файлов
+                if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+            files.extend(os.path.join(dir_path, name) for name in json_files)
+            stack.extend(dir_path + "/" + name for name in reversed(subdirs))
+        return files
+
+    def walk_json(self, directory):
+        """Возвращает список путей ко всем JSON файлам в директории и её подпапках
+
+        Если пакет актуален для этой директории, обход файловой системы не выполняется.
+        """
+        self._open()
+        if self._dirs:
+            files = self._walk_bundled(directory)
+            if files is not None:
+                return files
+
+        files = []
+        for root, dirs, filenames in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+            for filename in sorted(filenames):
+                if filename.endswith(".json"):
+                    files.append(os.path.join(root, filename))
+        return files
+
+    def load_json(self, file_path):
+        """Возвращает разобранное содержимое JSON файла
+
+        Данные берутся из пакета, если файл не изменился с момента компиляции,
+        иначе файл читается с диска.
+        """
+        self._open()
+        profiler = StartupProfiler()
+        entry = self._files.get(_normalize_path(file_path))
+        if entry is not None:
+            mtime_ns, size, digest, blob = entry
+            stat = os.stat(file_path)
+            if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+                # Сам файл не читается, учитываем объем данных из пакета
+                profiler.record_file(len(blob))
+                return pickle.loads(blob)
+
+            # Метаданные изменились, но содержимое могло остаться прежним
+            with open(file_path, "rb") as f:
+                raw = f.read()
+            profiler.record_file(len(raw))
+            if hashlib.sha1(raw).hexdigest() == digest:
+                return pickle.loads(blob)
+            return json.loads(raw.decode("utf-8"))
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            profiler.record_file(os.fstat(f.fileno()).st_size)
+        return data
+
+    def iter_entries(self, file_path, expand=()):
+        """Генератор записей верхнего уровня JSON файла
+
+        Большие файлы разбираются потоково (см. JsonStream), поэтому дерево разбора
+        всего файла не находится в памяти целиком. Остальные файлы читаются
+        через load_json.
+
+        Args:
+            file_path: Путь к JSON файлу
+            expand: Ключи, массивы которых нужно возвращать по одному элементу
+
+        Yields:
+            tuple: (ключ, значение) или (ключ, элемент массива)
+        """
+        size = os.path.getsize(file_path)
+        if size >= STREAMING_THRESHOLD:
+            StartupProfiler().record_file(size)
+            yield from JsonStream(file_path).entries(expand)
+            return
+
+        data = self.load_json(file_path)
+        if not isinstance(data, dict):
+            raise ValueError(f"{file_path}: ожидался JSON объект на верхнем уровне")
+        for key, value in data.items():
+            if key in expand and isinstance(value, list):
+                for element in value:
+                    yield key, element
+            else:
+                yield key, value
+
+
+# Компиляция пакета контента: python -m src.loaders.ContentBundle
+if __name__ == "__main__":
+    bundle = ContentBundle()
+    count = bundle.compile()
+    print(f"Упаковано {count} файлов в {bundle.bundle_path}")
@@ -0,0 +1,153 @@
+from src.models.npc.TraderNPC import TraderNPC
+from src.models.quests.objectives.CollectObjective import CollectObjective
+from src.models.quests.objectives.TalkObjective import TalkObjective
+from src.models.quests.objectives.GotoObjective import GotoObjective
+from src.utils.Logger import Logger
+
+
+class ContentIndex:
+    """
+    Обратные индексы ссылок между загруженным контентом
+
+    Строится одним проходом после загрузки локаций, предметов, NPC, монстров
+    и квестов. Битые ссылки (ID, которых нет среди загруженных объектов)
+    собираются в список problems и выводятся в лог один раз за построение,
+    а игровой код получает ответы на запросы вида "где добывается предмет"
+    или "в какой локации NPC" без перебора всех локаций.
+    """
+
+    def __init__(self):
+        self.logger = Logger()
+        self._clear()
+
+    def _clear(self):
+        self.resource_locations = {}  # {item_id: [location_id, ...]} - где добывается ресурс
+        self.monster_locations = {}   # {monster_id: [location_id, ...]}
+        self.npc_locations = {}       # {npc_id: location_id}
+        self.quests_by_giver = {}     # {npc_id: [quest_id, ...]}
+        self.quests_by_taker = {}     # {npc_id: [quest_id, ...]}
+        self.item_sellers = {}        # {item_id: [npc_id, ...]}
+        self.item_buyers = {}         # {item_id: [npc_id, ...]}
+        self.problems = []            # [(источник, поле, ID), ...] - битые ссылки
+
+    def build(self, locations, items, npcs, monsters, quests):
+        """Строит индексы и проверяет ссылки
+
+        Args:
+            locations: Локации {location_id: Location}
+            items: Данные предметов (ATLAS["ITEMS"])
+            npcs: NPC {npc_id: NPC}
+            monsters: Шаблоны монстров {monster_id: Monster}
+            quests: Квесты {quest_id: Quest}
+
+        Returns:
+            ContentIndex: self
+        """
+        self._clear()
+
+        def has_item(item_id):
+            # Game.get_item допускает ID предмета в другом регистре
+            return item_id in items or (isinstance(item_id, str) and item_id.lower() in items)
+
+        for location_id, location in locations.items():
+            source = f"локация {location_id}"
+            for connected_id in location.connected_locations:
+                if connected_id not in locations:
+                    self._problem(source, "connected_locations", connected_id)
+            for resource_id in location.available_resources:
+                self.resource_locations.setdefault(resource_id, []).append(location_id)
+                if not has_item(resource_id):
+                    self._problem(source, "resources", resource_id)
+            for monster_id in location.available_monsters:
+                self.monster_locations.setdefault(monster_id, []).append(location_id)
+                if monster_id not in monsters:
+                    self._problem(source, "monsters", monster_id)
+            for npc_id in location.npcs:
+                if npc_id not in npcs:
+                    self._problem(source, "npcs", npc_id)
+                elif npc_id in self.npc_locations:
+                    self._problem(source, "npcs", f"{npc_id} (уже указан в локации {self.npc_locations[npc_id]})")
+                else:
+                    self.npc_locations[npc_id] = location_id
+
+        for npc_id, npc in npcs.items():
+            if isinstance(npc, TraderNPC):
+                source = f"торговец {npc_id}"
+                for item_id in npc.sells:
+                    self.item_sellers.setdefault(item_id, []).append(npc_id)
+                    if not has_item(item_id):
+                        self._problem(source, "sells", item_id)
+                for item_id in npc.buys:
+                    self.item_buyers.setdefault(item_id, []).append(npc_id)
+                    if not has_item(item_id):
+                        self._problem(source, "buys", item_id)
+
+        for quest_id, quest in quests.items():
+            source = f"квест {quest_id}"
+            if quest.giver_id:
+                self.quests_by_giver.setdefault(quest.giver_id, []).append(quest_id)
+                if quest.giver_id not in npcs:
+                    self._problem(source, "giver_id", quest.giver_id)
+            if quest.taker_id:
+                self.quests_by_taker.setdefault(quest.taker_id, []).append(quest_id)
+                if quest.taker_id not in npcs and quest.taker_id != quest.giver_id:
+                    self._problem(source, "taker_id", quest.taker_id)
+            for stage in quest.stages:
+                for objective in stage.objectives:
+                    if isinstance(objective, CollectObjective) and not has_item(objective.item_id):
+                        self._problem(source, "item_id", objective.item_id)
+                    elif isinstance(objective, TalkObjective) and objective.npc_id not in npcs:
+                        self._problem(source, "npc_id", objective.npc_id)
+                    elif isinstance(objective, GotoObjective) and objective.location_id not in locations:
+                        self._problem(source, "location_id", objective.location_id)
+
+        self.report()
+        return self
+
+    def _problem(self, source, field, ref_id):
+        self.problems.append((source, field, ref_id))
+
+    def report(self):
+        """Выводит в лог сводку по индексам и все битые ссылки"""
+        self.logger.info("ContentIndex: ресурсов: {}, монстров: {}, NPC в локациях: {}, квестодателей: {}",
+                         len(self.resource_locations), len(self.monster_locations),
+                         len(self.npc_locations), len(self.quests_by_giver))
+        if not self.problems:
+            self.logger.info("ContentIndex: битых ссылок не найдено")
+            return
+
+        self.logger.warning("ContentIndex: найдено битых ссылок: {}", len(self.problems))
+        for source, field, ref_id in self.problems:
+            self.logger.warning("ContentIndex: {} ссылается на отсутствующий ID в поле {}: {}", source, field, ref_id)
+
+    def format_problems(self):
+        """Возвращает список битых ссылок в виде текста"""
+        return "\n".join(f"{source}: {field} -> {ref_id}" for source, field, ref_id in self.problems)
+
+    def get_resource_locations(self, item_id):
+        """Возвращает ID локаций, где добывается ресурс"""
+        return self.resource_locations.get(item_id, [])
+
+    def get_monster_locations(self, monster_id):
+        """Возвращает ID локаций, где встречается монстр"""
+        return self.monster_locations.get(monster_id, [])
+
+    def get_npc_location(self, npc_id):
+        """Возвращает ID локации, в списке NPC которой указан NPC, или None"""
+        return self.npc_locations.get(npc_id)
+
+    def get_quests_by_giver(self, npc_id):
+        """Возвращает ID квестов, которые выдает NPC"""
+        return self.quests_by_giver.get(npc_id, [])
+
+    def get_quests_by_taker(self, npc_id):
+        """Возвращает ID квестов, которые сдаются NPC"""
+        return self.quests_by_taker.get(npc_id, [])
+
+    def get_item_sellers(self, item_id):
+        """Возвращает ID торговцев, которые продают предмет"""
+        return self.item_sellers.get(item_id, [])
+
+    def get_item_buyers(self, item_id):
+        """Возвращает ID торговцев, которые покупают предмет"""
+        return self.item_buyers.get(item_id, [])
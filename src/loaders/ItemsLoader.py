@@ -1,17 +1,24 @@
-import json
 import os
 import sys
 from src.models.inventory.InventoryItem import InventoryItem
 from src.loaders.Loader import Loader
+from src.loaders.ContentBundle import ContentBundle
 from src.models.inventory.types.Material import Material
 from src.models.inventory.types.Armor import Armor
 from src.utils.Logger import Logger
 # Импортируйте здесь другие типы предметов по мере необходимости
 
 class ItemsLoader(Loader):
-    def __init__(self):
+    # Значения по умолчанию на уровне класса (в том числе для загрузчиков из старых сохранений)
+    cache_templates = True
+    default_items = ()
+
+    def __init__(self, cache_templates=True):
         self.items_atlas = {}  # JSON данные предметов
-        self.inventory_items = {}  # Объекты инвентаря
+        self.inventory_items = {}  # Шаблоны объектов инвентаря, создаются при первом обращении
+        self.default_items = []  # ID предметов, выдаваемых игроку в начале новой игры
+        # False - не хранить шаблоны, создавать предметы из JSON данных при каждом обращении
+        self.cache_templates = cache_templates
         self.logger = Logger()
 
     def load(self):
@@ -25,31 +32,16 @@ class ItemsLoader(Loader):
         else:
             self.logger.debug("Сканирование директории {}", items_dir)
         
+        # Шаблоны прошлой загрузки могли устареть
+        self.inventory_items = {}
+        self.default_items = []
+        
         # Рекурсивно сканируем все директории
         self._scan_directory(items_dir)
         
-        # Создаем объекты инвентаря после загрузки JSON
-        self._create_inventory_items()
-        
         self.logger.info("ItemsLoader: загружено {} сущностей", len(self.items_atlas))
         return self.items_atlas
         
-    def _create_inventory_items(self):
-        """Создает объекты инвентаря на основе загруженных JSON данных"""
-        created_count = 0
-        for item_id, item_data in self.items_atlas.items():
-            # Пропускаем составные ключи, чтобы не создавать дубликаты
-            if "." in item_id:
-                continue
-                
-            if isinstance(item_data, dict) and "item_type" in item_data:
-                inventory_item = self._create_inventory_item(item_data)
-                if inventory_item:
-                    self.inventory_items[item_id] = inventory_item
-                    created_count += 1
-        
-        self.logger.debug("Создано {} объектов инвентаря", created_count)
-    
     def _create_inventory_item(self, item_data, count=1, item_id=None):
         """Создает объект предмета инвентаря из JSON данных"""
         try:
@@ -95,25 +87,59 @@ class ItemsLoader(Loader):
         
     # Получить объект инвентаря
     def get_inventory_item(self, item_id, count=1):
-        """Возвращает объект инвентарного предмета по его ID"""
-        # Предмет в кэше - создаем новый с заданным количеством
-        if item_id in self.inventory_items:
-            item_data = self.items_atlas[item_id]
-            return self._create_inventory_item(item_data, count, item_id)
+        """Возвращает объект инвентарного предмета по его ID
         
-        # Предмет не найден в кэше, пробуем создать его заново
-        if item_id in self.items_atlas:
-            item_data = self.items_atlas[item_id]
-            inventory_item = self._create_inventory_item(item_data, count, item_id)
-            if inventory_item:
-                # Сохраняем шаблон предмета (с количеством 1) в кэш
-                template_item = self._create_inventory_item(item_data, 1, item_id)
-                if template_item:
-                    self.inventory_items[item_id] = template_item
-                return inventory_item
+        Шаблон предмета создается при первом обращении и кэшируется,
+        следующие предметы с тем же ID создаются копированием шаблона.
+        """
+        template = self.inventory_items.get(item_id)
+        if template is None:
+            item_data = self.items_atlas.get(item_id)
+            if item_data is None:
+                self.logger.error(f"Предмет с ID {item_id} не найден!")
+                return None
+            
+            # Без кэша шаблонов создаем предмет напрямую из JSON данных
+            if not self.cache_templates:
+                return self._create_inventory_item(item_data, count, item_id)
+            
+            template = self._create_inventory_item(item_data, 1, item_id)
+            if template is None:
+                return None
+            self.inventory_items[item_id] = template
         
-        self.logger.error(f"Предмет с ID {item_id} не найден!")
-        return None
+        inventory_item = template.copy()
+        inventory_item.set_count(count)
+        return inventory_item
+    
+    def reload_file(self, file_path):
+        """Перечитывает один файл предметов без полной перезагрузки
+
+        Данные предметов обновляются на месте, шаблоны измененных предметов
+        создаются заново при следующем обращении. Предметы в инвентаре игрока не меняются.
+        """
+        # Сначала читаем файл целиком, чтобы ошибка в нем не оставила атлас обновленным наполовину
+        reloaded = {}
+        for item_id, item_data in ContentBundle().iter_entries(file_path):
+            if isinstance(item_data, dict):
+                reloaded[item_id.lower()] = item_data
+
+        default_before = set(self.default_items)
+        for item_id, item_data in reloaded.items():
+            self.items_atlas[item_id] = item_data
+            self.inventory_items.pop(item_id, None)
+            if item_data.get("default", False) == True:
+                if item_id not in default_before:
+                    self.default_items.append(item_id)
+            elif item_id in default_before:
+                self.default_items.remove(item_id)
+
+        self.logger.info("ItemsLoader: перезагружено {} предметов из файла {}", len(reloaded), file_path)
+        return len(reloaded)
+
+    def get_default_items(self):
+        """Возвращает ID предметов, которые выдаются игроку в начале новой игры"""
+        return list(self.default_items)
     
     # Магические методы для работы как со словарем
     def __getitem__(self, key):
@@ -146,39 +172,30 @@ class ItemsLoader(Loader):
         
     def _scan_directory(self, directory):
         """Рекурсивно сканирует директорию и загружает все JSON файлы с предметами"""
-        for item in os.listdir(directory):
-            path = os.path.join(directory, item)
+        if not os.path.exists(directory):
+            return
             
-            if os.path.isdir(path):
-                # Рекурсивно обрабатываем поддиректории
-                self._scan_directory(path)
-            elif item.endswith(".json"):
-                # Загружаем JSON файл с предметами
-                self._load_items_from_file(path)
+        for path in ContentBundle().walk_json(directory):
+            # Загружаем JSON файл с предметами
+            self._load_items_from_file(path)
 
     def _load_items_from_file(self, file_path):
         """Загружает предметы из JSON файла"""
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                items_data = json.load(file)
-                
-                if isinstance(items_data, dict):
-                    for item_id, item_data in items_data.items():
-                        # Добавляем ID предмета в его данные
-                        if isinstance(item_data, dict):
-                            # Добавляем предмет в атлас
-                            self.items_atlas[item_id.lower()] = item_data
-                            
-                            # Сразу создаем шаблон объекта инвентаря для кэша
-                            if "type" in item_data:
-                                try:
-                                    template_item = self._create_inventory_item(item_data, 1, item_id.lower())
-                                    if template_item:
-                                        self.inventory_items[item_id.lower()] = template_item
-                                except Exception as e:
-                                    self.logger.error(f"Ошибка создания шаблона предмета {item_id}: {str(e)}")
-                            
-                self.logger.debug("Загружено {} предметов из файла {}", len(items_data), file_path)
+            items_in_file = 0
+            # Предметы читаются по одному, большой файл не разбирается в память целиком
+            for item_id, item_data in ContentBundle().iter_entries(file_path):
+                if isinstance(item_data, dict):
+                    # Добавляем предмет в атлас, шаблон объекта будет создан при первом обращении
+                    item_id = item_id.lower()
+                    self.items_atlas[item_id] = item_data
+                    items_in_file += 1
+                    
+                    # Запоминаем стартовые предметы, чтобы не перебирать весь каталог
+                    if item_data.get("default", False) == True and item_id not in self.default_items:
+                        self.default_items.append(item_id)
+                        
+            self.logger.debug("Загружено {} предметов из файла {}", items_in_file, file_path)
         except Exception as e:
             self.logger.error("Ошибка при загрузке файла {}: {}", file_path, str(e))
 
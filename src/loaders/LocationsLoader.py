@@ -1,6 +1,7 @@
-import json
 import os
+from collections import ChainMap
 from src.loaders.Loader import Loader
+from src.loaders.ContentBundle import ContentBundle
 from src.models.Location import Location
 from src.utils.Logger import Logger
 
@@ -27,75 +28,20 @@ class LocationsLoader(Loader):
         total_connections_loaded = 0
         total_resources_loaded = 0
         
-        # Рекурсивно проходим по всем файлам в директории и её подпапках
-        for root, dirs, files in os.walk(locations_dir):
-            for file in files:
-                # Проверяем, что это JSON файл
-                if not file.endswith('.json'):
-                    continue
-                
-                file_path = os.path.join(root, file)
-                self.logger.info(f"Обрабатываем файл локаций: {file_path}")
-                
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        
-                        # Загружаем локации
-                        if "locations" in data:
-                            locations_in_file = 0
-                            for location_data in data["locations"]:
-                                location = self._create_location(location_data)
-                                if location:
-                                    self.locations[location.id] = location
-                                    locations_in_file += 1
-                            
-                            self.logger.info(f"Загружено {locations_in_file} локаций из файла {file_path}")
-                            total_locations_loaded += locations_in_file
-                        
-                        # Загружаем связи между локациями
-                        if "connections" in data:
-                            connections_in_file = 0
-                            for connection in data["connections"]:
-                                if "from" in connection and "to" in connection:
-                                    from_id = connection["from"]
-                                    to_id = connection["to"]
-                                    
-                                    if from_id in self.locations and to_id in self.locations:
-                                        self.locations[from_id].add_connection(to_id)
-                                        connections_in_file += 1
-                                        
-                                        # Если связь двусторонняя
-                                        if connection.get("bidirectional", True):
-                                            self.locations[to_id].add_connection(from_id)
-                                            connections_in_file += 1
-                            
-                            self.logger.info(f"Загружено {connections_in_file} связей между локациями из файла {file_path}")
-                            total_connections_loaded += connections_in_file
-                        
-                        # Загружаем ресурсы для локаций
-                        if "resources" in data:
-                            resources_in_file = 0
-                            for resource_data in data["resources"]:
-                                if "location_id" in resource_data and "resource_id" in resource_data:
-                                    location_id = resource_data["location_id"]
-                                    resource_id = resource_data["resource_id"]
-                                    max_count = resource_data.get("max_count", 10)
-                                    respawn_time = resource_data.get("respawn_time", 300)  # в секундах
-                                    
-                                    if location_id in self.locations:
-                                        self.locations[location_id].add_resource(
-                                            resource_id, max_count, respawn_time)
-                                        resources_in_file += 1
-                            
-                            self.logger.info(f"Загружено {resources_in_file} ресурсов для локаций из файла {file_path}")
-                            total_resources_loaded += resources_in_file
-                        
-                        total_files_processed += 1
-                        
-                except Exception as e:
-                    self.logger.exception(f"Ошибка при загрузке локаций из файла {file_path}: {str(e)}")
-        
+        # Рекурсивно проходим по всем JSON файлам в директории и её подпапках
+        for file_path in ContentBundle().walk_json(locations_dir):
+            self.logger.info(f"Обрабатываем файл локаций: {file_path}")
+            
+            try:
+                locations_in_file, connections_in_file, resources_in_file = self._load_file(file_path, self.locations)
+                total_locations_loaded += locations_in_file
+                total_connections_loaded += connections_in_file
+                total_resources_loaded += resources_in_file
+                total_files_processed += 1
+                    
+            except Exception as e:
+                self.logger.exception(f"Ошибка при загрузке локаций из файла {file_path}: {str(e)}")
+    
         # Суммарная статистика
         self.logger.info(f"Всего обработано файлов: {total_files_processed}")
         self.logger.info(f"Всего загружено локаций: {total_locations_loaded}")
@@ -104,7 +50,107 @@ class LocationsLoader(Loader):
         
         return self.locations
     
-    def _create_location(self, location_data):
+    def _load_file(self, file_path, locations):
+        """Загружает локации, связи и ресурсы из одного JSON файла
+        
+        Args:
+            file_path: Путь к файлу локаций
+            locations: Словарь, в который добавляются локации и в котором ищутся концы связей
+            
+        Returns:
+            tuple: Количество загруженных локаций, связей и ресурсов
+        """
+        locations_in_file = 0
+        connections = []
+        resources = []
+        # Регион локаций по умолчанию - имя файла (new_eldcron_region.json -> new_eldcron_region)
+        region = os.path.splitext(os.path.basename(file_path))[0]
+        
+        # Локации создаются по мере чтения файла, большой файл не разбирается в память целиком
+        for key, entry in ContentBundle().iter_entries(file_path, expand=("locations", "connections", "resources")):
+            if key == "locations":
+                location = self._create_location(entry, region)
+                if location:
+                    locations[location.id] = location
+                    locations_in_file += 1
+            elif key == "connections":
+                connections.append(entry)
+            elif key == "resources":
+                resources.append(entry)
+                
+        self.logger.info(f"Загружено {locations_in_file} локаций из файла {file_path}")
+            
+        # Связи и ресурсы обрабатываем после чтения файла, когда известны все его локации
+        connections_in_file = 0
+        for connection in connections:
+            if "from" in connection and "to" in connection:
+                from_id = connection["from"]
+                to_id = connection["to"]
+                travel_time, stamina = self._travel_cost(connection)
+                    
+                if from_id in locations and to_id in locations:
+                    locations[from_id].add_connection(to_id, travel_time, stamina)
+                    connections_in_file += 1
+                        
+                    # Если связь двусторонняя
+                    if connection.get("bidirectional", True):
+                        locations[to_id].add_connection(from_id, travel_time, stamina)
+                        connections_in_file += 1
+            
+        self.logger.info(f"Загружено {connections_in_file} связей между локациями из файла {file_path}")
+            
+        # Загружаем ресурсы для локаций
+        resources_in_file = 0
+        for resource_data in resources:
+            if "location_id" in resource_data and "resource_id" in resource_data:
+                location_id = resource_data["location_id"]
+                resource_id = resource_data["resource_id"]
+                max_count = resource_data.get("max_count", 10)
+                respawn_time = resource_data.get("respawn_time", 300)  # в секундах
+                    
+                if location_id in locations:
+                    locations[location_id].add_resource(
+                        resource_id, max_count, respawn_time)
+                    resources_in_file += 1
+            
+        self.logger.info(f"Загружено {resources_in_file} ресурсов для локаций из файла {file_path}")
+        return locations_in_file, connections_in_file, resources_in_file
+    
+    def reload_file(self, file_path):
+        """Перечитывает один файл локаций без полной перезагрузки
+        
+        Уже загруженные локации обновляются на месте: меняется их описание,
+        а текущее количество ресурсов и монстров сохраняется.
+        
+        Returns:
+            int: Количество перезагруженных локаций
+        """
+        # Новые объекты собираются отдельно, а связи могут вести и в уже загруженные локации
+        reloaded = {}
+        self._load_file(file_path, ChainMap(reloaded, self.locations))
+        
+        for location_id, location in reloaded.items():
+            if location_id in self.locations:
+                self.locations[location_id].update_definition(location, reloaded.keys())
+            else:
+                self.locations[location_id] = location
+                
+        self.logger.info(f"LocationsLoader: перезагружено {len(reloaded)} локаций из файла {file_path}")
+        return len(reloaded)
+    
+    def _travel_cost(self, connection):
+        """Возвращает (travel_time, stamina) связи, None - стоимость не указана"""
+        cost = []
+        for key in ("travel_time", "stamina"):
+            value = connection.get(key)
+            if value is not None and (not isinstance(value, (int, float)) or value < 0):
+                self.logger.warning("Связь {} -> {}: некорректное значение {} = {}, используется значение по умолчанию",
+                                    connection["from"], connection["to"], key, value)
+                value = None
+            cost.append(value)
+        return tuple(cost)
+    
+    def _create_location(self, location_data, region=None):
         """Создает объект Location из данных JSON"""
         try:
             if "id" in location_data and "name" in location_data:
@@ -115,7 +161,8 @@ class LocationsLoader(Loader):
                     location_data["id"],
                     location_data["name"],
                     location_data.get("description", ""),
-                    first_spawn_at
+                    first_spawn_at,
+                    location_data.get("region", region)
                 )
                 
                 # Добавляем ресурсы с параметрами респауна
@@ -0,0 +1,277 @@
+import hashlib
+import os
+import pickle
+import struct
+from src.loaders.Loader import Loader
+from src.loaders.ContentBundle import ContentBundle, _normalize_path
+from src.models.quests.Quest import Quest
+from src.models.quests.QuestStage import QuestStage
+from src.models.quests.objectives.CollectObjective import CollectObjective
+from src.models.quests.objectives.TalkObjective import TalkObjective
+from src.models.quests.objectives.GotoObjective import GotoObjective
+from src.utils.Logger import Logger
+from src.utils.StartupProfiler import StartupProfiler
+
+QUESTS_CACHE_MAGIC = b"TRPGQC"
+# Версию нужно увеличивать при изменении классов квестов или правил их сборки
+QUESTS_CACHE_VERSION = 1
+DEFAULT_QUESTS_CACHE_PATH = os.path.join("resources", ".cache", "quests.cache")
+
+
+class QuestsLoader(Loader):
+    """
+    Загрузчик квестов с кэшем собранного графа квестов
+
+    Квесты, стадии и цели собираются из JSON файлов и сохраняются в кэш на диске.
+    Ключ кэша - хеш содержимого всех файлов квестов, поэтому при неизмененных
+    файлах граф загружается из кэша одним чтением. Данные, которые зависят от
+    остального контента (названия предметов, списки квестов у NPC), в кэш не
+    попадают и подставляются в bind().
+    """
+
+    def __init__(self, quests_dir="resources/quests", cache_path=DEFAULT_QUESTS_CACHE_PATH, use_cache=True):
+        self.quests_dir = quests_dir
+        self.cache_path = cache_path
+        self.use_cache = use_cache
+        self.quests = {}  # {quest_id: quest_object}
+        self.logger = Logger()
+
+    def load(self):
+        """Загружает квесты из директории и всех её подпапок
+
+        Returns:
+            dict: Квесты {quest_id: quest_object}
+        """
+        self.quests = {}
+
+        if not os.path.exists(self.quests_dir):
+            self.logger.error(f"Директория квестов не найдена: {self.quests_dir}")
+            return self.quests
+
+        files = ContentBundle().walk_json(self.quests_dir)
+        cache_key = self._cache_key(files) if self.use_cache else None
+
+        if cache_key is not None:
+            cached = self._read_cache(cache_key)
+            if cached is not None:
+                self.quests = cached
+                self.logger.info(f"Загружено {len(self.quests)} квестов из кэша {self.cache_path}")
+                return self.quests
+
+        # Счетчики для логирования
+        total_files_processed = 0
+
+        for file_path in files:
+            self.logger.info(f"Обрабатываем файл квестов: {file_path}")
+
+            try:
+                quests_in_file = self.load_file(file_path)
+                self.quests.update(quests_in_file)
+                total_files_processed += 1
+            except Exception as e:
+                self.logger.error(f"Ошибка при загрузке квестов из {file_path}: {e}")
+
+        # Суммарная статистика
+        self.logger.info(f"Всего обработано файлов квестов: {total_files_processed}")
+        self.logger.info(f"Всего загружено квестов: {len(self.quests)}")
+
+        # Выводим список всех загруженных квестов для отладки
+        for quest_id in self.quests:
+            self.logger.debug("- Квест: {}", quest_id)
+
+        if cache_key is not None:
+            self._write_cache(cache_key, self.quests)
+
+        return self.quests
+
+    def load_file(self, file_path):
+        """Собирает квесты из одного JSON файла
+
+        Returns:
+            dict: Квесты файла {quest_id: quest_object}
+        """
+        quests = {}
+        # Квесты читаются по одному, большой файл не разбирается в память целиком
+        for key, quest_info in ContentBundle().iter_entries(file_path, expand=('quests',)):
+            if key != 'quests':
+                continue
+
+            quest = self.create_quest(quest_info)
+            quests[quest.id] = quest
+            self.logger.info(f"Загружен квест: {quest.id}")
+
+        self.logger.info(f"Загружено {len(quests)} квестов из файла {file_path}")
+        return quests
+
+    def bind(self, atlas, npc_manager, quests=None):
+        """Привязывает собранные квесты к текущим данным игры
+
+        Подставляет названия предметов в описания целей сбора и добавляет
+        квесты в списки доступных квестов у NPC, которые их выдают.
+
+        Args:
+            atlas: ATLAS игры с загруженными предметами
+            npc_manager: Менеджер NPC
+            quests: Квесты для привязки, по умолчанию - все загруженные
+        """
+        if quests is None:
+            quests = self.quests
+        items = atlas["ITEMS"]
+
+        for quest_id, quest in quests.items():
+            for stage in quest.stages:
+                for objective in stage.objectives:
+                    # Получаем название предмета для более информативного отображения
+                    if isinstance(objective, CollectObjective) and objective.item_id in items:
+                        item_name = items[objective.item_id].get("name", objective.item_id)
+                        objective.description = f"Собрать {objective.required_count} {item_name}"
+
+            # Добавляем квест в список доступных квестов у NPC, если указан
+            if quest.giver_id:
+                npc = npc_manager.get_npc(quest.giver_id)
+                if npc and hasattr(npc, 'add_available_quest'):
+                    npc.add_available_quest(quest_id)
+
+    def create_quest(self, quest_info):
+        """Создает объект квеста из данных JSON
+        
+        Названия предметов в целях сбора подставляются позже, в bind().
+        """
+        # Загружаем основную информацию о квесте
+        quest_id = quest_info.get('id', '')
+        name = quest_info.get('name', 'Безымянный квест')
+        description = quest_info.get('description', '')
+        giver_id = quest_info.get('giver_id', '')
+        taker_id = quest_info.get('taker_id', giver_id)
+        completion_text = quest_info.get('completion_text', '')
+        
+        # Создаем объект квеста
+        quest = Quest(quest_id, name, description, giver_id)
+        quest.taker_id = taker_id
+        
+        # Добавляем текст завершения квеста, если он есть
+        if completion_text:
+            quest.completion_text = completion_text
+        
+        # Загружаем требования
+        if 'requirements' in quest_info:
+            reqs = quest_info['requirements']
+            quest.requirements["level"] = reqs.get('level', 1)
+            quest.requirements["skills"] = reqs.get('skills', {})
+            quest.requirements["items"] = reqs.get('items', {})
+            quest.requirements["quests"] = reqs.get('quests', [])
+        
+        # Загружаем награды
+        if 'rewards' in quest_info:
+            rewards = quest_info['rewards']
+            quest.rewards["experience"] = rewards.get('experience', 0)
+            quest.rewards["money"] = rewards.get('money', 0)
+            quest.rewards["items"] = rewards.get('items', {})
+            quest.rewards["skills"] = rewards.get('skills', {})
+        
+        # Загружаем стадии и цели квеста
+        if 'stages' in quest_info:
+            for stage_info in quest_info['stages']:
+                stage_name = stage_info.get('name', 'Безымянная стадия')
+                stage_desc = stage_info.get('description', '')
+                
+                # Создаем стадию квеста
+                stage = QuestStage(stage_name, stage_desc)
+                
+                # Добавляем цели для стадии
+                if 'objectives' in stage_info:
+                    for obj_data in stage_info['objectives']:
+                        obj_type = obj_data.get('type', '')
+                        
+                        if obj_type == "gather" or obj_type == "collect":
+                            # Задача на сбор предметов
+                            item_id = obj_data.get("item_id", "")
+                            count = obj_data.get("count", 1)
+                            description = obj_data.get("description", f"Собрать {count} {item_id}")
+                            
+                            objective = CollectObjective(item_id, count, description)
+                            stage.objectives.append(objective)
+                            
+                        elif obj_type == "talk":
+                            # Задача на разговор с NPC
+                            npc_id = obj_data.get("npc_id", "")
+                            description = obj_data.get("description", f"Поговорить с {npc_id}")
+                            
+                            objective = TalkObjective(npc_id, description)
+                            stage.objectives.append(objective)
+                            
+                        elif obj_type == "goto":
+                            # Задача на посещение локации
+                            location_id = obj_data.get("location_id", "")
+                            description = obj_data.get("description", f"Посетить {location_id}")
+                            
+                            objective = GotoObjective(location_id, description)
+                            stage.objectives.append(objective)
+                        
+                        # Здесь можно добавить другие типы задач
+                
+                quest.add_stage(stage)
+        
+        return quest
+
+    def _cache_key(self, files):
+        """Считает ключ кэша по путям и содержимому файлов квестов"""
+        digest = hashlib.sha1(struct.pack("<I", QUESTS_CACHE_VERSION))
+        try:
+            for file_path in files:
+                digest.update(_normalize_path(file_path).encode("utf-8") + b"\0")
+                with open(file_path, "rb") as f:
+                    raw = f.read()
+                StartupProfiler().record_file(len(raw))
+                digest.update(hashlib.sha1(raw).digest())
+        except OSError as e:
+            self.logger.warning(f"Не удалось посчитать ключ кэша квестов: {str(e)}")
+            return None
+        return digest.digest()
+
+    def _read_cache(self, cache_key):
+        """Возвращает квесты из кэша или None, если кэш отсутствует или устарел"""
+        if not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "rb") as f:
+                header = f.read(len(QUESTS_CACHE_MAGIC) + len(cache_key))
+                if header != QUESTS_CACHE_MAGIC + cache_key:
+                    self.logger.debug("Кэш квестов устарел и будет пересобран")
+                    return None
+                quests = pickle.load(f)
+                StartupProfiler().record_file(f.tell())
+                return quests
+        except Exception as e:
+            self.logger.warning(f"Ошибка при чтении кэша квестов {self.cache_path}: {str(e)}")
+            return None
+
+    def _write_cache(self, cache_key, quests):
+        """Сохраняет собранные квесты в кэш"""
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+
+            # Пишем во временный файл и подменяем, чтобы не оставить битый кэш
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(QUESTS_CACHE_MAGIC + cache_key)
+                pickle.dump(quests, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+            self.logger.debug("Кэш квестов сохранен в {}", self.cache_path)
+        except Exception as e:
+            self.logger.warning(f"Не удалось сохранить кэш квестов {self.cache_path}: {str(e)}")
+
+    # Магические методы для работы как со словарем
+    def __getitem__(self, key):
+        """Позволяет обращаться через квадратные скобки: loader['quest_id']"""
+        return self.quests[key]
+
+    def __contains__(self, key):
+        """Позволяет использовать проверку 'in': 'quest_id' in loader"""
+        return key in self.quests
+
+    def __len__(self):
+        """Позволяет использовать len(): len(loader)"""
+        return len(self.quests)
@@ -1,9 +1,60 @@
 import random
-from src.utils.Logger import Logger
+from src.utils.Clock import Clock
+from src.utils.IdTable import IdTable
+from src.utils.SlotsState import SlotsState, SharedLogger
 
-class Location:
-    def __init__(self, id, name, description="", first_spawn_at=False):
-        self.id = id
+RESOURCES = "resources"
+MONSTERS = "monsters"
+
+# Стоимость перехода по связи, для которой она не указана
+DEFAULT_TRAVEL_TIME = 1
+DEFAULT_TRAVEL_STAMINA = 0
+
+
+def respawn_interval(max_count, respawn_time):
+    """Возвращает время восстановления одной единицы записи
+    
+    Args:
+        max_count: Максимальное количество
+        respawn_time: Время полного восстановления в секундах; 0 - мгновенно,
+            отрицательное - запись не восстанавливается (например, уникальный квестовый предмет)
+            
+    Returns:
+        float: Секунд на единицу, 0 - мгновенно, None - запись не восстанавливается
+    """
+    if respawn_time < 0:
+        return None
+    if respawn_time == 0 or max_count <= 0:
+        return 0
+    return respawn_time / max_count
+
+
+class Location(SlotsState):
+    """
+    Локация игрового мира
+    
+    Ресурсы и монстры восстанавливаются со скоростью max_count / respawn_time
+    единиц в секунду (respawn_time = 0 - мгновенно, отрицательное - запись не
+    восстанавливается, см. respawn_interval). Локация не обновляется по таймеру:
+    для каждой неполной записи хранится момент, с которого идет восстановление,
+    а текущее количество досчитывается при обращении к resources и monsters.
+    Дробная часть восстановления не теряется - момент сдвигается только на
+    целые единицы.
+    
+    Количества могут храниться в общем хранилище WorldState (attach_world_state),
+    тогда resources и monsters возвращают представления над его массивами.
+    """
+    __slots__ = (
+        "id", "name", "description", "connected_locations",
+        "available_resources", "_resources", "available_monsters", "_monsters",
+        "_respawn_since", "npcs", "first_spawn_at", "_world", "region", "travel_costs",
+    )
+    logger = SharedLogger()
+    
+    def __init__(self, id, name, description="", first_spawn_at=False, region=None):
+        self._world = None  # Хранилище WorldState, к которому подключена локация (не попадает в сохранения)
+        # ID интернируются: одинаковые ID локаций, ресурсов и NPC - один объект строки
+        self.id = IdTable.intern(id)
         self.name = name
         self.description = description
         self.connected_locations = []  # ID локаций, доступных из текущей
@@ -11,35 +62,229 @@ class Location:
         self.resources = {}  # Текущее состояние ресурсов {resource_id: count}
         self.available_monsters = {}  # Словарь {monster_id: {max_count: X, respawn_time: Y}}
         self.monsters = {}  # Текущее состояние монстров {monster_id: count}
+        self._respawn_since = {}  # Начало восстановления неполных записей {(kind, entry_id): timestamp}
         self.npcs = []  # Список ID NPC на локации
-        self.logger = Logger()
         self.first_spawn_at = first_spawn_at  # Флаг для определения начальной локации
+        self.region = IdTable.intern(region)  # ID региона (по умолчанию - имя файла локаций)
+        self.travel_costs = {}  # Стоимость переходов, отличная от стандартной {location_id: (time, stamina)}
+    
+    def __setstate__(self, state):
+        """Восстанавливает состояние из pickle с поддержкой сохранений старых версий"""
+        state = dict(state)
+        # Количества хранятся в сохранениях под ключами resources и monsters
+        state["_resources"] = state.pop(RESOURCES, {})
+        state["_monsters"] = state.pop(MONSTERS, {})
+        # В старых сохранениях моменты восстановления не хранятся, их задает Game.start_respawns()
+        state.setdefault("_respawn_since", {})
+        state["_world"] = None
+        state.setdefault("region", None)
+        state.setdefault("travel_costs", {})
+        super().__setstate__(state)
+    
+    def __getstate__(self):
+        """Возвращает состояние для pickle, количества из WorldState записываются в словари"""
+        state = super().__getstate__()
+        state.pop("_world", None)
+        if self._world is not None:
+            state[RESOURCES], state[MONSTERS], state["_respawn_since"] = self._world.export(self.id)
+            state.pop("_resources")
+            state.pop("_monsters")
+        else:
+            state[RESOURCES] = state.pop("_resources")
+            state[MONSTERS] = state.pop("_monsters")
+        return state
+    
+    def attach_world_state(self, world):
+        """Подключает локацию к хранилищу WorldState, в которое уже перенесены ее количества"""
+        self._world = world
+    
+    def detach_world_state(self):
+        """Отключает локацию от WorldState, возвращая количества в словари локации"""
+        if self._world is None:
+            self.catch_up()
+            return
+        self._resources, self._monsters, self._respawn_since = self._world.export(self.id)
+        self._world = None
+    
+    @property
+    def resources(self):
+        """Текущее количество ресурсов {resource_id: count} с учетом восстановления"""
+        if self._world is not None:
+            return self._world.view(self.id, RESOURCES)
+        self.catch_up()
+        return self._resources
+    
+    @resources.setter
+    def resources(self, value):
+        # Набор записей мог измениться, поэтому словарь заменяет представление WorldState
+        if self._world is not None:
+            self.detach_world_state()
+        self._resources = value
+    
+    @property
+    def monsters(self):
+        """Текущее количество монстров {monster_id: count} с учетом восстановления"""
+        if self._world is not None:
+            return self._world.view(self.id, MONSTERS)
+        self.catch_up()
+        return self._monsters
+    
+    @monsters.setter
+    def monsters(self, value):
+        if self._world is not None:
+            self.detach_world_state()
+        self._monsters = value
+    
+    def _entry(self, kind, entry_id):
+        """Возвращает (текущие количества, параметры респауна) записи или None"""
+        if kind == RESOURCES:
+            info = self.available_resources.get(entry_id)
+            counts = self._resources
+        else:
+            info = self.available_monsters.get(entry_id)
+            counts = self._monsters
+        if info is None:
+            return None
+        return counts, info
+    
+    def catch_up(self, now=None):
+        """Досчитывает восстановление неполных записей к моменту now (по умолчанию - текущее время)"""
+        if self._world is not None:
+            self._world.catch_up_location(self.id, now)
+            return
+        pending = self._respawn_since
+        if not pending:
+            return
+        if now is None:
+            now = Clock().now()
+        
+        for key, since in list(pending.items()):
+            entry = self._entry(*key)
+            if entry is None:
+                del pending[key]
+                continue
+            counts, info = entry
+            entry_id = key[1]
+            max_count = info["max_count"]
+            current = counts.get(entry_id, 0)
+            if current >= max_count:
+                del pending[key]
+                continue
+            
+            interval = respawn_interval(max_count, info["respawn_time"])
+            if interval is None:
+                # Запись не восстанавливается
+                del pending[key]
+                continue
+            units = max_count - current if interval <= 0 else int((now - since) / interval)
+            if units <= 0:
+                continue
+            
+            new_count = min(current + units, max_count)
+            counts[entry_id] = new_count
+            if new_count >= max_count:
+                del pending[key]
+            else:
+                # Сдвигаем момент только на восстановленные единицы, остаток не теряется
+                pending[key] = since + units * interval
+    
+    def _start_respawn(self, kind, entry_id, since=None):
+        """Начинает восстановление записи, если она неполная и восстановление еще не идет"""
+        if self._world is not None:
+            self._world.start_respawn(self.id, kind, entry_id, since)
+            return
+        key = (kind, entry_id)
+        if key in self._respawn_since:
+            return
+        entry = self._entry(kind, entry_id)
+        if entry is None:
+            return
+        counts, info = entry
+        if respawn_interval(info["max_count"], info["respawn_time"]) is None:
+            # Запись не восстанавливается - момент начала не нужен
+            return
+        if counts.get(entry_id, 0) < info["max_count"]:
+            self._respawn_since[key] = Clock().now() if since is None else since
+    
+    def start_respawns(self, since=None):
+        """Начинает восстановление всех неполных записей локации
+        
+        Args:
+            since: Момент, с которого идет восстановление (по умолчанию - текущее время)
+        """
+        for resource_id in self.available_resources:
+            self._start_respawn(RESOURCES, resource_id, since)
+        for monster_id in self.available_monsters:
+            self._start_respawn(MONSTERS, monster_id, since)
     
-    def add_connection(self, location_id):
-        """Добавляет связь с другой локацией"""
+    def get_respawn_time(self, kind, entry_id):
+        """Возвращает момент восстановления следующей единицы записи
+        
+        Args:
+            kind: RESOURCES или MONSTERS
+            entry_id: ID ресурса или монстра
+            
+        Returns:
+            float: Момент восстановления или None, если запись полная или не восстанавливается
+        """
+        if self._world is not None:
+            return self._world.next_respawn_time(self.id, kind, entry_id)
+        self.catch_up()
+        since = self._respawn_since.get((kind, entry_id))
+        entry = self._entry(kind, entry_id)
+        if since is None or entry is None:
+            return None
+        info = entry[1]
+        interval = respawn_interval(info["max_count"], info["respawn_time"])
+        if interval is None:
+            return None
+        return since + interval
+    
+    def add_connection(self, location_id, travel_time=None, stamina=None):
+        """Добавляет связь с другой локацией
+        
+        Args:
+            location_id: ID локации, в которую ведет связь
+            travel_time: Время перехода (по умолчанию DEFAULT_TRAVEL_TIME)
+            stamina: Затраты выносливости на переход (по умолчанию DEFAULT_TRAVEL_STAMINA)
+        """
+        location_id = IdTable.intern(location_id)
         if location_id not in self.connected_locations:
             self.connected_locations.append(location_id)
             self.logger.debug("Добавлена связь локации {} с {}", self.id, location_id)
+        if travel_time is not None or stamina is not None:
+            self.travel_costs[location_id] = (
+                DEFAULT_TRAVEL_TIME if travel_time is None else travel_time,
+                DEFAULT_TRAVEL_STAMINA if stamina is None else stamina,
+            )
+    
+    def get_travel_cost(self, location_id):
+        """Возвращает стоимость перехода в локацию (time, stamina)"""
+        return self.travel_costs.get(location_id, (DEFAULT_TRAVEL_TIME, DEFAULT_TRAVEL_STAMINA))
     
     def add_resource(self, resource_id, max_count, respawn_time):
         """Добавляет ресурс в локацию"""
+        resource_id = IdTable.intern(resource_id)
         self.available_resources[resource_id] = {
             "max_count": max_count,
             "respawn_time": respawn_time,
         }
         # Инициализируем случайным количеством ресурсов от 1 до max_count
         self.resources[resource_id] = random.randint(1, max_count)
+        self._start_respawn(RESOURCES, resource_id)
         self.logger.debug("Добавлен ресурс {} в локацию {} ({})", 
                          resource_id, self.id, self.resources[resource_id])
     
     def add_monster(self, monster_id, max_count, respawn_time):
         """Добавляет монстра в локацию"""
+        monster_id = IdTable.intern(monster_id)
         self.available_monsters[monster_id] = {
             "max_count": max_count,
             "respawn_time": respawn_time,
         }
         # Инициализируем случайным количеством монстров от 1 до max_count
         self.monsters[monster_id] = random.randint(1, max_count)
+        self._start_respawn(MONSTERS, monster_id)
         self.logger.debug("Добавлен монстр {} в локацию {} ({})", 
                          monster_id, self.id, self.monsters[monster_id])
     
@@ -50,7 +295,7 @@ class Location:
             npc_id: ID NPC
         """
         if npc_id not in self.npcs:
-            self.npcs.append(npc_id)
+            self.npcs.append(IdTable.intern(npc_id))
             self.logger.debug("Добавлен NPC {} в локацию {}", npc_id, self.id)
     
     def remove_npc(self, npc_id):
@@ -68,12 +313,20 @@ class Location:
         available = self.resources[resource_id]
         collected = min(available, count)
         self.resources[resource_id] -= collected
+        self._start_respawn(RESOURCES, resource_id)
         
         # Логируем действие
         self.logger.info("Собрано {} единиц ресурса {} в локации {}", collected, resource_id, self.id)
         
         return collected
     
+    def restore_resource(self, resource_id, count):
+        """Возвращает собранный ресурс в локацию (не больше максимального количества)"""
+        if resource_id not in self.available_resources:
+            return
+        max_count = self.available_resources[resource_id]["max_count"]
+        self.resources[resource_id] = min(self.resources.get(resource_id, 0) + count, max_count)
+    
     def encounter_monster(self, monster_id, count=1):
         """Встреча с монстром в локации, возвращает количество встреченных монстров
         
@@ -91,56 +344,59 @@ class Location:
         available = self.monsters[monster_id]
         encountered = min(available, count)
         self.monsters[monster_id] -= encountered
+        self._start_respawn(MONSTERS, monster_id)
         
         # Логируем действие
         self.logger.info("Встречено {} монстров типа {} в локации {}", encountered, monster_id, self.id)
         
         return encountered
     
+    def update_definition(self, other, local_ids=()):
+        """Обновляет описание локации по заново загруженной локации, сохраняя текущее состояние
+
+        Args:
+            other: Локация, созданная из измененного файла
+            local_ids: ID локаций того же файла - связи с ними полностью берутся из other,
+                связи с остальными локациями сохраняются
+        """
+        self.name = other.name
+        self.description = other.description
+        self.first_spawn_at = other.first_spawn_at
+        self.npcs = list(other.npcs)
+        self.region = other.region
+
+        self.connected_locations = list(other.connected_locations) + [
+            location_id for location_id in self.connected_locations
+            if location_id not in other.connected_locations and location_id not in local_ids
+        ]
+        travel_costs = {
+            location_id: cost for location_id, cost in self.travel_costs.items()
+            if location_id not in other.connected_locations and location_id not in local_ids
+        }
+        travel_costs.update(other.travel_costs)
+        self.travel_costs = travel_costs
+
+        # Текущее количество сохраняется и ограничивается новым максимумом,
+        # новые ресурсы и монстры получают начальное количество из other
+        self.available_resources = other.available_resources
+        self.resources = {
+            resource_id: min(self.resources.get(resource_id, other.resources[resource_id]), info["max_count"])
+            for resource_id, info in other.available_resources.items()
+        }
+        self.available_monsters = other.available_monsters
+        self.monsters = {
+            monster_id: min(self.monsters.get(monster_id, other.monsters[monster_id]), info["max_count"])
+            for monster_id, info in other.available_monsters.items()
+        }
+        
+        # Новые и уменьшенные записи восстанавливаются по новым параметрам
+        self.start_respawns()
+        self.logger.debug("Обновлено описание локации {}", self.id)
+
     def get_npcs(self):
         """Возвращает список NPC в локации"""
         return self.npcs
     
-    def update(self, time_passed):
-        """Обновляет состояние локации (для респауна ресурсов и монстров)"""
-        # Обновляем ресурсы
-        for resource_id, resource_info in self.available_resources.items():
-            max_count = resource_info["max_count"]
-            current_count = self.resources.get(resource_id, 0)
-            
-            # Добавляем ресурсы, если их меньше максимума
-            if current_count < max_count:
-                # Простая формула: каждую секунду восстанавливается часть ресурсов
-                restore_speed = max_count / resource_info["respawn_time"]
-                new_resources = time_passed * restore_speed
-                
-                # Округляем до целого числа и добавляем
-                to_add = int(new_resources)
-                if to_add > 0:
-                    new_count = min(current_count + to_add, max_count)
-                    self.resources[resource_id] = new_count
-                    self.logger.debug("Восстановлено {} единиц ресурса {} в локации {}", 
-                                    new_count - current_count, resource_id, self.id)
-        
-        # Обновляем монстров
-        for monster_id, monster_info in self.available_monsters.items():
-            max_count = monster_info["max_count"]
-            current_count = self.monsters.get(monster_id, 0)
-            
-            # Добавляем монстров, если их меньше максимума
-            if current_count < max_count:
-                # Простая формула: каждую секунду восстанавливается часть монстров
-                restore_speed = max_count / monster_info["respawn_time"]
-                new_monsters = time_passed * restore_speed
-                
-                # Округляем до целого числа и добавляем
-                to_add = int(new_monsters)
-                if to_add > 0:
-                    new_count = min(current_count + to_add, max_count)
-                    self.monsters[monster_id] = new_count
-                    self.logger.debug("Восстановлено {} монстров типа {} в локации {}", 
-                                    new_count - current_count, monster_id, self.id)
-    
     def get_info(self):
         """Возвращает информацию о локации"""
         return {
@@ -4,16 +4,19 @@ from src.models.inventory.types.Material import Material
 from src.models.inventory.types.Armor import Armor
 from src.models.skills.SkillSystem import SkillSystem
 from src.utils.Logger import Logger
+from src.utils.StartupProfiler import profiled
 from colorama import Fore, Style
 
 class Player:
-    def __init__(self):
+    @profiled("Player.__init__")
+    def __init__(self, load_skills=True):
         self.inventory = Inventory()
         self.current_location = None  # Текущая локация игрока
         self.skill_system = SkillSystem()
         self.logger = Logger()
-        # Путь к навыкам должен быть обновлен
-        self.skill_system.load_skills("resources/skills")
+        # Навыки можно загрузить позже, например в планировщике загрузки игры
+        if load_skills:
+            self.skill_system.load_skills("resources/skills")
         
         # Добавляем основные атрибуты персонажа
         self.name = "Герой"  # Имя персонажа по умолчанию
@@ -178,7 +181,7 @@ class Player:
             if not self.add_item_by_id(game, resource_id, collected):
                 print(f"ОШИБКА: Не удалось добавить ресурс {resource_id} в инвентарь!")
                 # Возвращаем ресурс обратно в локацию
-                current_location.resources[resource_id] += collected
+                current_location.restore_resource(resource_id, collected)
                 return False
             
             # Здесь item_data точно не None, так как мы проверили это выше
@@ -462,7 +465,7 @@ class Player:
             
             # Тут можно добавить другие характеристики по мере добавления других типов предметов
         
-        self.logger.debug(f"Обновлены бонусы от экипировки: {self.equipment_bonuses}")
+        self.logger.debug("Обновлены бонусы от экипировки: {}", self.equipment_bonuses)
     
     def get_equipped_items(self):
         """Возвращает словарь с экипированными предметами"""
@@ -488,13 +491,13 @@ class Player:
         is_dodged = random.randint(1, 100) <= total_dodge
         
         if is_dodged:
-            self.logger.debug(f"Игрок {self.name} уклонился от атаки")
+            self.logger.debug("Игрок {} уклонился от атаки", self.name)
             return False, True
         
         # Учитываем защиту от брони
         actual_damage = max(1, damage - self.equipment_bonuses.get("defense", 0))
         self.health = max(0, self.health - actual_damage)
-        self.logger.debug(f"Игрок {self.name} получил {actual_damage} урона (исходный урон {damage}), осталось {self.health} HP")
+        self.logger.debug("Игрок {} получил {} урона (исходный урон {}), осталось {} HP", self.name, actual_damage, damage, self.health)
         return self.health <= 0, False
     
     def is_alive(self):
@@ -569,7 +572,7 @@ class Player:
         is_dodged = random.randint(1, 100) <= dodge_chance
         
         if is_dodged:
-            self.logger.debug(f"Монстр {target.name} уклонился от атаки игрока {self.name}")
+            self.logger.debug("Монстр {} уклонился от атаки игрока {}", target.name, self.name)
             return 0, False, True
         
         # Расчет урона
@@ -577,9 +580,9 @@ class Player:
         target.take_damage(damage)
         
         if is_critical:
-            self.logger.debug(f"Игрок {self.name} нанес КРИТИЧЕСКИЙ удар {target.name} на {damage} урона")
+            self.logger.debug("Игрок {} нанес КРИТИЧЕСКИЙ удар {} на {} урона", self.name, target.name, damage)
         else:
-            self.logger.debug(f"Игрок {self.name} атаковал {target.name} на {damage} урона")
+            self.logger.debug("Игрок {} атаковал {} на {} урона", self.name, target.name, damage)
             
         return damage, is_critical, False
     
@@ -590,7 +593,7 @@ class Player:
             amount: Количество восстанавливаемого здоровья
         """
         self.health = min(self.max_health, self.health + amount)
-        self.logger.debug(f"Игрок {self.name} восстановил {amount} HP, теперь {self.health} HP")
+        self.logger.debug("Игрок {} восстановил {} HP, теперь {} HP", self.name, amount, self.health)
         
     def show_skills_info(self):
         """Отображает информацию о всех навыках игрока"""
@@ -0,0 +1,236 @@
+from collections.abc import MutableMapping
+from src.models.Location import RESOURCES, MONSTERS, respawn_interval
+from src.utils.Clock import Clock
+from src.utils.Logger import Logger
+
+# Время восстановления единицы для записей, которые не восстанавливаются
+NEVER = float("inf")
+
+try:
+    import numpy as np
+except ImportError:  # NumPy - необязательная зависимость
+    np = None
+
+
+class WorldState:
+    """
+    Хранилище количества ресурсов и монстров всех локаций в плоских массивах
+
+    Каждой паре (локация, запись) соответствует строка: максимальное количество,
+    текущее количество, время восстановления одной единицы (NEVER - запись не
+    восстанавливается) и момент, с которого идет восстановление (NaN - запись
+    полная или не восстанавливается). Строки одной локации идут подряд,
+    поэтому локация досчитывает восстановление только своего среза, а advance()
+    обновляет весь мир одной векторной операцией сложения с ограничением.
+    Если NumPy не установлен, используются списки Python с тем же поведением,
+    но восстановление обходит их построчно и не быстрее обычного режима.
+
+    Хранилище не попадает в сохранения: локации при сериализации записывают
+    количества обратно в свои словари.
+    """
+
+    def __init__(self, use_numpy=True):
+        """
+        use_numpy - использовать массивы NumPy, если он установлен
+        """
+        self.logger = Logger()
+        self.vectorized = use_numpy and np is not None
+        self._clear()
+
+    def _clear(self):
+        self.locations = {}   # {location_id: Location}
+        self._rows = {}       # {location_id: {kind: {entry_id: row}}}
+        self._slices = {}     # {location_id: (start, end)}
+        self.max_count = []
+        self.current = []
+        self.interval = []    # Время восстановления одной единицы, 0 - мгновенно, NEVER - никогда
+        self.since = []       # Момент начала восстановления, NaN - запись полная
+
+    def __len__(self):
+        return len(self.max_count)
+
+    def build(self, locations):
+        """Переносит количества ресурсов и монстров локаций в хранилище
+
+        Args:
+            locations: Локации {location_id: Location}
+
+        Returns:
+            WorldState: self
+        """
+        for location in self.locations.values():
+            location.detach_world_state()
+        self._clear()
+
+        max_count, current, interval, since = [], [], [], []
+        for location_id, location in locations.items():
+            # Досчитываем восстановление по словарям локации до переноса
+            location.detach_world_state()
+            start = len(max_count)
+            rows = {RESOURCES: {}, MONSTERS: {}}
+            for kind, available in ((RESOURCES, location.available_resources),
+                                    (MONSTERS, location.available_monsters)):
+                counts = getattr(location, kind)
+                for entry_id, info in available.items():
+                    rows[kind][entry_id] = len(max_count)
+                    max_count.append(info["max_count"])
+                    current.append(counts.get(entry_id, 0))
+                    row_interval = respawn_interval(info["max_count"], info["respawn_time"])
+                    interval.append(NEVER if row_interval is None else float(row_interval))
+                    since.append(float("nan") if row_interval is None
+                                 else location._respawn_since.get((kind, entry_id), float("nan")))
+            self.locations[location_id] = location
+            self._rows[location_id] = rows
+            self._slices[location_id] = (start, len(max_count))
+
+        if self.vectorized:
+            self.max_count = np.array(max_count, dtype=np.int64)
+            self.current = np.array(current, dtype=np.int64)
+            self.interval = np.array(interval, dtype=np.float64)
+            self.since = np.array(since, dtype=np.float64)
+        else:
+            self.max_count, self.current, self.interval, self.since = max_count, current, interval, since
+
+        for location in self.locations.values():
+            location.attach_world_state(self)
+        self.logger.info("WorldState: {} локаций, {} записей ({})", len(self.locations), len(self),
+                         "NumPy" if self.vectorized else "Python")
+        return self
+
+    def _catch_up(self, start, end, now):
+        """Досчитывает восстановление строк [start, end) к моменту now"""
+        if start >= end:
+            return
+        if self.vectorized:
+            current = self.current[start:end]
+            max_count = self.max_count[start:end]
+            interval = self.interval[start:end]
+            since = self.since[start:end]
+            # Записи NEVER не восстанавливаются
+            pending = ~np.isnan(since) & np.isfinite(interval)
+            if not pending.any():
+                return
+            missing = max_count - current
+            with np.errstate(divide="ignore", invalid="ignore"):
+                units = np.where(interval > 0, np.floor((now - since) / interval), missing)
+            units = np.where(pending, np.clip(np.nan_to_num(units), 0, None), 0).astype(np.int64)
+            np.minimum(current + units, max_count, out=current)
+            # Момент сдвигается только на восстановленные единицы, остаток не теряется
+            since[pending] += units[pending] * interval[pending]
+            since[current >= max_count] = np.nan
+            return
+
+        current, max_count, interval, since = self.current, self.max_count, self.interval, self.since
+        for row in range(start, end):
+            row_since = since[row]
+            if row_since != row_since or interval[row] == NEVER:  # NaN - восстановление не идет
+                continue
+            missing = max_count[row] - current[row]
+            if missing <= 0:
+                since[row] = float("nan")
+                continue
+            units = missing if interval[row] <= 0 else int((now - row_since) / interval[row])
+            if units <= 0:
+                continue
+            units = min(units, missing)
+            current[row] += units
+            since[row] = float("nan") if units >= missing else row_since + units * interval[row]
+
+    def advance(self, now=None):
+        """Досчитывает восстановление всех локаций мира к моменту now"""
+        self._catch_up(0, len(self), Clock().now() if now is None else now)
+
+    def catch_up_location(self, location_id, now=None):
+        """Досчитывает восстановление записей одной локации"""
+        start, end = self._slices[location_id]
+        self._catch_up(start, end, Clock().now() if now is None else now)
+
+    def get(self, row):
+        return int(self.current[row])
+
+    def set(self, row, value):
+        """Устанавливает текущее количество строки и начинает восстановление, если запись неполная"""
+        value = min(int(value), int(self.max_count[row]))
+        self.current[row] = value
+        if value >= self.max_count[row]:
+            self.since[row] = float("nan")
+        elif self.since[row] != self.since[row] and self.interval[row] != NEVER:
+            self.since[row] = Clock().now()
+
+    def start_respawn(self, location_id, kind, entry_id, since=None):
+        """Начинает восстановление записи, если она неполная и восстановление еще не идет"""
+        row = self._rows[location_id][kind].get(entry_id)
+        if row is None:
+            return
+        if self.interval[row] == NEVER:
+            return
+        if self.current[row] < self.max_count[row] and self.since[row] != self.since[row]:
+            self.since[row] = Clock().now() if since is None else since
+
+    def next_respawn_time(self, location_id, kind, entry_id):
+        """Возвращает момент восстановления следующей единицы записи
+        
+        Returns:
+            float: Момент восстановления или None, если запись полная или не восстанавливается
+        """
+        row = self._rows[location_id][kind].get(entry_id)
+        if row is None or self.interval[row] == NEVER:
+            return None
+        self.catch_up_location(location_id)
+        since = float(self.since[row])
+        if since != since:
+            return None
+        return since + float(self.interval[row])
+
+    def view(self, location_id, kind):
+        """Возвращает словарь-представление {entry_id: count} записей локации"""
+        self.catch_up_location(location_id)
+        return WorldStateView(self, self._rows[location_id][kind])
+
+    def export(self, location_id):
+        """Возвращает количества и моменты восстановления локации в виде словарей
+
+        Returns:
+            tuple: (resources, monsters, respawn_since)
+        """
+        self.catch_up_location(location_id)
+        counts = {RESOURCES: {}, MONSTERS: {}}
+        respawn_since = {}
+        for kind, rows in self._rows[location_id].items():
+            for entry_id, row in rows.items():
+                counts[kind][entry_id] = int(self.current[row])
+                since = float(self.since[row])
+                if since == since:
+                    respawn_since[(kind, entry_id)] = since
+        return counts[RESOURCES], counts[MONSTERS], respawn_since
+
+
+class WorldStateView(MutableMapping):
+    """Словарь {entry_id: count} ресурсов или монстров локации поверх WorldState"""
+
+    def __init__(self, store, rows):
+        self._store = store
+        self._rows = rows  # {entry_id: row}
+
+    def __getitem__(self, entry_id):
+        return self._store.get(self._rows[entry_id])
+
+    def __setitem__(self, entry_id, value):
+        if entry_id not in self._rows:
+            raise KeyError(f"Запись {entry_id} отсутствует в WorldState")
+        self._store.set(self._rows[entry_id], value)
+
+    def __delitem__(self, entry_id):
+        raise TypeError("Записи WorldState нельзя удалять")
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._rows
+
+    def __repr__(self):
+        return repr(dict(self.items()))
@@ -1,4 +1,9 @@
-class InventoryItem:
+from src.utils.SlotsState import SlotsState
+
+class InventoryItem(SlotsState):
+    # rarity задается через set_rarity() или в наследниках
+    __slots__ = ("name", "description", "count", "id", "rarity")
+    
     def __init__(self, name, count=1, description="", item_id=None):
         self.name = name
         self.description = description
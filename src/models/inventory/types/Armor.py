@@ -1,6 +1,8 @@
 from src.models.inventory.InventoryItem import InventoryItem
 
 class Armor(InventoryItem):
+    __slots__ = ("value", "type", "slot", "characteristics")
+    
     def __init__(self, name, count=1, description="", value=0, rarity="COMMON", item_id=None, slot=None, characteristics=None):
         """
         Инициализация брони
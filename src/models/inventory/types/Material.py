@@ -1,6 +1,8 @@
 from src.models.inventory.InventoryItem import InventoryItem
 
 class Material(InventoryItem):
+    __slots__ = ("value", "type")
+    
     def __init__(self, name, count=1, description="", value=0, rarity="COMMON", item_id=None):
         """
         Инициализация материала
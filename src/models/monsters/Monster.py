@@ -1,8 +1,13 @@
 import random
-from src.utils.Logger import Logger
+from src.utils.SlotsState import SlotsState, SharedLogger
 
-class Monster:
+class Monster(SlotsState):
     """Базовый класс для всех монстров в игре"""
+    __slots__ = (
+        "id", "name", "description", "level", "max_health", "health", "damage",
+        "dodge_chance", "crit_chance", "crit_damage",
+    )
+    logger = SharedLogger()
     
     def __init__(self, id, name, description="", level=1, health=10, damage=2):
         self.id = id
@@ -12,7 +17,6 @@ class Monster:
         self.max_health = health
         self.health = health
         self.damage = damage
-        self.logger = Logger()
         
         # Дополнительные боевые характеристики
         self.dodge_chance = 5  # Шанс уклонения (в процентах)
@@ -57,11 +61,11 @@ class Monster:
         is_dodged = random.randint(1, 100) <= self.dodge_chance
         
         if is_dodged:
-            self.logger.debug(f"Монстр {self.name} уклонился от атаки")
+            self.logger.debug("Монстр {} уклонился от атаки", self.name)
             return False, True
             
         self.health = max(0, self.health - damage)
-        self.logger.debug(f"Монстр {self.name} получил {damage} урона, осталось {self.health} HP")
+        self.logger.debug("Монстр {} получил {} урона, осталось {} HP", self.name, damage, self.health)
         return not self.is_alive(), False
     
     def attack(self, target):
@@ -83,7 +87,7 @@ class Monster:
         is_dodged = random.randint(1, 100) <= dodge_chance
         
         if is_dodged:
-            self.logger.debug(f"Игрок {target.name} уклонился от атаки монстра {self.name}")
+            self.logger.debug("Игрок {} уклонился от атаки монстра {}", target.name, self.name)
             return 0, False, True
         
         # Расчет урона с учетом крита
@@ -93,9 +97,9 @@ class Monster:
         died, _ = target.take_damage(damage)
         
         if is_critical:
-            self.logger.debug(f"Монстр {self.name} нанес КРИТИЧЕСКИЙ удар {target.name} на {damage} урона")
+            self.logger.debug("Монстр {} нанес КРИТИЧЕСКИЙ удар {} на {} урона", self.name, target.name, damage)
         else:
-            self.logger.debug(f"Монстр {self.name} атаковал {target.name} на {damage} урона")
+            self.logger.debug("Монстр {} атаковал {} на {} урона", self.name, target.name, damage)
             
         return damage, is_critical, False
     
@@ -127,4 +131,4 @@ class Monster:
             amount: Количество восстанавливаемого здоровья
         """
         self.health = min(self.max_health, self.health + amount)
-        self.logger.debug(f"Монстр {self.name} восстановил {amount} HP, теперь {self.health} HP") 
\ No newline at end of file
+        self.logger.debug("Монстр {} восстановил {} HP, теперь {} HP", self.name, amount, self.health) 
\ No newline at end of file
@@ -1,17 +1,40 @@
 import os
-import json
-import random
+import heapq
 from src.models.monsters.Monster import Monster
+from src.models.Location import MONSTERS
+from src.utils.Clock import Clock
 from src.utils.Logger import Logger
+from src.loaders.ContentBundle import ContentBundle
 
 class MonsterManager:
-    """Класс для управления монстрами в игре"""
+    """Класс для управления монстрами в игре
+    
+    Количество монстров хранится только в локациях (Location.monsters или WorldState).
+    MonsterManager работает с ним через bind_locations() и поддерживает индекс
+    живых монстров {monster_id: {location_id}}: записи, в которых монстры закончились,
+    попадают в очередь по моменту восстановления и возвращаются в индекс, когда
+    этот момент наступает. Индекс строится при каждой загрузке и не сохраняется.
+    """
+    # Индекс населения (см. bind_locations), не попадает в сохранения
+    _locations = None
+    _alive = None
+    _revive = None
     
     def __init__(self):
         self.monsters = {}  # Словарь шаблонов монстров {monster_id: monster_template}
-        self.active_monsters = {}  # Словарь активных монстров по локациям {location_id: {monster_id: count}}
         self.logger = Logger()
     
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ("_locations", "_alive", "_revive"):
+            state.pop(key, None)
+        return state
+    
+    def __setstate__(self, state):
+        # В сохранениях старых версий есть неиспользуемый словарь active_monsters
+        state.pop("active_monsters", None)
+        self.__dict__.update(state)
+    
     def load_monsters(self, monsters_directory="resources/monsters"):
         """Загружает всех монстров из указанной директории и её подпапок"""
         if not os.path.exists(monsters_directory):
@@ -22,30 +45,25 @@ class MonsterManager:
         total_files_processed = 0
         total_monsters_loaded = 0
         
-        # Рекурсивно проходим по всем файлам в директории и её подпапках
-        for root, dirs, files in os.walk(monsters_directory):
-            for file in files:
-                # Проверяем, что это JSON файл
-                if not file.endswith('.json'):
-                    continue
+        # Рекурсивно проходим по всем JSON файлам в директории и её подпапках
+        for file_path in ContentBundle().walk_json(monsters_directory):
+            self.logger.info(f"Обрабатываем файл монстров: {file_path}")
+            
+            try:
+                # Загружаем монстров из файла
+                monsters_in_file = self.load_monster_from_file(file_path)
                 
-                file_path = os.path.join(root, file)
-                self.logger.info(f"Обрабатываем файл монстров: {file_path}")
+                # Обновляем счетчики
+                total_files_processed += 1
+                total_monsters_loaded += monsters_in_file
                 
-                try:
-                    # Загружаем монстров из файла
-                    monsters_in_file = self.load_monster_from_file(file_path)
-                    
-                    # Обновляем счетчики
-                    total_files_processed += 1
-                    total_monsters_loaded += monsters_in_file
-                    
-                except Exception as e:
-                    self.logger.error(f"Ошибка при загрузке монстров из файла {file_path}: {str(e)}")
+            except Exception as e:
+                self.logger.error(f"Ошибка при загрузке монстров из файла {file_path}: {str(e)}")
         
         # Суммарная статистика
         self.logger.info(f"Всего обработано файлов монстров: {total_files_processed}")
         self.logger.info(f"Всего загружено монстров: {total_monsters_loaded}")
+        return self.monsters
         
     def load_monster_from_file(self, file_path):
         """Загружает монстра из JSON-файла
@@ -55,27 +73,102 @@ class MonsterManager:
         """
         monsters_loaded = 0
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                monster_data = json.load(file)
+            # Монстры читаются по одному, большой файл не разбирается в память целиком
+            for monster_id, monster_info in ContentBundle().iter_entries(file_path):
+                monster = self._create_monster(monster_id, monster_info)
+                self.monsters[monster_id] = monster
+                self.logger.info(f"Загружен монстр: {monster.name} (уровень: {monster.level})")
+                monsters_loaded += 1
                 
-                for monster_id, monster_info in monster_data.items():
-                    name = monster_info.get("name", monster_id)
-                    description = monster_info.get("description", "")
-                    level = monster_info.get("level", 1)
-                    health = monster_info.get("health", 10)
-                    damage = monster_info.get("damage", 2)
-                    
-                    monster = Monster(monster_id, name, description, level, health, damage)
-                    self.monsters[monster_id] = monster
-                    self.logger.info(f"Загружен монстр: {name} (уровень: {level})")
-                    monsters_loaded += 1
-                    
             return monsters_loaded
                     
         except Exception as e:
             self.logger.error(f"Ошибка при загрузке монстра из {file_path}: {str(e)}")
             return 0
     
+    def _create_monster(self, monster_id, monster_info):
+        """Создает шаблон монстра из данных JSON"""
+        name = monster_info.get("name", monster_id)
+        description = monster_info.get("description", "")
+        level = monster_info.get("level", 1)
+        health = monster_info.get("health", 10)
+        damage = monster_info.get("damage", 2)
+        
+        return Monster(monster_id, name, description, level, health, damage)
+    
+    def reload_file(self, file_path):
+        """Перечитывает один файл монстров без полной перезагрузки
+        
+        Шаблоны монстров заменяются, количество монстров на локациях не меняется.
+        
+        Returns:
+            int: Количество перезагруженных монстров
+        """
+        reloaded = {monster_id: self._create_monster(monster_id, monster_info)
+                    for monster_id, monster_info in ContentBundle().iter_entries(file_path)}
+        self.monsters.update(reloaded)
+        
+        self.logger.info(f"MonsterManager: перезагружено {len(reloaded)} монстров из файла {file_path}")
+        return len(reloaded)
+    
+    def bind_locations(self, locations):
+        """Подключает локации, в которых хранится количество монстров, и строит индекс живых монстров
+        
+        Args:
+            locations: Локации {location_id: Location}
+        """
+        self._locations = locations
+        self._alive = {}
+        self._revive = []  # Куча [(момент восстановления, monster_id, location_id)]
+        for location in locations.values():
+            for monster_id, count in location.monsters.items():
+                self._index_entry(location, monster_id, count)
+        self.logger.debug("MonsterManager: индекс живых монстров построен ({} типов)", len(self._alive))
+    
+    def _index_entry(self, location, monster_id, count):
+        """Обновляет индекс для монстра на локации по текущему количеству"""
+        alive = self._alive.setdefault(monster_id, set())
+        if count > 0:
+            alive.add(location.id)
+            return
+        alive.discard(location.id)
+        revive_time = location.get_respawn_time(MONSTERS, monster_id)
+        if revive_time is not None:
+            heapq.heappush(self._revive, (revive_time, monster_id, location.id))
+    
+    def refresh_alive(self, now=None):
+        """Возвращает в индекс живых монстров записи, момент восстановления которых наступил
+        
+        Args:
+            now: Момент времени (по умолчанию - текущее время)
+        """
+        if self._revive is None:
+            return
+        if now is None:
+            now = Clock().now()
+        revive = self._revive
+        delayed = []
+        while revive and revive[0][0] <= now:
+            _, monster_id, location_id = heapq.heappop(revive)
+            if location_id not in self._locations:
+                continue
+            location = self._locations[location_id]
+            count = location.monsters.get(monster_id, 0)
+            if count > 0:
+                self._alive.setdefault(monster_id, set()).add(location_id)
+            else:
+                # Момент мог сдвинуться (например, после перезагрузки локации)
+                revive_time = location.get_respawn_time(MONSTERS, monster_id)
+                if revive_time is not None:
+                    delayed.append((max(revive_time, now), monster_id, location_id))
+        for item in delayed:
+            heapq.heappush(revive, item)
+    
+    def _get_location(self, location_id):
+        if self._locations is None or location_id not in self._locations:
+            return None
+        return self._locations[location_id]
+    
     def init_monsters_for_location(self, location_id, monster_data):
         """Инициализирует монстров для указанной локации
         
@@ -83,18 +176,17 @@ class MonsterManager:
             location_id: ID локации
             monster_data: Словарь {monster_id: {max_count: X, respawn_time: Y}}
         """
-        if location_id not in self.active_monsters:
-            self.active_monsters[location_id] = {}
+        location = self._get_location(location_id)
+        if location is None:
+            self.logger.warning("Локация {} не найдена при инициализации монстров", location_id)
+            return
             
         for monster_id, monster_info in monster_data.items():
-            max_count = monster_info.get("max_count", 5)
-            initial_count = random.randint(1, max_count)
-            
-            if monster_id in self.monsters:
-                self.active_monsters[location_id][monster_id] = initial_count
-                self.logger.debug(f"Инициализировано {initial_count} монстров типа {monster_id} в локации {location_id}")
-            else:
+            if monster_id not in self.monsters:
                 self.logger.warning(f"Монстр {monster_id} не найден при инициализации локации {location_id}")
+                continue
+            location.add_monster(monster_id, monster_info.get("max_count", 5), monster_info.get("respawn_time", 60))
+            self._index_entry(location, monster_id, location.monsters[monster_id])
     
     def get_monster(self, monster_id):
         """Возвращает шаблон монстра по ID"""
@@ -102,7 +194,26 @@ class MonsterManager:
     
     def get_monsters_at_location(self, location_id):
         """Возвращает словарь монстров в указанной локации {monster_id: count}"""
-        return self.active_monsters.get(location_id, {})
+        location = self._get_location(location_id)
+        return location.monsters if location is not None else {}
+    
+    def get_alive_locations(self, monster_id, now=None):
+        """Возвращает ID локаций, где сейчас есть живые монстры указанного типа
+        
+        Возвращается множество из индекса, изменять его нельзя.
+        
+        Args:
+            monster_id: ID монстра
+            now: Момент времени (по умолчанию - текущее время)
+        """
+        if self._alive is None:
+            return set()
+        self.refresh_alive(now)
+        return self._alive.get(monster_id, set())
+    
+    def is_alive_at(self, monster_id, location_id, now=None):
+        """Проверяет, есть ли на локации живые монстры указанного типа"""
+        return location_id in self.get_alive_locations(monster_id, now)
     
     def reduce_monster_count(self, location_id, monster_id, count=1):
         """Уменьшает количество монстров указанного типа в локации
@@ -110,19 +221,24 @@ class MonsterManager:
         Returns:
             bool: True, если операция выполнена успешно
         """
-        if location_id in self.active_monsters and monster_id in self.active_monsters[location_id]:
-            current_count = self.active_monsters[location_id][monster_id]
-            if current_count >= count:
-                self.active_monsters[location_id][monster_id] -= count
-                self.logger.debug(f"Уменьшено количество монстров {monster_id} в локации {location_id} на {count}")
-                return True
-        return False
+        location = self._get_location(location_id)
+        if location is None or location.monsters.get(monster_id, 0) < count:
+            return False
+        location.encounter_monster(monster_id, count)
+        self._index_entry(location, monster_id, location.monsters[monster_id])
+        self.logger.debug("Уменьшено количество монстров {} в локации {} на {}", monster_id, location_id, count)
+        return True
     
-    def update_monsters(self, time_passed):
-        """Обновляет состояние монстров (восстановление количества со временем)
+    def update_monsters(self, now=None):
+        """Восстанавливает количество монстров на всех локациях к моменту now и обновляет индекс
         
         Args:
-            time_passed: Прошедшее время в секундах
+            now: Момент времени (по умолчанию - текущее время)
         """
-        # В будущем здесь может быть логика восстановления количества монстров
-        pass 
\ No newline at end of file
+        if self._locations is None:
+            return
+        if now is None:
+            now = Clock().now()
+        for location in self._locations.values():
+            location.catch_up(now)
+        self.refresh_alive(now)
@@ -0,0 +1,282 @@
+import heapq
+from src.models.navigation.TravelCost import TravelCost
+
+INFINITY = float("inf")
+
+# Эвристика A* по нижним оценкам стоимости между регионами
+REGION_HEURISTIC = "region"
+
+
+class PathFinder:
+    """
+    Поиск маршрутов минимальной стоимости по графу локаций
+
+    Стоимости переходов задает модель TravelCost. Поиск - A* с очередью на
+    куче: расстояния и предки хранятся в словарях по дескриптору, поэтому
+    запрос затрагивает только просмотренные локации, а путь собирается один раз
+    в конце. Эвристика подключаемая:
+    - REGION_HEURISTIC - нижняя оценка стоимости от региона локации до региона
+      цели. Она считается Дейкстрой по графу регионов, где переход между
+      регионами стоит как самая дешевая связь между ними, а переходы внутри
+      региона бесплатны. Оценка не превышает реальной стоимости, поэтому
+      маршрут остается оптимальным, а регионы, из которых цель недостижима,
+      не просматриваются;
+    - функция (handle, target_handle) -> оценка, не превышающая реальной стоимости;
+    - None - обычная Дейкстра.
+    Стоимости и оценки регионов пересчитываются, когда меняется версия графа.
+    """
+
+    def __init__(self, graph, cost=None, heuristic=REGION_HEURISTIC):
+        """
+        graph - граф локаций WorldGraph
+        cost - модель стоимости TravelCost (по умолчанию TravelCost())
+        heuristic - REGION_HEURISTIC, функция оценки или None
+        """
+        self.graph = graph
+        self.cost = cost or TravelCost()
+        self.heuristic = heuristic
+        self._version = None
+        self._costs = []          # [[cost, ...]] параллельно graph.neighbors
+        self._reverse_costs = []  # [[cost, ...]] параллельно graph.reverse_neighbors
+        self._uniform = True      # Все переходы стоят одинаково
+        self._region_links = {}   # {region: {previous_region: минимальная стоимость перехода}}
+        self._region_bounds = {}  # {target_region: {region: нижняя оценка стоимости}}
+
+    def _prepare(self):
+        """Пересчитывает стоимости переходов, если граф изменился"""
+        if self._version == self.graph.version:
+            return
+        graph = self.graph
+        costs = self.cost.edge_costs(graph)
+        reverse_costs = [None if connected is None else [] for connected in graph.neighbors]
+        regions = graph.regions
+        region_links = {}
+        values = set()
+        # Обход в том же порядке, в котором WorldGraph заполняет reverse_neighbors
+        for node, connected in enumerate(graph.neighbors):
+            # Дескриптор из таблицы ID, локации которого нет в текущем мире
+            if connected is None:
+                continue
+            for neighbor, edge_cost in zip(connected, costs[node]):
+                reverse_costs[neighbor].append(edge_cost)
+                values.add(edge_cost)
+                if regions[node] != regions[neighbor]:
+                    links = region_links.setdefault(regions[neighbor], {})
+                    if edge_cost < links.get(regions[node], INFINITY):
+                        links[regions[node]] = edge_cost
+
+        self._costs = costs
+        self._reverse_costs = reverse_costs
+        self._uniform = len(values) <= 1
+        self._region_links = region_links
+        self._region_bounds = {}
+        self._version = graph.version
+
+    def edge_costs(self):
+        """Возвращает стоимости переходов [[cost, ...]] параллельно graph.neighbors"""
+        self._prepare()
+        return self._costs
+
+    def reverse_edge_costs(self):
+        """Возвращает стоимости переходов [[cost, ...]] параллельно graph.reverse_neighbors"""
+        self._prepare()
+        return self._reverse_costs
+
+    def is_uniform(self):
+        """Возвращает True, если все переходы стоят одинаково (маршрут - кратчайший по числу переходов)"""
+        self._prepare()
+        return self._uniform
+
+    def _bounds_to(self, target_region):
+        """Возвращает нижние оценки стоимости {region: cost} от регионов до региона цели"""
+        bounds = self._region_bounds.get(target_region)
+        if bounds is not None:
+            return bounds
+
+        region_links = self._region_links
+        bounds = {target_region: 0}
+        frontier = [(0, target_region)]
+        while frontier:
+            bound, region = heapq.heappop(frontier)
+            if bound > bounds[region]:
+                continue
+            for previous, link_cost in region_links.get(region, {}).items():
+                previous_bound = bound + link_cost
+                if previous_bound < bounds.get(previous, INFINITY):
+                    bounds[previous] = previous_bound
+                    heapq.heappush(frontier, (previous_bound, previous))
+        self._region_bounds[target_region] = bounds
+        return bounds
+
+    def region_bounds(self, target_region):
+        """Возвращает нижние оценки стоимости {region: cost} от регионов до target_region
+
+        Регионы, из которых target_region недостижим, в словаре отсутствуют.
+        """
+        self._prepare()
+        return self._bounds_to(target_region)
+
+    def _estimate(self, target):
+        """Возвращает функцию оценки стоимости от локации до цели или None для Дейкстры"""
+        if self.heuristic is None:
+            return None
+        if self.heuristic == REGION_HEURISTIC:
+            regions = self.graph.regions
+            bounds = self._bounds_to(regions[target])
+            return lambda node: bounds.get(regions[node], INFINITY)
+        heuristic = self.heuristic
+        return lambda node: heuristic(node, target)
+
+    def find_path_handles(self, start, target):
+        """Ищет маршрут минимальной стоимости
+
+        Args:
+            start: Дескриптор начальной локации
+            target: Дескриптор целевой локации
+
+        Returns:
+            tuple: (дескрипторы локаций пути без начальной, стоимость), ([], None), если пути нет
+        """
+        if start == target:
+            return [], 0
+        self._prepare()
+
+        neighbors = self.graph.neighbors
+        costs = self._costs
+        estimate = self._estimate(target)
+        start_estimate = estimate(start) if estimate else 0
+        if start_estimate == INFINITY:
+            return [], None
+
+        distance = {start: 0}
+        parent = {start: start}
+        frontier = [(start_estimate, 0, start)]
+        while frontier:
+            _, travelled, node = heapq.heappop(frontier)
+            if travelled > distance[node]:
+                continue
+            if node == target:
+                path = [target]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                path.pop()
+                path.reverse()
+                return path, travelled
+            for neighbor, edge_cost in zip(neighbors[node], costs[node]):
+                neighbor_distance = travelled + edge_cost
+                if neighbor_distance >= distance.get(neighbor, INFINITY):
+                    continue
+                remaining = estimate(neighbor) if estimate else 0
+                if remaining == INFINITY:
+                    continue
+                distance[neighbor] = neighbor_distance
+                parent[neighbor] = node
+                heapq.heappush(frontier, (neighbor_distance + remaining, neighbor_distance, neighbor))
+        return [], None
+
+    def find_path(self, start_location, target_location):
+        """Ищет маршрут минимальной стоимости между локациями
+
+        Args:
+            start_location: ID начальной локации
+            target_location: ID целевой локации
+
+        Returns:
+            list: ID локаций пути без начальной, пустой список, если пути нет
+        """
+        start = self.graph.handle_of(start_location)
+        target = self.graph.handle_of(target_location)
+        if start is None or target is None:
+            return []
+        return self.graph.to_ids(self.find_path_handles(start, target)[0])
+
+    def find_nearest_handles(self, start, targets):
+        """Ищет ближайшую по стоимости маршрута локацию из набора
+
+        Дейкстра от начальной локации останавливается на первой извлеченной
+        из очереди цели, поэтому просматриваются только локации ближе нее.
+
+        Args:
+            start: Дескриптор начальной локации
+            targets: Множество дескрипторов целевых локаций
+
+        Returns:
+            tuple: (дескриптор цели, путь без начальной, стоимость), (None, [], None), если цели недостижимы
+        """
+        if not targets:
+            return None, [], None
+        if start in targets:
+            return start, [], 0
+        self._prepare()
+
+        neighbors = self.graph.neighbors
+        costs = self._costs
+        distance = {start: 0}
+        parent = {start: start}
+        frontier = [(0, start)]
+        while frontier:
+            travelled, node = heapq.heappop(frontier)
+            if travelled > distance[node]:
+                continue
+            if node in targets:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                path.pop()
+                path.reverse()
+                return node, path, travelled
+            for neighbor, edge_cost in zip(neighbors[node], costs[node]):
+                neighbor_distance = travelled + edge_cost
+                if neighbor_distance < distance.get(neighbor, INFINITY):
+                    distance[neighbor] = neighbor_distance
+                    parent[neighbor] = node
+                    heapq.heappush(frontier, (neighbor_distance, neighbor))
+        return None, [], None
+
+    def find_nearest(self, start_location, target_locations):
+        """Ищет ближайшую по стоимости маршрута локацию из списка
+
+        Args:
+            start_location: ID начальной локации
+            target_locations: ID целевых локаций
+
+        Returns:
+            tuple: (ID ближайшей локации, ID локаций пути без начальной), (None, []), если цели недостижимы
+        """
+        start = self.graph.handle_of(start_location)
+        if start is None:
+            return None, []
+        targets = {handle for handle in map(self.graph.handle_of, target_locations) if handle is not None}
+        target, path, _ = self.find_nearest_handles(start, targets)
+        if target is None:
+            return None, []
+        return self.graph.ids.id_of(target), self.graph.to_ids(path)
+
+    def next_hops_to(self, target):
+        """Строит таблицу следующих шагов к цели обратной Дейкстрой (по входящим связям)
+
+        Args:
+            target: Дескриптор целевой локации
+
+        Returns:
+            list: Следующий шаг по дескриптору локации, -1 - цель недостижима
+        """
+        self._prepare()
+        reverse_neighbors = self.graph.reverse_neighbors
+        reverse_costs = self._reverse_costs
+        distance = [INFINITY] * len(reverse_neighbors)
+        next_hop = [-1] * len(reverse_neighbors)
+        distance[target] = 0
+        next_hop[target] = target
+        frontier = [(0, target)]
+        while frontier:
+            travelled, node = heapq.heappop(frontier)
+            if travelled > distance[node]:
+                continue
+            for previous, edge_cost in zip(reverse_neighbors[node], reverse_costs[node]):
+                previous_distance = travelled + edge_cost
+                if previous_distance < distance[previous]:
+                    distance[previous] = previous_distance
+                    next_hop[previous] = node
+                    heapq.heappush(frontier, (previous_distance, previous))
+        return next_hop
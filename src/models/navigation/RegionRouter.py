@@ -0,0 +1,260 @@
+import heapq
+from src.models.navigation.PathFinder import INFINITY
+from src.utils.Logger import Logger
+
+# Состояния в графе порталов: в локации, из которой есть переход в другой регион,
+# и в локации, в которую только что вошли из другого региона
+_AT_EXIT = 0
+_ENTERED = 1
+
+
+class RegionRouter:
+    """
+    Иерархический поиск маршрутов по регионам
+
+    Порталы региона - локации со связями в другие регионы (выходы) и из других
+    регионов (входы). Для каждого входа региона хранятся маршруты внутри
+    региона до всех его выходов, вместе со связями между регионами это граф
+    порталов. Запрос между регионами ищет путь только по графу порталов и
+    выполняет два локальных поиска - от начальной локации до выходов ее
+    региона и от входов региона цели до цели. Маршрут совпадает по стоимости
+    с поиском по всему графу. Граф порталов просматривается A* с нижними
+    оценками стоимости между регионами из PathFinder.region_bounds().
+    Таблицы региона строятся при первом запросе, который через него проходит
+    (precompute() строит все), и сбрасываются, когда меняется версия графа.
+    """
+
+    def __init__(self, graph, path_finder):
+        """
+        graph - граф локаций WorldGraph
+        path_finder - PathFinder, задающий стоимости переходов
+        """
+        self.logger = Logger()
+        self.graph = graph
+        self.path_finder = path_finder
+        self._version = None
+        self._members = {}  # {region: [handle, ...]}
+        self._entries = {}  # {region: [handle, ...]} - входы региона
+        self._exits = {}    # {region: [handle, ...]} - выходы региона
+        self._tables = {}   # {region: {entry: {exit: (cost, [handle, ...] без entry)}}}
+
+    def _prepare(self):
+        """Находит порталы регионов, если граф изменился"""
+        if self._version == self.graph.version:
+            return
+        regions = self.graph.regions
+        members = {}
+        entries = {}
+        exits = {}
+        for node, connected in enumerate(self.graph.neighbors):
+            if connected is None:
+                continue
+            region = regions[node]
+            members.setdefault(region, []).append(node)
+            for neighbor in connected:
+                if regions[neighbor] != region:
+                    exits.setdefault(region, {})[node] = True
+                    entries.setdefault(regions[neighbor], {})[neighbor] = True
+
+        self._members = members
+        self._entries = {region: list(handles) for region, handles in entries.items()}
+        self._exits = {region: list(handles) for region, handles in exits.items()}
+        self._tables = {}
+        self._version = self.graph.version
+        self.logger.debug("RegionRouter: {} регионов, {} порталов", len(members),
+                          sum(len(handles) for handles in self._entries.values())
+                          + sum(len(handles) for handles in self._exits.values()))
+
+    def regions_count(self):
+        """Возвращает количество регионов графа"""
+        self._prepare()
+        return len(self._members)
+
+    def _local_search(self, source, reverse=False):
+        """Дейкстра внутри региона локации source
+
+        Args:
+            source: Дескриптор локации
+            reverse: Искать по входящим связям (расстояния до source)
+
+        Returns:
+            tuple: ({handle: стоимость}, {handle: предыдущая локация поиска})
+        """
+        if reverse:
+            adjacency = self.graph.reverse_neighbors
+            costs = self.path_finder.reverse_edge_costs()
+        else:
+            adjacency = self.graph.neighbors
+            costs = self.path_finder.edge_costs()
+        regions = self.graph.regions
+        region = regions[source]
+
+        distance = {source: 0}
+        parent = {source: source}
+        frontier = [(0, source)]
+        while frontier:
+            travelled, node = heapq.heappop(frontier)
+            if travelled > distance[node]:
+                continue
+            for neighbor, edge_cost in zip(adjacency[node], costs[node]):
+                if regions[neighbor] != region:
+                    continue
+                neighbor_distance = travelled + edge_cost
+                if neighbor_distance < distance.get(neighbor, INFINITY):
+                    distance[neighbor] = neighbor_distance
+                    parent[neighbor] = node
+                    heapq.heappush(frontier, (neighbor_distance, neighbor))
+        return distance, parent
+
+    @staticmethod
+    def _unwind(parent, source, node):
+        """Возвращает путь от source до node по предкам поиска (без source)"""
+        path = [node]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        path.pop()
+        path.reverse()
+        return path
+
+    def _region_table(self, region):
+        """Возвращает маршруты от входов региона до его выходов, строя их при первом запросе"""
+        table = self._tables.get(region)
+        if table is not None:
+            return table
+
+        table = {}
+        exits = self._exits.get(region, ())
+        for entry in self._entries.get(region, ()):
+            distance, parent = self._local_search(entry)
+            table[entry] = {
+                exit_handle: (distance[exit_handle], self._unwind(parent, entry, exit_handle))
+                for exit_handle in exits if exit_handle in distance
+            }
+        self._tables[region] = table
+        return table
+
+    def precompute(self):
+        """Строит маршруты внутри всех регионов"""
+        self._prepare()
+        for region in self._members:
+            self._region_table(region)
+
+    def find_path_handles(self, start, target):
+        """Ищет маршрут минимальной стоимости через граф порталов
+
+        Args:
+            start: Дескриптор начальной локации
+            target: Дескриптор целевой локации
+
+        Returns:
+            tuple: (дескрипторы локаций пути без начальной, стоимость), ([], None), если пути нет
+        """
+        if start == target:
+            return [], 0
+        self._prepare()
+
+        regions = self.graph.regions
+        neighbors = self.graph.neighbors
+        costs = self.path_finder.edge_costs()
+        target_region = regions[target]
+        bounds = self.path_finder.region_bounds(target_region)
+
+        # Локальные участки: от начальной локации по ее региону и до цели по региону цели
+        start_distance, start_parent = self._local_search(start)
+        target_distance, target_next = self._local_search(target, reverse=True)
+
+        best = start_distance.get(target, INFINITY) if regions[start] == target_region else INFINITY
+        best_label = None
+
+        distance = {}
+        parent = {}
+        frontier = []
+        start_bound = bounds.get(regions[start], INFINITY)
+        for exit_handle in self._exits.get(regions[start], ()):
+            if exit_handle in start_distance:
+                label = (_AT_EXIT, exit_handle)
+                distance[label] = start_distance[exit_handle]
+                parent[label] = None
+                frontier.append((start_distance[exit_handle] + start_bound, start_distance[exit_handle],
+                                 _AT_EXIT, exit_handle))
+        heapq.heapify(frontier)
+
+        while frontier:
+            estimate, travelled, state, node = heapq.heappop(frontier)
+            if estimate >= best:
+                break
+            label = (state, node)
+            if travelled > distance[label]:
+                continue
+
+            if state == _AT_EXIT:
+                moves = ((neighbor, _ENTERED, edge_cost)
+                         for neighbor, edge_cost in zip(neighbors[node], costs[node])
+                         if regions[neighbor] != regions[node])
+            else:
+                if regions[node] == target_region and node in target_distance:
+                    if travelled + target_distance[node] < best:
+                        best = travelled + target_distance[node]
+                        best_label = label
+                moves = ((exit_handle, _AT_EXIT, route[0])
+                         for exit_handle, route in self._region_table(regions[node])[node].items())
+
+            for next_node, next_state, step_cost in moves:
+                next_label = (next_state, next_node)
+                next_distance = travelled + step_cost
+                if next_distance >= distance.get(next_label, INFINITY):
+                    continue
+                # Из регионов без оценки цель недостижима
+                remaining = bounds.get(regions[next_node], INFINITY)
+                if remaining == INFINITY:
+                    continue
+                distance[next_label] = next_distance
+                parent[next_label] = label
+                heapq.heappush(frontier, (next_distance + remaining, next_distance, next_state, next_node))
+
+        if best == INFINITY:
+            return [], None
+        if best_label is None:
+            return self._unwind(start_parent, start, target), best
+        return self._build_path(start, target, best_label, parent, start_parent, target_next), best
+
+    def _build_path(self, start, target, last_label, parent, start_parent, target_next):
+        """Собирает маршрут из участков графа порталов"""
+        labels = []
+        label = last_label
+        while label is not None:
+            labels.append(label)
+            label = parent[label]
+        labels.reverse()
+
+        # Первый участок - от начальной локации до первого выхода
+        path = self._unwind(start_parent, start, labels[0][1])
+        for previous, label in zip(labels, labels[1:]):
+            if label[0] == _ENTERED:
+                path.append(label[1])
+            else:
+                entry = previous[1]
+                path.extend(self._region_table(self.graph.regions[entry])[entry][label[1]][1])
+
+        # Последний участок - от входа региона цели до цели
+        node = labels[-1][1]
+        while node != target:
+            node = target_next[node]
+            path.append(node)
+        return path
+
+    def find_path(self, start_location, target_location):
+        """Ищет маршрут минимальной стоимости между локациями
+
+        Args:
+            start_location: ID начальной локации
+            target_location: ID целевой локации
+
+        Returns:
+            list: ID локаций пути без начальной, пустой список, если пути нет
+        """
+        start = self.graph.handle_of(start_location)
+        target = self.graph.handle_of(target_location)
+        if start is None or target is None:
+            return []
+        return self.graph.to_ids(self.find_path_handles(start, target)[0])
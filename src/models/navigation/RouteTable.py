@@ -0,0 +1,102 @@
+from collections import deque
+
+
+class RouteTable:
+    """
+    Таблица маршрутов по графу локаций
+
+    Для каждой целевой локации один раз выполняется поиск в обратную сторону
+    (по входящим связям), результат - следующий шаг к цели из любой локации
+    мира. Если переходы стоят по-разному, таблицу строит обратная Дейкстра
+    PathFinder (маршрут минимальной стоимости), иначе - поиск в ширину.
+    Таблицы строятся при первом запросе к цели и сбрасываются, когда
+    меняется версия графа (связи локаций, стоимости переходов, опасность
+    или регионы). Построение маршрута по готовой таблице стоит O(длины пути).
+    """
+
+    def __init__(self, graph, path_finder=None):
+        """
+        graph - граф локаций WorldGraph
+        path_finder - PathFinder со стоимостями переходов, без него маршруты кратчайшие по числу переходов
+        """
+        self.graph = graph
+        self.path_finder = path_finder
+        self._version = graph.version
+        self._next_hop = {}  # {target_handle: [следующий шаг по дескриптору, -1 - цель недостижима]}
+
+    def __len__(self):
+        return len(self._next_hop)
+
+    def _hops_to(self, target):
+        """Возвращает таблицу следующих шагов к цели, строя ее при первом запросе"""
+        if self._version != self.graph.version:
+            self._next_hop = {}
+            self._version = self.graph.version
+
+        next_hop = self._next_hop.get(target)
+        if next_hop is not None:
+            return next_hop
+
+        if self.path_finder is not None and not self.path_finder.is_uniform():
+            next_hop = self._next_hop[target] = self.path_finder.next_hops_to(target)
+            return next_hop
+
+        reverse_neighbors = self.graph.reverse_neighbors
+        next_hop = [-1] * len(reverse_neighbors)
+        next_hop[target] = target
+        queue = deque((target,))
+        while queue:
+            node = queue.popleft()
+            for previous in reverse_neighbors[node]:
+                if next_hop[previous] == -1:
+                    next_hop[previous] = node
+                    queue.append(previous)
+        self._next_hop[target] = next_hop
+        return next_hop
+
+    def has_route_table(self, target):
+        """Проверяет, построена ли таблица следующих шагов к цели для текущей версии графа"""
+        return self._version == self.graph.version and target in self._next_hop
+
+    def precompute(self):
+        """Строит таблицы для всех локаций мира"""
+        for handle, connected in enumerate(self.graph.neighbors):
+            if connected is not None:
+                self._hops_to(handle)
+
+    def next_hop(self, start, target):
+        """Возвращает дескриптор следующей локации на пути к цели или None"""
+        if start == target:
+            return None
+        hop = self._hops_to(target)[start]
+        return None if hop == -1 else hop
+
+    def route_handles(self, start, target):
+        """Возвращает маршрут в дескрипторах без начальной локации (пустой, если пути нет)"""
+        if start == target:
+            return []
+        next_hop = self._hops_to(target)
+        if next_hop[start] == -1:
+            return []
+        path = []
+        node = start
+        while node != target:
+            node = next_hop[node]
+            path.append(node)
+        return path
+
+    def find_path(self, start_location, target_location):
+        """Возвращает маршрут между локациями в ID без начальной локации
+
+        Args:
+            start_location: ID начальной локации
+            target_location: ID целевой локации
+
+        Returns:
+            list: ID локаций пути, пустой список, если пути нет
+        """
+        start = self.graph.handle_of(start_location)
+        target = self.graph.handle_of(target_location)
+        if start is None or target is None:
+            return []
+        return self.graph.to_ids(self.route_handles(start, target))
@@ -0,0 +1,45 @@
+class TravelCost:
+    """
+    Модель стоимости перехода между локациями
+
+    Стоимость перехода по связи - взвешенная сумма времени перехода,
+    затрат выносливости и опасности локации, в которую ведет связь
+    (WorldGraph.danger, считается по available_monsters). Веса должны быть
+    неотрицательными: на этом основаны Дейкстра и эвристики A* в PathFinder.
+    """
+
+    def __init__(self, time=1.0, stamina=0.5, danger=0.02):
+        """
+        time - вес времени перехода
+        stamina - вес затрат выносливости
+        danger - вес опасности локации назначения
+        """
+        if min(time, stamina, danger) < 0:
+            raise ValueError("Веса стоимости перехода должны быть неотрицательными")
+        self.time = time
+        self.stamina = stamina
+        self.danger = danger
+
+    def __repr__(self):
+        return f"TravelCost(time={self.time}, stamina={self.stamina}, danger={self.danger})"
+
+    def edge_costs(self, graph):
+        """Возвращает стоимости переходов графа
+
+        Args:
+            graph: Граф локаций WorldGraph
+
+        Returns:
+            list: [[cost, ...]] по дескриптору, параллельно graph.neighbors (None - локации нет)
+        """
+        danger = graph.danger
+        costs = []
+        for connected, times, stamina in zip(graph.neighbors, graph.travel_times, graph.stamina):
+            if connected is None:
+                costs.append(None)
+                continue
+            costs.append([
+                self.time * time + self.stamina * spent + self.danger * danger[neighbor]
+                for neighbor, time, spent in zip(connected, times, stamina)
+            ])
+        return costs
@@ -0,0 +1,117 @@
+from src.utils.IdTable import IdTable
+from src.utils.Logger import Logger
+
+
+class WorldGraph:
+    """
+    Граф связей между локациями на целочисленных дескрипторах
+
+    Локации нумеруются через IdTable.of("locations"), списки соседей хранятся
+    в списке по дескриптору локации. Сам граф пути не ищет: маршруты строят
+    PathFinder, RouteTable и RegionRouter, работая только с целыми числами,
+    а ID локаций восстанавливаются в конце поиска.
+    Рядом со списками соседей в параллельных списках хранятся стоимости
+    переходов (время и выносливость), опасность локаций по их монстрам и
+    дескрипторы регионов (IdTable.of("regions")).
+    Граф строится при каждой загрузке и не попадает в сохранения; version
+    увеличивается, только если при перестройке изменились связи локаций,
+    их стоимости, опасность или регионы.
+    """
+
+    def __init__(self):
+        self.logger = Logger()
+        self.ids = IdTable.of("locations")
+        self.neighbors = []          # [[handle, ...]] по дескриптору, None - локации нет в мире
+        self.reverse_neighbors = []  # [[handle, ...]] - из каких локаций есть переход в локацию
+        self.travel_times = []       # [[time, ...]] параллельно neighbors
+        self.stamina = []            # [[stamina, ...]] параллельно neighbors
+        self.danger = []             # [danger] по дескриптору - опасность входа в локацию
+        self.regions = []            # [region_handle] по дескриптору
+        self.region_ids = IdTable.of("regions")
+        self.version = 0
+
+    @staticmethod
+    def location_danger(location, monsters=None):
+        """Опасность локации: сумма max_count * уровень монстра по available_monsters
+
+        Args:
+            location: Локация
+            monsters: Шаблоны монстров {monster_id: Monster}, без них уровень считается равным 1
+        """
+        danger = 0
+        for monster_id, info in location.available_monsters.items():
+            monster = monsters.get(monster_id) if monsters else None
+            danger += info["max_count"] * (getattr(monster, "level", 1) if monster is not None else 1)
+        return danger
+
+    def build(self, locations, monsters=None):
+        """Строит граф по связям локаций
+
+        Связи с отсутствующими локациями пропускаются (они выводятся в лог ContentIndex).
+
+        Args:
+            locations: Локации {location_id: Location}
+            monsters: Шаблоны монстров {monster_id: Monster} для оценки опасности локаций
+
+        Returns:
+            WorldGraph: self
+        """
+        handle = self.ids.handle
+        neighbors = [None] * len(self.ids)
+        for location_id in locations.keys():
+            location_handle = handle(location_id)
+            if location_handle >= len(neighbors):
+                neighbors.extend([None] * (location_handle + 1 - len(neighbors)))
+
+        travel_times = [None] * len(neighbors)
+        stamina = [None] * len(neighbors)
+        danger = [0] * len(neighbors)
+        regions = [-1] * len(neighbors)
+        region_handle = self.region_ids.handle
+        edges = 0
+        for location_id, location in locations.items():
+            location_handle = handle(location_id)
+            connected_ids = [connected_id for connected_id in location.connected_locations
+                             if connected_id in locations]
+            costs = [location.get_travel_cost(connected_id) for connected_id in connected_ids]
+            neighbors[location_handle] = [handle(connected_id) for connected_id in connected_ids]
+            travel_times[location_handle] = [cost[0] for cost in costs]
+            stamina[location_handle] = [cost[1] for cost in costs]
+            danger[location_handle] = self.location_danger(location, monsters)
+            regions[location_handle] = region_handle(location.region)
+            edges += len(connected_ids)
+
+        if (neighbors == self.neighbors and travel_times == self.travel_times
+                and stamina == self.stamina and danger == self.danger and regions == self.regions):
+            return self
+
+        reverse_neighbors = [None if connected is None else [] for connected in neighbors]
+        for location_handle, connected in enumerate(neighbors):
+            for neighbor in connected or ():
+                reverse_neighbors[neighbor].append(location_handle)
+
+        self.neighbors = neighbors
+        self.reverse_neighbors = reverse_neighbors
+        self.travel_times = travel_times
+        self.stamina = stamina
+        self.danger = danger
+        self.regions = regions
+        self.version += 1
+        self.logger.debug("WorldGraph: {} локаций, {} связей, версия {}", len(locations), edges, self.version)
+        return self
+
+    def __contains__(self, location_id):
+        handle = self.ids.find(location_id)
+        return handle is not None and handle < len(self.neighbors) and self.neighbors[handle] is not None
+
+    def handle_of(self, location_id):
+        """Возвращает дескриптор локации графа или None"""
+        handle = self.ids.find(location_id)
+        if handle is None or handle >= len(self.neighbors) or self.neighbors[handle] is None:
+            return None
+        return handle
+
+    def to_ids(self, handles):
+        """Переводит список дескрипторов в список ID локаций"""
+        id_of = self.ids.id_of
+        return [id_of(handle) for handle in handles]
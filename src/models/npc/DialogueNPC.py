@@ -2,11 +2,17 @@ from src.models.npc.NPC import NPC
 
 class DialogueNPC(NPC):
     """NPC, который предоставляет только диалоги и информацию о мире"""
+    __slots__ = ("topics",)
     
     def __init__(self, id, name, description, location_id=None):
         super().__init__(id, name, description, "dialogue", location_id)
         self.topics = {}  # Темы для разговора
         
+    def update_definition(self, other):
+        """Обновляет описание и темы для разговора"""
+        super().update_definition(other)
+        self.topics = other.topics
+        
     def add_topic(self, topic_id, topic_name, dialogue_id):
         """Добавляет тему для разговора"""
         self.topics[topic_id] = {
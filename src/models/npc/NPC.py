@@ -1,8 +1,10 @@
 import json
-from src.utils.Logger import Logger
+from src.utils.SlotsState import SlotsState, SharedLogger
 
-class NPC:
+class NPC(SlotsState):
     """Базовый класс для всех NPC в игре"""
+    __slots__ = ("id", "name", "description", "type", "location_id", "dialogue_tree")
+    logger = SharedLogger()
     
     def __init__(self, id, name, description, npc_type, location_id=None):
         self.id = id
@@ -11,7 +13,17 @@ class NPC:
         self.type = npc_type  # "trader", "quest", "dialog"
         self.location_id = location_id
         self.dialogue_tree = {}
-        self.logger = Logger()
+        
+    def update_definition(self, other):
+        """Обновляет описание NPC по заново загруженному NPC того же типа
+        
+        Состояние, накопленное в игре, сохраняется. Наследники дополняют
+        метод своими полями.
+        """
+        self.name = other.name
+        self.description = other.description
+        self.location_id = other.location_id
+        self.dialogue_tree = other.dialogue_tree
         
     def get_greeting(self):
         """Возвращает приветствие NPC, если есть"""
@@ -1,6 +1,6 @@
 import os
-import json
 from src.utils.Logger import Logger
+from src.loaders.ContentBundle import ContentBundle
 from src.models.npc.TraderNPC import TraderNPC
 from src.models.npc.QuestNPC import QuestNPC
 from src.models.npc.DialogueNPC import DialogueNPC
@@ -22,30 +22,25 @@ class NPCManager:
         total_files_processed = 0
         total_npcs_loaded = 0
         
-        # Рекурсивно проходим по всем файлам в директории и её подпапках
-        for root, dirs, files in os.walk(npcs_directory):
-            for file in files:
-                # Проверяем, что это JSON файл
-                if not file.endswith('.json'):
-                    continue
+        # Рекурсивно проходим по всем JSON файлам в директории и её подпапках
+        for file_path in ContentBundle().walk_json(npcs_directory):
+            self.logger.info(f"Обрабатываем файл NPC: {file_path}")
+            
+            try:
+                # Загружаем NPC из файла
+                npcs_in_file = self.load_npc_from_file(file_path)
                 
-                file_path = os.path.join(root, file)
-                self.logger.info(f"Обрабатываем файл NPC: {file_path}")
+                # Обновляем счетчики
+                total_files_processed += 1
+                total_npcs_loaded += npcs_in_file
                 
-                try:
-                    # Загружаем NPC из файла
-                    npcs_in_file = self.load_npc_from_file(file_path)
-                    
-                    # Обновляем счетчики
-                    total_files_processed += 1
-                    total_npcs_loaded += npcs_in_file
-                    
-                except Exception as e:
-                    self.logger.error(f"Ошибка при загрузке NPC из файла {file_path}: {str(e)}")
+            except Exception as e:
+                self.logger.error(f"Ошибка при загрузке NPC из файла {file_path}: {str(e)}")
         
         # Суммарная статистика
         self.logger.info(f"Всего обработано файлов NPC: {total_files_processed}")
         self.logger.info(f"Всего загружено NPC: {total_npcs_loaded}")
+        return self.npcs
         
     def load_npc_from_file(self, file_path):
         """Загружает NPC из JSON-файла
@@ -55,63 +50,89 @@ class NPCManager:
         """
         npcs_loaded = 0
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                npc_data = json.load(file)
+            # NPC читаются по одному, большой файл не разбирается в память целиком
+            for npc_id, npc_info in ContentBundle().iter_entries(file_path):
+                npc = self._create_npc(npc_id, npc_info)
+                
+                # Добавляем NPC в словарь
+                self.npcs[npc_id] = npc
+                self.logger.info(f"Загружен NPC: {npc.name} (тип: {npc.type})")
+                npcs_loaded += 1
                 
-                for npc_id, npc_info in npc_data.items():
-                    npc_type = npc_info.get("type", "dialogue")
-                    name = npc_info.get("name", npc_id)
-                    description = npc_info.get("description", "")
-                    location_id = npc_info.get("location_id")
-                    
-                    # Создаем NPC в зависимости от типа
-                    if npc_type == "trader":
-                        npc = TraderNPC(npc_id, name, description, location_id)
-                        
-                        # Загружаем предметы, которые покупает торговец
-                        for buy_item, price_mod in npc_info.get("buys", {}).items():
-                            npc.add_buy_item(buy_item, price_mod)
-                            
-                        # Загружаем предметы, которые продает торговец
-                        for sell_item, sell_info in npc_info.get("sells", {}).items():
-                            price = sell_info.get("price", 0)
-                            count = sell_info.get("count", 1)
-                            npc.add_sell_item(sell_item, price, count)
-                            
-                        # Загружаем параметр опыта торговли
-                        if "trade_exp" in npc_info:
-                            npc.trade_exp = npc_info["trade_exp"]
-                            
-                    elif npc_type == "quest":
-                        npc = QuestNPC(npc_id, name, description, location_id)
-                        
-                        # Загружаем доступные квесты
-                        for quest_id in npc_info.get("available_quests", []):
-                            npc.add_available_quest(quest_id)
-                            
-                    else:  # dialogue
-                        npc = DialogueNPC(npc_id, name, description, location_id)
-                        
-                        # Загружаем темы для разговора
-                        for topic_id, topic_info in npc_info.get("topics", {}).items():
-                            topic_name = topic_info.get("name", topic_id)
-                            dialogue_id = topic_info.get("dialogue_id", topic_id)
-                            npc.add_topic(topic_id, topic_name, dialogue_id)
-                    
-                    # Загружаем диалоги
-                    npc.dialogue_tree = npc_info.get("dialogues", {})
-                    
-                    # Добавляем NPC в словарь
-                    self.npcs[npc_id] = npc
-                    self.logger.info(f"Загружен NPC: {name} (тип: {npc_type})")
-                    npcs_loaded += 1
-                    
             return npcs_loaded
                     
         except Exception as e:
             self.logger.error(f"Ошибка при загрузке NPC из {file_path}: {str(e)}")
             return 0
         
+    def _create_npc(self, npc_id, npc_info):
+        """Создает объект NPC из данных JSON"""
+        npc_type = npc_info.get("type", "dialogue")
+        name = npc_info.get("name", npc_id)
+        description = npc_info.get("description", "")
+        location_id = npc_info.get("location_id")
+        
+        # Создаем NPC в зависимости от типа
+        if npc_type == "trader":
+            npc = TraderNPC(npc_id, name, description, location_id)
+            
+            # Загружаем предметы, которые покупает торговец
+            for buy_item, price_mod in npc_info.get("buys", {}).items():
+                npc.add_buy_item(buy_item, price_mod)
+                
+            # Загружаем предметы, которые продает торговец
+            for sell_item, sell_info in npc_info.get("sells", {}).items():
+                price = sell_info.get("price", 0)
+                count = sell_info.get("count", 1)
+                npc.add_sell_item(sell_item, price, count)
+                
+            # Загружаем параметр опыта торговли
+            if "trade_exp" in npc_info:
+                npc.trade_exp = npc_info["trade_exp"]
+                
+        elif npc_type == "quest":
+            npc = QuestNPC(npc_id, name, description, location_id)
+            
+            # Загружаем доступные квесты
+            for quest_id in npc_info.get("available_quests", []):
+                npc.add_available_quest(quest_id)
+                
+        else:  # dialogue
+            npc = DialogueNPC(npc_id, name, description, location_id)
+            
+            # Загружаем темы для разговора
+            for topic_id, topic_info in npc_info.get("topics", {}).items():
+                topic_name = topic_info.get("name", topic_id)
+                dialogue_id = topic_info.get("dialogue_id", topic_id)
+                npc.add_topic(topic_id, topic_name, dialogue_id)
+        
+        # Загружаем диалоги
+        npc.dialogue_tree = npc_info.get("dialogues", {})
+        
+        return npc
+        
+    def reload_file(self, file_path):
+        """Перечитывает один файл NPC без полной перезагрузки
+        
+        Уже загруженные NPC того же типа обновляются на месте, поэтому
+        остатки товаров у торговцев и списки квестов сохраняются.
+        
+        Returns:
+            int: Количество перезагруженных NPC
+        """
+        reloaded = {npc_id: self._create_npc(npc_id, npc_info)
+                    for npc_id, npc_info in ContentBundle().iter_entries(file_path)}
+        
+        for npc_id, npc in reloaded.items():
+            current = self.npcs.get(npc_id)
+            if current is not None and type(current) is type(npc):
+                current.update_definition(npc)
+            else:
+                self.npcs[npc_id] = npc
+                
+        self.logger.info(f"NPCManager: перезагружено {len(reloaded)} NPC из файла {file_path}")
+        return len(reloaded)
+        
     def get_npc(self, npc_id):
         """Возвращает NPC по ID"""
         return self.npcs.get(npc_id)
@@ -2,6 +2,7 @@ from src.models.npc.NPC import NPC
 
 class QuestNPC(NPC):
     """NPC, который может выдавать и принимать квесты"""
+    __slots__ = ("available_quests", "completed_quests")
     
     def __init__(self, id, name, description, location_id=None):
         super().__init__(id, name, description, "quest", location_id)
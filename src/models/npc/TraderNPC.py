@@ -2,6 +2,7 @@ from src.models.npc.NPC import NPC
 
 class TraderNPC(NPC):
     """NPC торговец, который может покупать и продавать предметы"""
+    __slots__ = ("buys", "sells", "trade_exp")
     
     def __init__(self, id, name, description, location_id=None):
         super().__init__(id, name, description, "trader", location_id)
@@ -9,6 +10,16 @@ class TraderNPC(NPC):
         self.sells = {}  # {item_id: {price: X, count: Y}}
         self.trade_exp = 1  # Опыт торговли за единицу товара (по умолчанию)
         
+    def update_definition(self, other):
+        """Обновляет ассортимент и цены, сохраняя текущее количество товаров"""
+        super().update_definition(other)
+        self.buys = other.buys
+        self.trade_exp = other.trade_exp
+        for item_id, sell_info in other.sells.items():
+            if item_id in self.sells:
+                sell_info["count"] = self.sells[item_id]["count"]
+        self.sells = other.sells
+        
     def add_buy_item(self, item_id, price_modifier=1.0):
         """Добавляет предмет, который торговец будет покупать"""
         self.buys[item_id] = price_modifier
@@ -1,5 +1,12 @@
-class Quest:
+from src.utils.SlotsState import SlotsState
+
+class Quest(SlotsState):
     """Класс для представления квеста в игре"""
+    __slots__ = (
+        "id", "name", "description", "giver_id", "taker_id", "status", "stages",
+        "current_stage_index", "tracked", "rewards", "requirements", "is_completed",
+        "completion_text",  # Задается загрузчиком, только если указан в файле квеста
+    )
     
     STATUS_NOT_STARTED = "not_started"
     STATUS_IN_PROGRESS = "in_progress"
@@ -51,6 +58,16 @@ class Quest:
             return True
         return False
     
+    def update_definition(self, other):
+        """Обновляет описание и награды квеста, сохраняя статус, стадии и прогресс"""
+        self.name = other.name
+        self.description = other.description
+        self.taker_id = other.taker_id
+        self.rewards = other.rewards
+        self.requirements = other.requirements
+        if hasattr(other, "completion_text"):
+            self.completion_text = other.completion_text
+
     def add_stage(self, stage):
         """Добавляет стадию к квесту"""
         self.stages.append(stage)
@@ -1,5 +1,8 @@
-class QuestObjective:
+from src.utils.SlotsState import SlotsState
+
+class QuestObjective(SlotsState):
     """Базовый класс для представления цели квеста"""
+    __slots__ = ("type", "description", "completed")
     
     TYPE_COLLECT = "collect"
     TYPE_TALK = "talk"
@@ -1,5 +1,8 @@
-class QuestStage:
+from src.utils.SlotsState import SlotsState
+
+class QuestStage(SlotsState):
     """Класс для представления отдельной стадии квеста"""
+    __slots__ = ("name", "description", "objectives")
     
     def __init__(self, name, description=""):
         self.name = name
@@ -2,6 +2,7 @@ from src.models.quests.QuestObjective import QuestObjective
 
 class CollectObjective(QuestObjective):
     """Цель квеста: собрать определенное количество предметов"""
+    __slots__ = ("item_id", "required_count", "current_count")
     
     def __init__(self, item_id, required_count, description=None):
         super().__init__(QuestObjective.TYPE_COLLECT, description or f"Собрать {required_count} {item_id}")
@@ -19,7 +20,7 @@ class CollectObjective(QuestObjective):
         
         # Логирование для отладки
         if game.logger:
-            game.logger.debug(f"Проверка предмета для квеста: {self.item_id} - текущее количество: {item_count}, требуется: {self.required_count}")
+            game.logger.debug("Проверка предмета для квеста: {} - текущее количество: {}, требуется: {}", self.item_id, item_count, self.required_count)
         
         # Если количество изменилось, обновляем прогресс
         if item_count != self.current_count:
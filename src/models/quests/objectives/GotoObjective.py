@@ -2,6 +2,7 @@ from src.models.quests.QuestObjective import QuestObjective
 
 class GotoObjective(QuestObjective):
     """Цель квеста: посетить определенную локацию"""
+    __slots__ = ("location_id", "visited")
     
     def __init__(self, location_id, description=None):
         super().__init__(QuestObjective.TYPE_GOTO, description or f"Посетить локацию {location_id}")
@@ -2,6 +2,7 @@ from src.models.quests.QuestObjective import QuestObjective
 
 class TalkObjective(QuestObjective):
     """Цель квеста: поговорить с определенным NPC"""
+    __slots__ = ("npc_id", "talked")
     
     def __init__(self, npc_id, description=None):
         super().__init__(QuestObjective.TYPE_TALK, description or f"Поговорить с {npc_id}")
@@ -1,36 +1,95 @@
+from src.models.skills.SkillDefinition import SkillDefinition
+from src.models.skills.SkillRegistry import SkillRegistry
+from src.utils.Logger import Logger
+
 class Skill:
-    def __init__(self, id, name, description="", max_level=100, base_exp=100, exp_factor=1.5):
+    def __init__(self, definition, level=1, experience=0):
         """
-        Инициализация навыка
-        id - идентификатор навыка
-        name - название навыка
-        description - описание навыка
-        max_level - максимальный уровень навыка
-        base_exp - базовый опыт для первого уровня
-        exp_factor - множитель опыта для последующих уровней
+        Инициализация навыка игрока
+        definition - общее описание навыка (SkillDefinition)
+        level - текущий уровень навыка
+        experience - накопленный опыт навыка
+        
+        Описание навыка не копируется в объект, у игрока хранится только состояние навыка.
         """
-        self.id = id
-        self.name = name
-        self.description = description
-        self.level = 1
-        self.experience = 0
-        self.max_level = max_level
-        self.base_exp = base_exp
-        self.exp_factor = exp_factor
-        self.level_thresholds = {}
+        self.id = definition.id
+        self._definition = definition
+        self.level = level
+        self.experience = experience
         self.unlocked_items = []
-        self.unlocks_by_level = {}  # Словарь {level: [item_id1, item_id2, ...]}
-        self.provides_by_level = {}  # Словарь {level: {bonus_name: value, ...}}
         self.active_bonuses = {}     # Текущие активные бонусы
+        
+        # Предметы и бонусы уровней, уже достигнутых игроком
+        for unlock_level in sorted(definition.unlocks_by_level):
+            if unlock_level <= self.level:
+                self.unlocked_items.extend(definition.unlocks_by_level[unlock_level])
+        self._update_active_bonuses()
+    
+    @property
+    def definition(self):
+        """Общее описание навыка из SkillRegistry"""
+        if self._definition is None:
+            definition = SkillRegistry().get(self.id)
+            if definition is None:
+                Logger().warning("Описание навыка {} не найдено, используется описание по умолчанию", self.id)
+                definition = SkillDefinition(self.id, self.id)
+            self._definition = definition
+        return self._definition
+    
+    @property
+    def name(self):
+        """Название навыка"""
+        return self.definition.name
+    
+    @property
+    def description(self):
+        """Описание навыка"""
+        return self.definition.description
+    
+    @property
+    def max_level(self):
+        """Максимальный уровень навыка"""
+        return self.definition.max_level
+    
+    @property
+    def base_exp(self):
+        """Базовый опыт для первого уровня"""
+        return self.definition.base_exp
+    
+    @property
+    def exp_factor(self):
+        """Множитель опыта для последующих уровней"""
+        return self.definition.exp_factor
+    
+    @property
+    def unlocks_by_level(self):
+        """Разблокируемые предметы {level: (item_id1, item_id2, ...)}"""
+        return self.definition.unlocks_by_level
+    
+    @property
+    def provides_by_level(self):
+        """Бонусы уровней {level: {bonus_name: value, ...}}"""
+        return self.definition.provides_by_level
+    
+    def __getstate__(self):
+        """Описание навыка не сохраняется, при загрузке оно берется из SkillRegistry"""
+        state = self.__dict__.copy()
+        state["_definition"] = None
+        return state
+    
+    def __setstate__(self, state):
+        """Восстанавливает состояние из pickle с поддержкой сохранений старых версий"""
+        # В старых сохранениях описание навыка хранилось в каждом объекте
+        self.id = state["id"]
+        self._definition = None
+        self.level = state.get("level", 1)
+        self.experience = state.get("experience", 0)
+        self.unlocked_items = state.get("unlocked_items", [])
+        self.active_bonuses = state.get("active_bonuses", {})
     
     def calculate_exp_for_level(self, level):
         """Расчет необходимого опыта для достижения указанного уровня"""
-        if level <= 1:
-            return 0
-        
-        # Экспоненциальная формула для расчета опыта
-        # Можно настроить под нужную кривую роста
-        return int(self.base_exp * (self.exp_factor ** (level - 1)))
+        return self.definition.calculate_exp_for_level(level)
     
     def add_experience(self, amount):
         """Добавляет опыт к навыку и повышает уровень при необходимости"""
@@ -90,22 +149,6 @@ class Skill:
         """Проверяет, может ли игрок собирать указанный предмет с текущим уровнем навыка"""
         return item_id in self.unlocked_items
     
-    def add_unlocks_by_level(self, level, items):
-        """Добавляет разблокируемые предметы для указанного уровня навыка"""
-        self.unlocks_by_level[level] = items
-        
-        # Если текущий уровень >= указанного, добавляем предметы как разблокированные
-        if self.level >= level:
-            self.unlocked_items.extend(items)
-            
-    def add_provides_by_level(self, level, bonuses):
-        """Добавляет бонусы, предоставляемые на указанном уровне навыка"""
-        self.provides_by_level[level] = bonuses
-        
-        # Если текущий уровень >= указанного, применяем бонусы
-        if self.level >= level:
-            self._update_active_bonuses()
-            
     def _update_active_bonuses(self):
         """Обновляет активные бонусы на основе текущего уровня навыка"""
         # Сбрасываем текущие бонусы
@@ -0,0 +1,86 @@
+from types import MappingProxyType
+
+
+class SkillDefinition:
+    """
+    Неизменяемое описание навыка из файла ресурсов
+
+    Одно описание используется всеми игроками, у игрока хранится только
+    состояние навыка (уровень, опыт, разблокированные предметы) - см. Skill.
+    """
+    __slots__ = ("id", "name", "description", "max_level", "base_exp", "exp_factor",
+                 "unlocks_by_level", "provides_by_level")
+
+    def __init__(self, id, name, description="", max_level=100, base_exp=100, exp_factor=1.5,
+                 unlocks_by_level=None, provides_by_level=None):
+        """
+        id - идентификатор навыка
+        name - название навыка
+        description - описание навыка
+        max_level - максимальный уровень навыка
+        base_exp - базовый опыт для первого уровня
+        exp_factor - множитель опыта для последующих уровней
+        unlocks_by_level - разблокируемые предметы {level: [item_id1, item_id2, ...]}
+        provides_by_level - бонусы уровней {level: {bonus_name: value, ...}}
+        """
+        set_field = super().__setattr__
+        set_field("id", id)
+        set_field("name", name)
+        set_field("description", description)
+        set_field("max_level", max_level)
+        set_field("base_exp", base_exp)
+        set_field("exp_factor", exp_factor)
+        set_field("unlocks_by_level", MappingProxyType(
+            {level: tuple(items) for level, items in (unlocks_by_level or {}).items()}))
+        set_field("provides_by_level", MappingProxyType(
+            {level: MappingProxyType(dict(bonuses)) for level, bonuses in (provides_by_level or {}).items()}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Описание навыка {self.id} нельзя изменить")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Описание навыка {self.id} нельзя изменить")
+
+    @classmethod
+    def from_json(cls, skill_data):
+        """Создает описание навыка из JSON данных
+
+        Returns:
+            SkillDefinition: Описание навыка или None, если в данных нет ID
+        """
+        skill_id = skill_data.get("id")
+        if not skill_id:
+            return None
+
+        unlocks_by_level = {}
+        provides_by_level = {}
+        for level_data in skill_data.get("levels", []):
+            level = level_data.get("level")
+            if not level:
+                continue
+
+            # Разблокируемые предметы и бонусы каждого уровня
+            unlocks_by_level[level] = level_data.get("unlocks", [])
+            provides = level_data.get("provides", {})
+            if provides:
+                provides_by_level[level] = provides
+
+        return cls(
+            skill_id,
+            skill_data.get("name", skill_id),
+            skill_data.get("description", ""),
+            skill_data.get("max_level", 100),
+            skill_data.get("base_exp", 100),
+            skill_data.get("exp_factor", 1.5),
+            unlocks_by_level,
+            provides_by_level,
+        )
+
+    def calculate_exp_for_level(self, level):
+        """Расчет необходимого опыта для достижения указанного уровня"""
+        if level <= 1:
+            return 0
+
+        # Экспоненциальная формула для расчета опыта
+        # Можно настроить под нужную кривую роста
+        return int(self.base_exp * (self.exp_factor ** (level - 1)))
@@ -0,0 +1,105 @@
+import os
+import threading
+from types import MappingProxyType
+from src.loaders.ContentBundle import ContentBundle
+from src.models.skills.SkillDefinition import SkillDefinition
+from src.utils.Logger import Logger
+
+DEFAULT_SKILLS_DIR = "resources/skills"
+
+
+class SkillRegistry:
+    """
+    Общий реестр описаний навыков
+
+    Файлы навыков читаются один раз на процесс, все игроки используют одни
+    и те же неизменяемые описания (SkillDefinition).
+    Реализован как Singleton.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(SkillRegistry, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.logger = Logger()
+        self._lock = threading.Lock()
+        self._definitions = MappingProxyType({})
+        self._loaded_from = None
+        self._initialized = True
+
+    def load(self, skills_directory=DEFAULT_SKILLS_DIR, force=False):
+        """Загружает описания навыков из директории и её поддиректорий
+
+        Повторный вызов для той же директории не читает файлы заново.
+
+        Args:
+            skills_directory: Директория с файлами навыков
+            force: Перечитать файлы, даже если навыки уже загружены
+
+        Returns:
+            Mapping: Описания навыков {skill_id: SkillDefinition} (только для чтения)
+        """
+        with self._lock:
+            if self._loaded_from == skills_directory and not force:
+                return self._definitions
+
+            definitions = {}
+            if not os.path.exists(skills_directory):
+                self.logger.error(f"Директория навыков не найдена: {skills_directory}")
+            else:
+                # Счетчики для логирования
+                total_files_processed = 0
+
+                # Рекурсивно проходим по всем JSON файлам в директории и её подпапках
+                for file_path in ContentBundle().walk_json(skills_directory):
+                    self.logger.info(f"Обрабатываем файл навыка: {file_path}")
+                    definition = self._load_file(file_path)
+                    if definition:
+                        definitions[definition.id] = definition
+                    total_files_processed += 1
+
+                # Суммарная статистика
+                self.logger.info(f"Всего обработано файлов навыков: {total_files_processed}")
+                self.logger.info(f"Всего загружено навыков: {len(definitions)}")
+
+            self._definitions = MappingProxyType(definitions)
+            self._loaded_from = skills_directory
+            return self._definitions
+
+    def _load_file(self, file_path):
+        """Загружает описание навыка из JSON-файла
+
+        Returns:
+            SkillDefinition: Описание навыка или None в случае ошибки
+        """
+        try:
+            definition = SkillDefinition.from_json(ContentBundle().load_json(file_path))
+            if definition is None:
+                self.logger.error(f"В файле {file_path} отсутствует ID навыка")
+                return None
+
+            self.logger.info(f"Загружен навык: {definition.name}")
+            return definition
+
+        except Exception as e:
+            self.logger.error(f"Ошибка при загрузке навыка из {file_path}: {str(e)}")
+            return None
+
+    def get(self, skill_id):
+        """Возвращает описание навыка по ID, при первом обращении загружает навыки"""
+        if self._loaded_from is None:
+            self.load()
+        return self._definitions.get(skill_id)
+
+    def get_all(self):
+        """Возвращает все описания навыков (только для чтения)"""
+        if self._loaded_from is None:
+            self.load()
+        return self._definitions
@@ -1,21 +1,23 @@
 import os
 import time
-import readchar
 from colorama import init, Fore, Back, Style
-import msvcrt
-import logging
 import json
 
-from src.models.quests.Quest import Quest
-from src.models.npc.QuestNPC import QuestNPC  # Добавляем библиотеку для Windows
-from src.ui.screens.components.tracking import print_tracked_quest, print_tracked_target
-from src.ui.screens.inventory import format_resource_name, show_inventory
-from src.ui.screens.npc import talk_to_npc
-from src.ui.screens.quests import show_quests
-from src.ui.screens.skills import show_skills
-from src.ui.screens.glossary import show_glossary
-from src.ui.screens.equipment import show_equipment
-from src.ui.screens.combat import start_combat
+from src.utils.LazyImport import deferred
+from src.utils.Logger import Logger
+
+# Экраны импортируются при первом обращении, чтобы главное меню
+# отрисовывалось без загрузки моделей и остальных экранов
+print_tracked_quest = deferred("src.ui.screens.components.tracking", "print_tracked_quest")
+print_tracked_target = deferred("src.ui.screens.components.tracking", "print_tracked_target")
+format_resource_name = deferred("src.ui.screens.inventory", "format_resource_name")
+show_inventory = deferred("src.ui.screens.inventory", "show_inventory")
+talk_to_npc = deferred("src.ui.screens.npc", "talk_to_npc")
+show_quests = deferred("src.ui.screens.quests", "show_quests")
+show_skills = deferred("src.ui.screens.skills", "show_skills")
+show_glossary = deferred("src.ui.screens.glossary", "show_glossary")
+show_equipment = deferred("src.ui.screens.equipment", "show_equipment")
+start_combat = deferred("src.ui.screens.combat", "start_combat")
 # Инициализация colorama для работы с цветами в консоли
 init()
 
@@ -102,14 +104,8 @@ class GameMenu:
         self.info_color = Fore.WHITE + Style.BRIGHT
         self.warning_color = Fore.YELLOW  # Добавляем цвет для предупреждений
         
-        # Настройка логирования
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
-        handler = logging.FileHandler('game_menu.log')
-        handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        # Настройка логирования (общий файл логов игры)
+        self.logger = Logger()
     
     def clear_screen(self):
         """Очищает экран консоли"""
@@ -165,6 +161,8 @@ class GameMenu:
         """Получает нажатую клавишу с поддержкой разных систем"""
         try:
             if os.name == 'nt':  # Windows
+                import msvcrt
+                
                 # Очищаем буфер ввода
                 while msvcrt.kbhit():
                     msvcrt.getch()
@@ -204,6 +202,8 @@ class GameMenu:
                     return key
                 
             else:  # Linux/Mac
+                import readchar
+                
                 key = readchar.readkey()
                 
                 # Обрабатываем коды стрелок
@@ -420,12 +420,19 @@ class GameMenu:
             return False
         
         # Создаем нового игрока и запускаем игру
+        self.wait_for_game_data()
         self.game.player.name = player_name
         # Устанавливаем флаг новой игры
         self.game.is_new_game = True
         self.start_game()
         return True
     
+    def wait_for_game_data(self):
+        """Дожидается фоновой загрузки ресурсов игры, если она еще не завершена"""
+        if self.game.is_preloading():
+            print(f"\n{self.info_color}Загрузка мира...{Style.RESET_ALL}")
+        self.game.wait_preload()
+    
     def input_player_name(self):
         """Запрашивает имя игрока"""
         self.clear_screen()
@@ -498,6 +505,8 @@ class GameMenu:
             return False
         
         # Загружаем выбранное сохранение
+        # (после фоновой загрузки новой игры, так как менеджеры NPC и монстров общие)
+        self.wait_for_game_data()
         loaded_game = self.game.load_game(selected)
         
         if loaded_game:
@@ -1208,7 +1217,7 @@ class GameMenu:
                     location = self.game.get_location(location_id)
                     
                     if monster_defeated and action_id in location.monsters:
-                        location.monsters[action_id] -= 1
+                        self.game.reduce_monster_count(location_id, action_id)
                         
                         # Обновляем прогресс квестов после победы над монстром
                         self.game.update_quest_progress()
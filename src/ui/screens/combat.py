@@ -18,7 +18,7 @@ def start_combat(menu, monster_id):
         bool: True, если игрок победил, False в противном случае
     """
     logger = Logger()
-    logger.debug(f"Начинаем бой с монстром ID: {monster_id}")
+    logger.debug("Начинаем бой с монстром ID: {}", monster_id)
     
     # Получаем игрока и монстра
     player = menu.player
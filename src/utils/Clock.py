@@ -0,0 +1,81 @@
+import time
+
+# Единицы длительности для parse_duration
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(text):
+    """Переводит длительность вида "90", "30m", "12h", "3d" в секунды
+
+    Raises:
+        ValueError: Если длительность указана неверно
+    """
+    text = str(text).strip().lower()
+    unit = DURATION_UNITS.get(text[-1:]) if text else None
+    number = text[:-1] if unit else text
+    seconds = float(number) * (unit or 1)
+    if seconds <= 0:
+        raise ValueError(f"Длительность должна быть больше нуля: {text}")
+    return seconds
+
+
+class Clock:
+    """
+    Источник игрового времени
+
+    Восстановление ресурсов и монстров и обновление игры берут текущее время
+    через Clock().now(), а не напрямую из time.time(). По умолчанию это
+    системное время, для симуляции его можно заменить (use), например, на
+    ManualClock, который продвигается вручную.
+    Реализован как Singleton.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(Clock, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.now = time.time
+        self._initialized = True
+
+    def use(self, source):
+        """Заменяет источник времени
+
+        Args:
+            source: Функция без аргументов, возвращающая время в секундах
+
+        Returns:
+            Предыдущий источник времени
+        """
+        previous = self.now
+        self.now = source
+        return previous
+
+    def reset(self):
+        """Возвращает системное время"""
+        self.now = time.time
+
+    def is_real(self):
+        """Проверяет, используется ли системное время"""
+        return self.now is time.time
+
+
+class ManualClock:
+    """Время, которое продвигается только вызовом advance()"""
+
+    def __init__(self, start=None):
+        self.time = time.time() if start is None else start
+
+    def __call__(self):
+        return self.time
+
+    def advance(self, seconds):
+        """Продвигает время на seconds секунд и возвращает новое время"""
+        self.time += seconds
+        return self.time
@@ -0,0 +1,109 @@
+import gc
+import tracemalloc
+
+# Количество экземпляров каждой сущности для замера
+DEFAULT_COUNT = 10000
+
+
+def _location(index):
+    from src.models.Location import Location
+
+    location = Location(f"location_{index}", "Локация", "Описание локации")
+    location.add_connection("village")
+    location.add_connection("forest")
+    for resource_id in ("herb", "ore", "crystal"):
+        location.add_resource(resource_id, 5, 300)
+    for monster_id in ("wolf", "goblin"):
+        location.add_monster(monster_id, 3, 600)
+    location.add_npc("trader")
+    return location
+
+
+def _monster(index):
+    from src.models.monsters.Monster import Monster
+
+    return Monster(f"monster_{index}", "Волк", "Серый волк", level=2, health=20, damage=4)
+
+
+def _trader(index):
+    from src.models.npc.TraderNPC import TraderNPC
+
+    npc = TraderNPC(f"trader_{index}", "Торговец", "Продает травы", "village")
+    npc.add_buy_item("herb", 0.8)
+    npc.add_sell_item("potion", 25, 3)
+    return npc
+
+
+def _quest(index):
+    from src.models.quests.Quest import Quest
+    from src.models.quests.QuestStage import QuestStage
+    from src.models.quests.objectives.CollectObjective import CollectObjective
+    from src.models.quests.objectives.TalkObjective import TalkObjective
+
+    quest = Quest(f"quest_{index}", "Квест", "Описание квеста", "trader")
+    stage = QuestStage("Стадия", "Описание стадии")
+    stage.objectives.append(CollectObjective("herb", 5))
+    stage.objectives.append(TalkObjective("trader"))
+    quest.add_stage(stage)
+    return quest
+
+
+def _material(index):
+    from src.models.inventory.types.Material import Material
+
+    return Material("Трава", 3, "Лечебная трава", value=5, item_id=f"herb_{index}")
+
+
+# Сущности для замера {название: функция создания экземпляра по номеру}
+ENTITIES = {
+    "Location": _location,
+    "Monster": _monster,
+    "TraderNPC": _trader,
+    "Quest (1 стадия, 2 цели)": _quest,
+    "Material": _material,
+}
+
+
+class EntityBenchmark:
+    """
+    Замер памяти, занимаемой игровыми сущностями
+
+    Для каждой сущности создается count экземпляров, объем выделенной памяти
+    (со всеми вложенными словарями и списками) измеряется через tracemalloc
+    и делится на количество экземпляров.
+    """
+
+    def __init__(self, count=DEFAULT_COUNT, entities=None):
+        self.count = max(1, count)
+        self.entities = ENTITIES if entities is None else entities
+
+    def measure(self, factory):
+        """Возвращает среднее количество байт на экземпляр"""
+        # Первый экземпляр создается до замера: импорты и кэши классов не учитываются
+        factory(-1)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            instances = [factory(index) for index in range(self.count)]
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        # Список с экземплярами не относится к сущностям
+        list_size = instances.__sizeof__()
+        return (after - before - list_size) / self.count
+
+    def run(self):
+        """Замеряет все сущности
+
+        Returns:
+            dict: {название сущности: байт на экземпляр}
+        """
+        return {name: self.measure(factory) for name, factory in self.entities.items()}
+
+    def format_report(self, results):
+        """Возвращает результаты замера в виде текста"""
+        lines = [f"Память на экземпляр ({self.count} экземпляров каждой сущности):"]
+        for name, size in results.items():
+            lines.append(f"  {name:<26} {size:>8.0f} байт")
+        return "\n".join(lines)
@@ -0,0 +1,57 @@
+import sys
+
+
+class IdTable:
+    """
+    Таблица интернирования строковых ID контента
+
+    Каждому ID пространства имен (локации, предметы, NPC...) при загрузке
+    назначается плотный целочисленный дескриптор 0, 1, 2... Внутренние
+    структуры (например, граф локаций) хранят дескрипторы в списках, а ID
+    восстанавливаются только на границе с интерфейсом и сохранениями.
+    Дескрипторы не меняются до конца процесса и не попадают в сохранения.
+    Строки ID интернируются, поэтому одинаковые ID - один объект в памяти.
+    """
+    _tables = {}
+
+    @classmethod
+    def of(cls, namespace):
+        """Возвращает общую таблицу пространства имен, создавая ее при первом обращении"""
+        table = cls._tables.get(namespace)
+        if table is None:
+            table = cls._tables[namespace] = cls(namespace)
+        return table
+
+    @staticmethod
+    def intern(content_id):
+        """Возвращает интернированную строку ID (другие значения - без изменений)"""
+        return sys.intern(content_id) if type(content_id) is str else content_id
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self._handles = {}  # {content_id: handle}
+        self._ids = []      # [content_id] по дескриптору
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, content_id):
+        return content_id in self._handles
+
+    def handle(self, content_id):
+        """Возвращает дескриптор ID, назначая новый для неизвестного ID"""
+        handle = self._handles.get(content_id)
+        if handle is None:
+            content_id = self.intern(content_id)
+            handle = len(self._ids)
+            self._handles[content_id] = handle
+            self._ids.append(content_id)
+        return handle
+
+    def find(self, content_id):
+        """Возвращает дескриптор ID или None, если ID не встречался"""
+        return self._handles.get(content_id)
+
+    def id_of(self, handle):
+        """Возвращает ID по дескриптору"""
+        return self._ids[handle]
@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+
+# Бюджет времени импорта (в миллисекундах) для модулей, нужных до отрисовки главного меню
+DEFAULT_BUDGETS = {
+    "main": 150,
+    "src.ui.GameMenu": 150,
+    "src.Game": 400,
+}
+
+# Модули, которые не должны загружаться при импорте модуля из ключа:
+# они импортируются отложенно, при первом использовании
+DEFERRED_MODULES = {
+    "main": (
+        "src.Game",
+        "src.PreLoader",
+        "src.models",
+        "src.loaders",
+        "src.ui",
+    ),
+    "src.ui.GameMenu": (
+        "src.Game",
+        "src.PreLoader",
+        "src.models",
+        "src.loaders",
+        "src.ui.screens",
+    ),
+}
+
+
+class ImportBudget:
+    """
+    Проверка времени импорта модулей
+
+    Каждый модуль импортируется в отдельном процессе с `python -X importtime`,
+    поэтому результат не зависит от уже загруженных модулей. Из нескольких
+    запусков берется наименьшее время, чтобы сгладить влияние фоновой нагрузки.
+    Кроме времени проверяется, что отложенные модули не загружаются заранее.
+    """
+
+    def __init__(self, budgets=None, deferred=None, runs=3, cwd=None):
+        """
+        budgets - бюджеты {module_name: milliseconds}
+        deferred - отложенные модули {module_name: (prefix1, prefix2, ...)}
+        runs - количество запусков для каждого модуля
+        cwd - корень проекта, по умолчанию - текущая директория
+        """
+        self.budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        self.deferred = DEFERRED_MODULES if deferred is None else deferred
+        self.runs = max(1, runs)
+        self.cwd = cwd or os.getcwd()
+
+    def measure(self, module_name):
+        """Импортирует модуль в отдельном процессе
+
+        Returns:
+            tuple: (время импорта в мс, множество загруженных модулей)
+                или (None, set()), если импорт завершился ошибкой
+        """
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+            cwd=self.cwd, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            return None, set()
+
+        # Строки вида "import time:  self [us] | cumulative | imported package"
+        cumulative_us = None
+        loaded = set()
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            parts = line[len("import time:"):].split("|")
+            if len(parts) != 3 or not parts[1].strip().isdigit():
+                continue
+            name = parts[2].strip()
+            loaded.add(name)
+            if name == module_name:
+                cumulative_us = int(parts[1])
+
+        if cumulative_us is None:
+            return None, loaded
+        return cumulative_us / 1000, loaded
+
+    def check(self):
+        """Проверяет все модули из бюджета
+
+        Returns:
+            list: Результаты [{"module", "time_ms", "budget_ms", "eager", "ok"}, ...]
+        """
+        results = []
+        for module_name, budget_ms in self.budgets.items():
+            best_ms = None
+            loaded = set()
+            for _ in range(self.runs):
+                time_ms, loaded_now = self.measure(module_name)
+                loaded |= loaded_now
+                if time_ms is not None and (best_ms is None or time_ms < best_ms):
+                    best_ms = time_ms
+
+            prefixes = self.deferred.get(module_name, ())
+            eager = sorted(
+                name for name in loaded
+                if any(name == prefix or name.startswith(prefix + ".") for prefix in prefixes)
+            )
+            results.append({
+                "module": module_name,
+                "time_ms": best_ms,
+                "budget_ms": budget_ms,
+                "eager": eager,
+                "ok": best_ms is not None and best_ms <= budget_ms and not eager,
+            })
+        return results
+
+    @staticmethod
+    def format_report(results):
+        """Возвращает отчет о проверке в виде текста"""
+        lines = []
+        for result in results:
+            status = "OK" if result["ok"] else "ПРЕВЫШЕН"
+            if result["time_ms"] is None:
+                time_text = "ошибка импорта"
+            else:
+                time_text = f"{result['time_ms']:.1f} мс"
+            lines.append(f"{status:<9} {result['module']:<20} {time_text} (бюджет {result['budget_ms']} мс)")
+            if result["eager"]:
+                lines.append(f"          загружены заранее: {', '.join(result['eager'])}")
+        return "\n".join(lines)
@@ -0,0 +1,129 @@
+import json
+
+# Символы-разделители JSON, которые считаются пробельными
+WHITESPACE = " \t\n\r"
+
+
+class JsonStream:
+    """
+    Потоковое чтение JSON файла по записям верхнего уровня
+
+    Файл читается блоками, в памяти одновременно находятся только текущая
+    запись и непрочитанный остаток блока. Верхний уровень файла должен быть
+    объектом: для каждой пары ключ-значение возвращается (ключ, значение),
+    а для ключей из expand, значением которых является массив, - отдельная
+    пара (ключ, элемент) для каждого элемента массива.
+    """
+
+    def __init__(self, file_path, chunk_size=64 * 1024):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def entries(self, expand=()):
+        """Генератор записей верхнего уровня
+
+        Args:
+            expand: Ключи, массивы которых нужно возвращать по одному элементу
+
+        Yields:
+            tuple: (ключ, значение) или (ключ, элемент массива)
+        """
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            self._file = f
+            self._buf = ""
+            self._pos = 0
+            self._eof = False
+
+            self._expect("{")
+            if self._peek() == "}":
+                return
+
+            while True:
+                key = self._decode_value()
+                if not isinstance(key, str):
+                    self._error("ожидался ключ объекта")
+                self._expect(":")
+
+                if key in expand and self._peek() == "[":
+                    self._expect("[")
+                    if self._peek() == "]":
+                        self._expect("]")
+                    else:
+                        while True:
+                            yield key, self._decode_value()
+                            if self._separator("]") == "]":
+                                break
+                else:
+                    yield key, self._decode_value()
+
+                if self._separator("}") == "}":
+                    return
+
+    def _fill(self):
+        """Дочитывает следующий блок файла, отбрасывая уже разобранную часть буфера"""
+        if self._eof:
+            return False
+        # Размер блока растет вместе с буфером, чтобы длинные записи не разбирались заново много раз
+        chunk = self._file.read(max(self.chunk_size, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """Возвращает следующий непробельный символ, не сдвигая позицию"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _next_char(self):
+        """Возвращает следующий непробельный символ и сдвигает позицию за него"""
+        char = self._peek()
+        if not char:
+            self._error("неожиданный конец файла")
+        self._pos += 1
+        return char
+
+    def _separator(self, closing):
+        """Читает разделитель: запятую или закрывающую скобку closing"""
+        char = self._next_char()
+        if char != "," and char != closing:
+            self._error(f"ожидался символ ',' или '{closing}'")
+        return char
+
+    def _expect(self, expected):
+        if self._next_char() != expected:
+            self._error(f"ожидался символ '{expected}'")
+
+    def _decode_value(self):
+        """Разбирает одно JSON значение, при необходимости дочитывая файл"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Значение может быть обрезано границей блока
+                if self._fill():
+                    continue
+                raise
+            # Число на границе блока может продолжаться в следующем блоке: от "1." или "2e+"
+            # разбирается только начало, поэтому после числа должно остаться больше двух символов
+            tail = len(self._buf) - end
+            if (tail == 0 or (tail <= 2 and isinstance(value, (int, float)))) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _error(self, message):
+        raise ValueError(f"{self.file_path}: {message} (позиция {self._pos})")
@@ -0,0 +1,28 @@
+import importlib
+
+
+def deferred(module_name, attr_name):
+    """Возвращает функцию, модуль которой импортируется только при первом вызове
+
+    Используется для экранов и тяжелых подсистем, которые не нужны
+    для отрисовки главного меню.
+
+    Args:
+        module_name: Полное имя модуля (например, "src.ui.screens.combat")
+        attr_name: Имя функции в модуле
+
+    Returns:
+        callable: Функция-обертка с той же сигнатурой
+    """
+    target = None
+
+    def call(*args, **kwargs):
+        nonlocal target
+        if target is None:
+            target = getattr(importlib.import_module(module_name), attr_name)
+        return target(*args, **kwargs)
+
+    call.__name__ = attr_name
+    call.__qualname__ = attr_name
+    call.__doc__ = f"Отложенный вызов {module_name}.{attr_name}"
+    return call
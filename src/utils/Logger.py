@@ -1,10 +1,19 @@
 import os
+import atexit
 import datetime
-import inspect
+import gzip
+import json
+import logging
+import shutil
 import sys
+import threading
+import time
 import traceback
+from collections import deque
 from enum import Enum
 
+DEFAULT_LOG_FILE = os.path.join("logs", "logs.log")
+
 class LogLevel(Enum):
     DEBUG = (0, "\033[94m", "DEBUG")    # Синий
     INFO = (1, "\033[92m", "INFO")      # Зеленый
@@ -16,91 +25,369 @@ class Logger:
     """
     Класс для логирования сообщений в файл и консоль
     Реализован как Singleton для обеспечения единого экземпляра
+
+    Сообщения не пишутся в файл сразу: вызывающий поток подставляет аргументы
+    в сообщение и добавляет запись в очередь, а фоновый поток оформляет строки
+    лога и записывает накопленные записи пачкой. Аргументы форматируются сразу,
+    чтобы в лог попало их значение на момент вызова, а не на момент записи.
+    Очередь ограничена max_queue записями - при переполнении вызывающий поток
+    сам сбрасывает очередь в файл. При выходе из программы (в том числе по сигналу,
+    который завершает процесс через exit) очередь записывается полностью.
+
+    Аргументы сообщения форматируются только для записей, прошедших проверку
+    уровня. Вместо строки можно передать функцию без аргументов, возвращающую
+    сообщение: она вызывается, только если уровень включен. Для дорогих
+    вычислений в циклах используйте is_enabled(). Определение места вызова
+    (файл, строка, функция) отключается параметром capture_caller.
+
+    Файл лога ротируется по размеру (max_bytes) и/или по времени (rotate_interval):
+    текущий файл переименовывается в logs.log.1 (или сжимается в logs.log.1.gz),
+    хранится не больше backup_count старых файлов. В режиме structured каждая
+    запись пишется отдельной строкой JSON. Сообщения стандартного модуля logging
+    передаются в этот же файл через LoggingBridge (см. bridge_std_logging).
     """
     _instance = None
-    
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(Logger, cls).__new__(cls)
             cls._instance._initialized = False
         return cls._instance
-    
-    def __init__(self, log_file="logs.log", min_level=LogLevel.INFO, console_output=False):
+
+    def __init__(self, log_file=DEFAULT_LOG_FILE, min_level=LogLevel.INFO, console_output=False,
+                 flush_interval=0.5, max_queue=10000, capture_caller=True,
+                 max_bytes=5 * 1024 * 1024, rotate_interval=None, backup_count=5,
+                 compress=False, structured=False):
         if self._initialized:
             return
-            
+
         self.log_file = log_file
         self.min_level = min_level
         self.console_output = console_output
-        
+        self.capture_caller = capture_caller  # Записывать файл, строку и функцию вызова
+        self.flush_interval = flush_interval  # Период записи очереди в файл (в секундах)
+        self.max_queue = max_queue            # Максимальное количество записей в очереди
+        self.max_bytes = max_bytes            # Размер файла для ротации (0 или None - без ротации по размеру)
+        self.rotate_interval = rotate_interval  # Период ротации в секундах (None - без ротации по времени)
+        self.backup_count = backup_count      # Количество хранимых старых файлов
+        self.compress = compress              # Сжимать старые файлы в .gz
+        self.structured = structured          # Писать записи в формате JSON Lines
+
+        self._queue = deque()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self._file = None
+        self._open_file()
+        self._last_second = None
+        self._last_timestamp = ""
+
+        self._writer = threading.Thread(target=self._writer_loop, name="LoggerWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+        self._initialized = True
+        self.info("Логирование инициализировано")
+
+    def configure(self, **options):
+        """Изменяет настройки логгера (параметры как у конструктора)
+
+        Накопленные сообщения записываются со старыми настройками.
+        При смене log_file открывается новый файл.
+        """
+        self.flush()
+        with self._write_lock:
+            reopen = "log_file" in options and options["log_file"] != self.log_file
+            for name, value in options.items():
+                if name not in ("log_file", "min_level", "console_output", "capture_caller",
+                                "flush_interval", "max_queue", "max_bytes", "rotate_interval",
+                                "backup_count", "compress", "structured"):
+                    raise TypeError(f"Неизвестный параметр логгера: {name}")
+                setattr(self, name, value)
+            if reopen:
+                self._close_file()
+                self._open_file()
+            elif "rotate_interval" in options:
+                self._next_rollover = self._compute_rollover()
+
+    def _open_file(self):
+        """Открывает файл лога для дозаписи"""
         # Создаем директорию для логов, если она не существует
-        log_dir = os.path.dirname(log_file)
+        log_dir = os.path.dirname(self.log_file)
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
-            
+
         # Проверяем, существует ли файл логов, если нет - создаем его
-        if not os.path.exists(log_file):
-            with open(log_file, 'w', encoding='utf-8') as f:
+        if not os.path.exists(self.log_file) and not self.structured:
+            with open(self.log_file, 'w', encoding='utf-8') as f:
                 f.write(f"=== Запуск логирования {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-        
-        self._initialized = True
-        self.info("Логирование инициализировано")
-    
+
+        self._file = open(self.log_file, 'a', encoding='utf-8')
+        self._next_rollover = self._compute_rollover()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _compute_rollover(self):
+        if not self.rotate_interval:
+            return None
+        return time.time() + self.rotate_interval
+
+    def _backup_name(self, index):
+        """Возвращает имя существующего старого файла с номером index (сжатого или нет)"""
+        name = f"{self.log_file}.{index}"
+        if os.path.exists(name + ".gz"):
+            return name + ".gz"
+        return name
+
+    def _rotate(self):
+        """Переименовывает текущий файл лога в .1 (сдвигая старые) и открывает новый"""
+        self._close_file()
+        try:
+            if self.backup_count > 0:
+                # Удаляем самый старый файл и сдвигаем остальные
+                oldest = self._backup_name(self.backup_count)
+                if os.path.exists(oldest):
+                    os.remove(oldest)
+                for index in range(self.backup_count - 1, 0, -1):
+                    source = self._backup_name(index)
+                    if os.path.exists(source):
+                        suffix = ".gz" if source.endswith(".gz") else ""
+                        os.replace(source, f"{self.log_file}.{index + 1}{suffix}")
+
+                rotated = f"{self.log_file}.1"
+                os.replace(self.log_file, rotated)
+                if self.compress:
+                    with open(rotated, 'rb') as source, gzip.open(rotated + ".gz", 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                    os.remove(rotated)
+            else:
+                os.remove(self.log_file)
+        except OSError as e:
+            print(f"Logger: не удалось выполнить ротацию {self.log_file}: {e}", file=sys.stderr)
+        self._open_file()
+
+    def __reduce__(self):
+        # Логгер хранится в объектах игры, которые попадают в сохранения:
+        # при загрузке сохранения используется текущий экземпляр
+        return (Logger, ())
+
+    @property
+    def min_level(self):
+        """Минимальный уровень записываемых сообщений"""
+        return self._min_level
+
+    @min_level.setter
+    def min_level(self, level):
+        self._min_level = level
+        self._min_value = level.value[0]
+
+    def is_enabled(self, level):
+        """Проверяет, будут ли записаны сообщения указанного уровня"""
+        return level.value[0] >= self._min_value
+
+    def __setstate__(self, state):
+        # Сохранения старых версий содержат состояние логгера - оно не восстанавливается,
+        # чтобы не перезаписать настройки текущего экземпляра
+        pass
+
     def _log(self, level, message, *args):
         """Внутренний метод для записи лога"""
-        if level.value[0] < self.min_level.value[0]:
+        if level.value[0] < self._min_value:
             return
-            
-        # Форматирование сообщения с аргументами
+
+        # Отложенное сообщение вычисляется только для включенного уровня
+        if callable(message):
+            message = message()
+
+        # Аргументы могут быть изменяемыми объектами игры - подставляем их до постановки в очередь
         if args:
-            message = message.format(*args)
-            
-        # Получение информации о вызывающем коде
-        frame = inspect.currentframe().f_back.f_back
-        filename = os.path.basename(frame.f_code.co_filename)
-        lineno = frame.f_lineno
-        caller_func = frame.f_code.co_name
-        
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        formatted_message = f"[{timestamp}] {level.value[2]:8} | {filename}:{lineno} ({caller_func}) | {message}"
-        
-        # Запись в файл
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(formatted_message + '\n')
-        
-        # Вывод в консоль
-        if self.console_output:
-            color_code = level.value[1]
-            print(f"{color_code}{formatted_message}\033[0m")
-    
+            try:
+                message = message.format(*args)
+            except Exception as e:
+                message = f"{message} {args} (ошибка форматирования: {e})"
+
+        # Получение информации о вызывающем коде (имя файла и оформление строки - в фоновом потоке)
+        if self.capture_caller:
+            frame = sys._getframe(2)
+            caller = (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+        else:
+            caller = None
+
+        self._queue.append((level, time.time(), caller, message))
+
+        # При переполнении очереди или после закрытия логгера сообщение записывается сразу
+        if self._closed or len(self._queue) >= self.max_queue:
+            self.flush()
+
+    def _format(self, record):
+        """Форматирует запись очереди в строку лога"""
+        level, created, caller, message = record
+
+        if self.structured:
+            entry = {
+                "time": datetime.datetime.fromtimestamp(created).isoformat(timespec="milliseconds"),
+                "level": level.value[2],
+                "message": str(message),
+            }
+            if caller is not None:
+                entry["file"], entry["line"], entry["func"] = os.path.basename(caller[0]), caller[1], caller[2]
+            return json.dumps(entry, ensure_ascii=False)
+
+        # Метка времени с точностью до секунды пересчитывается не чаще раза в секунду
+        second = int(created)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_timestamp = datetime.datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+
+        if caller is None:
+            return f"[{self._last_timestamp}] {level.value[2]:8} | {message}"
+        filename, lineno, caller_func = caller
+        return f"[{self._last_timestamp}] {level.value[2]:8} | {os.path.basename(filename)}:{lineno} ({caller_func}) | {message}"
+
+    def flush(self):
+        """Записывает все накопленные сообщения в файл"""
+        with self._write_lock:
+            records = []
+            while self._queue:
+                try:
+                    records.append(self._queue.popleft())
+                except IndexError:
+                    break
+            if not records:
+                return
+
+            lines = [self._format(record) for record in records]
+            if self._file is not None:
+                try:
+                    self._file.write('\n'.join(lines) + '\n')
+                    self._file.flush()
+                    if (self.max_bytes and self._file.tell() >= self.max_bytes) or \
+                            (self._next_rollover is not None and time.time() >= self._next_rollover):
+                        self._rotate()
+                except (OSError, ValueError) as e:
+                    print(f"Logger: не удалось записать лог в {self.log_file}: {e}", file=sys.stderr)
+
+            # Вывод в консоль
+            if self.console_output:
+                for record, line in zip(records, lines):
+                    color_code = record[0].value[1]
+                    print(f"{color_code}{line}\033[0m")
+
+    def _writer_loop(self):
+        """Фоновый поток: периодически записывает очередь в файл"""
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        """Останавливает фоновый поток и записывает оставшиеся сообщения
+
+        Файл лога остается открытым: сообщения, отправленные после close()
+        (например, из других обработчиков atexit), записываются сразу.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._writer.is_alive() and self._writer is not threading.current_thread():
+            self._writer.join(timeout=2.0)
+        self.flush()
+
+    def log_record(self, record):
+        """Добавляет в очередь запись стандартного модуля logging"""
+        level = _STD_LEVELS.get(record.levelno)
+        if level is None:
+            # Нестандартный уровень - ближайший меньший из стандартных
+            level = LogLevel.DEBUG
+            for std_level, mapped in _STD_LEVELS.items():
+                if record.levelno >= std_level:
+                    level = mapped
+        if level.value[0] < self._min_value:
+            return
+
+        message = record.getMessage()
+        if record.exc_info and record.exc_info[0] is not None:
+            message = f"{message}\n{''.join(traceback.format_exception(*record.exc_info))}"
+        caller = (record.pathname, record.lineno, record.funcName) if self.capture_caller else None
+
+        self._queue.append((level, record.created, caller, message))
+        if self._closed or len(self._queue) >= self.max_queue:
+            self.flush()
+
     def debug(self, message, *args):
         """Логирование отладочной информации"""
+        # Отключенный уровень отсекается до вызова _log
+        if self._min_value > 0:
+            return
         self._log(LogLevel.DEBUG, message, *args)
-    
+
     def info(self, message, *args):
         """Логирование информационных сообщений"""
+        if self._min_value > 1:
+            return
         self._log(LogLevel.INFO, message, *args)
-    
+
     def warning(self, message, *args):
         """Логирование предупреждений"""
         self._log(LogLevel.WARNING, message, *args)
-    
+
     def error(self, message, *args):
         """Логирование ошибок"""
         self._log(LogLevel.ERROR, message, *args)
-    
+
     def critical(self, message, *args):
         """Логирование критических ошибок"""
         self._log(LogLevel.CRITICAL, message, *args)
-        
+
     def exception(self, message, exc_info=None):
         """Логирование исключений с трассировкой стека"""
+        if callable(message):
+            message = message()
         if exc_info is None:
             exc_info = sys.exc_info()
-        
+
         if exc_info[0] is not None:
             tb_lines = traceback.format_exception(*exc_info)
             error_message = f"{message}\n{''.join(tb_lines)}"
             self._log(LogLevel.ERROR, error_message)
         else:
-            self._log(LogLevel.ERROR, message) 
\ No newline at end of file
+            self._log(LogLevel.ERROR, message)
+
+
+# Соответствие уровней стандартного модуля logging уровням Logger
+_STD_LEVELS = {
+    logging.DEBUG: LogLevel.DEBUG,
+    logging.INFO: LogLevel.INFO,
+    logging.WARNING: LogLevel.WARNING,
+    logging.ERROR: LogLevel.ERROR,
+    logging.CRITICAL: LogLevel.CRITICAL,
+}
+
+
+class LoggingBridge(logging.Handler):
+    """Обработчик стандартного модуля logging, передающий записи в Logger"""
+
+    def emit(self, record):
+        try:
+            Logger().log_record(record)
+        except Exception:
+            self.handleError(record)
+
+
+def bridge_std_logging(level=logging.DEBUG):
+    """Направляет все сообщения стандартного модуля logging в Logger
+
+    Обработчики корневого логгера заменяются на LoggingBridge,
+    фильтрация по уровню выполняется в Logger (min_level).
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(LoggingBridge(level))
+    root.setLevel(level)
@@ -0,0 +1,91 @@
+import os
+import threading
+from src.utils.Logger import Logger
+
+# Директории, изменения в которых не отслеживаются
+IGNORED_DIRS = {"saves", ".cache"}
+
+
+class ResourceWatcher:
+    """
+    Отслеживание изменений JSON файлов в директории ресурсов
+
+    Фоновый поток периодически сравнивает mtime и размер файлов с прошлым
+    снимком и накапливает пути измененных и новых файлов. Сами изменения
+    применяет игра в основном потоке через pop_changes().
+    """
+
+    def __init__(self, directory="resources", interval=1.0):
+        self.directory = directory
+        self.interval = interval
+        self.logger = Logger()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._changed = set()
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        """Возвращает снимок состояния файлов {путь: (mtime_ns, size)}"""
+        snapshot = {}
+        for root, dirs, filenames in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+            for filename in filenames:
+                if not filename.endswith(".json"):
+                    continue
+                file_path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    # Файл удален во время обхода
+                    continue
+                snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self):
+        """Проверяет файлы на изменения
+
+        Returns:
+            int: Количество измененных или новых файлов с прошлой проверки
+        """
+        snapshot = self._scan()
+        changed = [path for path, state in snapshot.items() if self._snapshot.get(path) != state]
+        for path in self._snapshot.keys() - snapshot.keys():
+            self.logger.warning("ResourceWatcher: файл {} удален, загруженные из него данные сохранены", path)
+        self._snapshot = snapshot
+
+        if changed:
+            with self._lock:
+                self._changed.update(changed)
+            self.logger.debug("ResourceWatcher: обнаружено изменений: {}", len(changed))
+        return len(changed)
+
+    def pop_changes(self):
+        """Возвращает накопленные пути измененных файлов и очищает список"""
+        with self._lock:
+            changed = sorted(self._changed)
+            self._changed.clear()
+        return changed
+
+    def start(self):
+        """Запускает фоновую проверку файлов"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ResourceWatcher", daemon=True)
+        self._thread.start()
+        self.logger.info("ResourceWatcher: отслеживание изменений в {} (интервал {} с)", self.directory, self.interval)
+
+    def stop(self):
+        """Останавливает фоновую проверку файлов"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.error("ResourceWatcher: ошибка при проверке файлов: {}", str(e))
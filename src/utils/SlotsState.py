@@ -0,0 +1,71 @@
+from src.utils.Logger import Logger
+
+# Атрибуты из сохранений старых версий, которые больше не хранятся в объектах
+LEGACY_ATTRIBUTES = ("logger",)
+
+
+class SharedLogger:
+    """Дескриптор класса: общий Logger для всех экземпляров, создается при первом обращении"""
+
+    def __init__(self):
+        self._logger = None
+
+    def __get__(self, instance, owner):
+        if self._logger is None:
+            self._logger = Logger()
+        return self._logger
+
+
+class SlotsState:
+    """
+    Базовый класс для игровых сущностей с __slots__
+
+    У объектов с __slots__ нет __dict__, поэтому состояние для pickle
+    собирается из слотов всей иерархии классов в обычный словарь - тот же
+    формат, что и у сохранений старых версий. При загрузке словарь
+    раскладывается по слотам, устаревшие атрибуты (например, logger)
+    пропускаются. Наследники объявляют свои __slots__, а логгер получают
+    через атрибут класса logger = SharedLogger().
+    """
+    __slots__ = ()
+
+    _slot_names_cache = {}
+
+    @classmethod
+    def _slot_names(cls):
+        names = cls._slot_names_cache.get(cls)
+        if names is None:
+            names = []
+            for klass in reversed(cls.__mro__):
+                slots = klass.__dict__.get("__slots__", ())
+                if isinstance(slots, str):
+                    slots = (slots,)
+                names.extend(name for name in slots if name not in names)
+            names = tuple(names)
+            cls._slot_names_cache[cls] = names
+        return names
+
+    def __getstate__(self):
+        state = {}
+        for name in self._slot_names():
+            try:
+                state[name] = getattr(self, name)
+            except AttributeError:
+                # Необязательный атрибут, который не был задан
+                pass
+        return state
+
+    def __setstate__(self, state):
+        # Pickle без __getstate__ передает (dict, slots)
+        if isinstance(state, tuple):
+            dict_state, slots_state = state
+            state = dict(dict_state or {})
+            state.update(slots_state or {})
+
+        slot_names = self._slot_names()
+        for name, value in state.items():
+            if name in slot_names:
+                object.__setattr__(self, name, value)
+            elif name not in LEGACY_ATTRIBUTES:
+                Logger().warning("{}: атрибут {} из сохранения не поддерживается и пропущен",
+                                 type(self).__name__, name)
@@ -0,0 +1,160 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from src.utils.Logger import Logger
+
+DEFAULT_REPORT_PATH = os.path.join("logs", "startup_profile.json")
+
+
+class StartupProfiler:
+    """
+    Профилировщик запуска игры по фазам загрузки
+
+    Для каждой фазы записывается время выполнения, количество прочитанных
+    файлов, объем прочитанных данных и количество созданных объектов.
+    Фазы могут выполняться в разных потоках: текущая фаза хранится отдельно
+    для каждого потока. Отчет сохраняется в JSON и кратко выводится в лог.
+    Реализован как Singleton, по умолчанию выключен.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(StartupProfiler, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.enabled = False
+        self.report_path = DEFAULT_REPORT_PATH
+        self.logger = Logger()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phases = []
+        self._started = time.perf_counter()
+        self._initialized = True
+
+    def enable(self, report_path=DEFAULT_REPORT_PATH):
+        """Включает профилирование, отсчет времени начинается с момента включения"""
+        self.report_path = report_path
+        self.reset()
+        self.enabled = True
+
+    def reset(self):
+        """Сбрасывает записанные фазы"""
+        with self._lock:
+            self._phases = []
+            self._started = time.perf_counter()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def phase(self, name, parent=None):
+        """Контекст фазы загрузки
+
+        Args:
+            name: Название фазы
+            parent: Название родительской фазы, по умолчанию - текущая фаза этого потока
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        stack = self._stack()
+        if parent is None and stack:
+            parent = stack[-1]["name"]
+
+        started = time.perf_counter()
+        record = {
+            "name": name,
+            "parent": parent,
+            "thread": threading.current_thread().name,
+            "start": round(started - self._started, 6),
+            "wall_time": 0.0,
+            "files": 0,
+            "bytes": 0,
+            "objects": 0,
+        }
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            stack.pop()
+            record["wall_time"] = round(time.perf_counter() - started, 6)
+            with self._lock:
+                self._phases.append(record)
+
+    def record_file(self, size):
+        """Учитывает прочитанный файл в текущей фазе потока"""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack:
+            stack[-1]["files"] += 1
+            stack[-1]["bytes"] += size
+
+    def record_objects(self, count):
+        """Учитывает созданные объекты в текущей фазе потока"""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack:
+            stack[-1]["objects"] += count
+
+    def report(self):
+        """Сохраняет отчет в JSON и выводит сводку в лог
+
+        Returns:
+            dict: Отчет или None, если профилирование выключено
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            phases = sorted(self._phases, key=lambda record: record["start"])
+            total_time = round(time.perf_counter() - self._started, 6)
+
+        report = {
+            "total_time": total_time,
+            "files": sum(record["files"] for record in phases),
+            "bytes": sum(record["bytes"] for record in phases),
+            "objects": sum(record["objects"] for record in phases),
+            "phases": phases,
+        }
+
+        try:
+            report_dir = os.path.dirname(self.report_path)
+            if report_dir:
+                os.makedirs(report_dir, exist_ok=True)
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            self.logger.error("StartupProfiler: не удалось сохранить отчет {}: {}", self.report_path, str(e))
+
+        self.logger.info("StartupProfiler: запуск занял {:.3f} с, файлов: {}, байт: {}, объектов: {}",
+                         total_time, report["files"], report["bytes"], report["objects"])
+        for record in phases:
+            self.logger.info("StartupProfiler: {:<28} {:>8.3f} с  файлов: {:<4} байт: {:<9} объектов: {}",
+                             record["name"], record["wall_time"], record["files"], record["bytes"], record["objects"])
+        return report
+
+
+def profiled(name):
+    """Декоратор: выполняет функцию как фазу StartupProfiler с указанным названием"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with StartupProfiler().phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator